@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark da detecção de capítulos (ChapterDetector.detect_chapters).
+
+Gera um texto sintético com capítulos e muitos falsos positivos (linhas que
+começam com números, algarismos romanos ou "Chapter" no meio do texto) e mede:
+- a varredura linear atual em uma entrada grande (padrão: 1M linhas)
+- a varredura antiga (offsets por soma de prefixo + 7 re.match por linha) em
+  uma entrada menor, conferindo que os candidatos são idênticos
+
+Uso:
+    python scripts/benchmark_chapter_detection.py
+    python scripts/benchmark_chapter_detection.py --lines 1000000 --compare-lines 20000
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.chapter_detector import ChapterDetector  # noqa: E402
+
+FILLER_LINES = [
+    "Lorem ipsum dolor sit amet, consectetur adipiscing elit.",
+    "called the pleasure-pain balance, a seesaw in the brain",
+    "1 In the notes we discuss the evidence at length",
+    "Chapter references appear throughout the text",
+    "IV. Short roman line",
+    "CH 12 is cited again here",
+    "",
+    "--- Página 12 ---",
+]
+
+
+def build_text(num_lines: int, chapter_every: int, seed: int = 42) -> str:
+    """Gera texto sintético com um título de capítulo a cada `chapter_every` linhas."""
+    rng = random.Random(seed)
+    lines = []
+    chapter = 0
+    for i in range(num_lines):
+        if i % chapter_every == 0:
+            chapter += 1
+            lines.append(f"CHAPTER {chapter}: The Synthetic Chapter Number {chapter}")
+        else:
+            lines.append(rng.choice(FILLER_LINES))
+    return "\n".join(lines)
+
+
+def legacy_candidates(text: str) -> list:
+    """Varredura original: soma de prefixo por candidato e re.match por padrão."""
+    candidates = []
+    lines = text.split('\n')
+    for i, line in enumerate(lines):
+        stripped = line.strip()
+        if not stripped or len(stripped) < 5:
+            continue
+        for pattern_name, (pattern, confidence) in ChapterDetector.PATTERNS.items():
+            match = re.match(pattern, stripped, re.IGNORECASE)
+            if match:
+                candidates.append({
+                    'line_num': i,
+                    'line_text': stripped,
+                    'pattern': pattern_name,
+                    'confidence': confidence,
+                    'chapter_num': match.group(1),
+                    'title': match.group(2).strip() if match.lastindex >= 2 else '',
+                    'start_pos': sum(len(l) + 1 for l in lines[:i])
+                })
+    return candidates
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark da detecção de capítulos")
+    parser.add_argument("--lines", type=int, default=1_000_000, help="Linhas da entrada grande")
+    parser.add_argument("--compare-lines", type=int, default=20_000,
+                        help="Linhas da entrada usada para comparar com a versão antiga")
+    parser.add_argument("--chapter-every", type=int, default=2_000, help="Linhas por capítulo")
+    args = parser.parse_args()
+
+    detector = ChapterDetector()
+
+    small_text = build_text(args.compare_lines, args.chapter_every)
+    legacy_time, legacy = _timed(legacy_candidates, small_text)
+    current_time, current = _timed(detector._find_candidates, small_text.split('\n'))
+    print(f"[{args.compare_lines} linhas] antiga: {legacy_time:.3f}s | atual: {current_time:.3f}s "
+          f"| candidatos: {len(current)} | idênticos: {'sim' if legacy == current else 'NÃO'}")
+
+    large_text = build_text(args.lines, args.chapter_every)
+    detect_time, chapters = _timed(detector.detect_chapters, large_text)
+    print(f"[{args.lines} linhas] detect_chapters: {detect_time:.3f}s | capítulos: {len(chapters)}")
+
+    return 0 if legacy == current else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
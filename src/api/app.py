@@ -55,11 +55,18 @@ templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
 from src.api import routes
 app.include_router(routes.router)
 
+# Mesmo caminho de import usado por routes.py (src no sys.path), para compartilhar o registro
+from llm_client_registry import get_client_registry
+from conversion_service import get_conversion_service
+
 # Startup event
 @app.on_event("startup")
 async def startup_event():
     """Initialize services on startup."""
     print("🚀 CoverageSummarizer Web UI started")
+    if get_client_registry().open():
+        print("🔌 Shared LLM HTTP connection pool opened")
+    get_conversion_service().start()
     print(f"🎯 Frontend target: {FRONTEND_TARGET}")
     print(f"📁 Static files: {STATIC_DIR}")
     print(f"📄 Templates: {TEMPLATES_DIR}")
@@ -73,4 +80,6 @@ async def shutdown_event():
     tracker = get_progress_tracker()
     cleaned = tracker.cleanup_old_sessions()
     print(f"🧹 Cleaned up {cleaned} old sessions")
+    await get_client_registry().close()
+    get_conversion_service().shutdown()
     print("👋 CoverageSummarizer Web UI shutting down")
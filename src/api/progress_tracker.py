@@ -96,6 +96,45 @@ class ProgressTracker:
             except asyncio.QueueFull:
                 pass  # Skip if queue is full
 
+    def publish_partial(
+        self,
+        session_id: str,
+        chapter_number: str,
+        attempt_number: int,
+        text: str
+    ) -> None:
+        """
+        Forward partial generated text to the SSE stream.
+
+        The session stage and percentage are left unchanged; the update carries
+        the new text in a "partial" field so clients can render it as it arrives.
+
+        Args:
+            session_id: Session identifier
+            chapter_number: Chapter being summarized
+            attempt_number: Generation attempt the text belongs to
+            text: Text generated since the previous partial update
+        """
+        state = self.sessions.get(session_id)
+        queue = self.queues.get(session_id)
+        if state is None or queue is None or state.complete:
+            return
+
+        try:
+            queue.put_nowait({
+                "stage": state.stage,
+                "percentage": state.percentage,
+                "message": f"Gerando resumo do capítulo {chapter_number}...",
+                "complete": False,
+                "partial": {
+                    "chapter": chapter_number,
+                    "attempt": attempt_number,
+                    "text": text
+                }
+            })
+        except asyncio.QueueFull:
+            pass
+
     def mark_complete(self, session_id: str, result: Optional[Dict] = None) -> None:
         """
         Mark a session as complete.
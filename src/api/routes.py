@@ -18,13 +18,16 @@ from sse_starlette.sse import EventSourceResponse
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from summarizer_robust import BookSummarizerRobust
-from document_reader import read_file  # NEW: Universal file reader (PDF→MD, TXT)
+from document_reader import read_file, read_file_with_converter, get_converter_signature  # NEW: Universal file reader (PDF→MD, TXT)
 from pdf_reader import read_pdf_file  # DEPRECATED: Backward compatibility
 from exporter import export_summaries
 from evidence_generator_robust import EvidenceGeneratorRobust
 from api.progress_tracker import get_progress_tracker
 from api.schemas import SummarizeResponse, HealthResponse
-from storage import get_storage_manager
+from storage import get_storage_manager, get_conversion_cache
+from llm_client_registry import get_llm_client
+from conversion_service import get_conversion_service
+from text_index import TextIndex
 from schemas.summary_storage import (
     SummaryStorage,
     PipelineType,
@@ -287,7 +290,13 @@ def _finalize_timings(timings: dict, total_time: float) -> dict:
     return final_timings
 
 
-def _print_timing_report(timings: dict, total_time: float, filename: Optional[str], content_text: str) -> None:
+def _print_timing_report(
+    timings: dict,
+    total_time: float,
+    filename: Optional[str],
+    total_words: int,
+    schedule_report: Optional[dict] = None
+) -> None:
     """
     Imprime relatório detalhado de performance.
     
@@ -295,18 +304,23 @@ def _print_timing_report(timings: dict, total_time: float, filename: Optional[st
         timings: Dicionário com todos os timings
         total_time: Tempo total do processamento
         filename: Nome do arquivo processado (ou None)
-        content_text: Texto do conteúdo processado
+        total_words: Total de palavras do conteúdo processado
+        schedule_report: Relatório do escalonamento de capítulos (makespan previsto x real)
     """
     print("\n" + "="*60, file=sys.stderr)
     print("📊 RELATÓRIO DE PERFORMANCE", file=sys.stderr)
     print("="*60, file=sys.stderr)
     print(f"📄 Arquivo: {filename or 'texto direto'}", file=sys.stderr)
-    print(f"📝 Total de palavras: {len(content_text.split())}", file=sys.stderr)
+    print(f"📝 Total de palavras: {total_words}", file=sys.stderr)
     print(f"\n⏱️  TEMPOS POR ETAPA:", file=sys.stderr)
     print(f"   • Leitura:        {timings['reading']:>8.2f}s ({timings['reading']/total_time*100:>5.1f}%)", file=sys.stderr)
     print(f"   • Processamento:  {timings['processing']:>8.2f}s ({timings['processing']/total_time*100:>5.1f}%)", file=sys.stderr)
     print(f"   • Exportação:     {timings['exporting']:>8.2f}s ({timings['exporting']/total_time*100:>5.1f}%)", file=sys.stderr)
     print(f"   • Evidência:      {timings['evidence']:>8.2f}s (incluído no processamento)", file=sys.stderr)
+    if schedule_report:
+        print(f"\n📚 CAPÍTULOS (LPT, {schedule_report['max_concurrent']} em paralelo):", file=sys.stderr)
+        print(f"   • Makespan previsto: {schedule_report['predicted_makespan']:>8.2f}s", file=sys.stderr)
+        print(f"   • Makespan real:     {schedule_report['actual_makespan']:>8.2f}s", file=sys.stderr)
     print(f"\n🎯 TEMPO TOTAL:     {total_time:>8.2f}s", file=sys.stderr)
     print("="*60 + "\n", file=sys.stderr)
 
@@ -433,6 +447,42 @@ def _build_result_contract(
     return result
 
 
+async def _convert_pdf_cached(file_path: str, file_data: bytes) -> Tuple[str, bool]:
+    """
+    Converte PDF para Markdown reutilizando conversões anteriores do mesmo arquivo.
+
+    Args:
+        file_path: Caminho do PDF salvo temporariamente
+        file_data: Bytes do PDF enviado (chave do cache)
+
+    Returns:
+        Tupla (texto convertido, True se veio do cache)
+    """
+    cache = get_conversion_cache()
+    converter = get_converter_signature(prefer_markdown=True)
+    # Hash do upload inteiro e leitura/gravação gzip em disco: fora do event loop
+    file_hash = await asyncio.to_thread(cache.hash_bytes, file_data) if cache else None
+    if cache:
+        cached_text = await asyncio.to_thread(cache.get, file_hash, converter, True)
+        if cached_text is not None:
+            return cached_text, True
+
+    # Conversão CPU-bound fora do event loop (pool de processos no servidor)
+    content_text, produced_by = await get_conversion_service().convert(
+        file_path, prefer_markdown=True, reader=read_file_with_converter
+    )
+    # Fallback para texto puro (falha do PDF→MD) não entra na chave do Markdown:
+    # uma falha transitória não deve servir texto degradado até a expulsão da entrada
+    if cache and produced_by == converter:
+        await asyncio.to_thread(cache.put, file_hash, converter, True, content_text)
+    elif cache:
+        print(
+            f"⚠️ Conversão feita por {produced_by} (esperado {converter}); não armazenada no cache",
+            file=sys.stderr
+        )
+    return content_text, False
+
+
 async def process_with_progress(
     session_id: str,
     text: Optional[str],
@@ -497,8 +547,9 @@ async def process_with_progress(
             # Read file (PDF → Markdown, TXT → plain)
             if str(temp_file_path).lower().endswith('.pdf'):
                 tracker.update_progress(session_id, "reading", 10, "Convertendo PDF para Markdown...")
-                content_text = read_file(str(temp_file_path), prefer_markdown=True)
-                tracker.update_progress(session_id, "reading", 20, "PDF convertido para Markdown!")
+                content_text, cache_hit = await _convert_pdf_cached(str(temp_file_path), file_data)
+                message = "PDF já convertido (cache)!" if cache_hit else "PDF convertido para Markdown!"
+                tracker.update_progress(session_id, "reading", 20, message)
             else:
                 tracker.update_progress(session_id, "reading", 15, "Lendo arquivo de texto...")
                 async with aiofiles.open(temp_file_path, 'r', encoding='utf-8') as f:
@@ -508,6 +559,9 @@ async def process_with_progress(
             content_text = text
             tracker.update_progress(session_id, "reading", 20, "Texto recebido")
 
+        # Índice de palavras construído uma única vez (contagens + pipeline)
+        text_index = TextIndex(content_text or "")
+
         timings['reading'] = time.time() - stage_start
         print(f"⏱️ [TIMING] Leitura: {timings['reading']:.2f}s", file=sys.stderr)
 
@@ -528,7 +582,12 @@ async def process_with_progress(
         summarizer = BookSummarizerRobust(
             evidencias_dir=str(evidencias_dir),
             metadata_collector=metadata_collector,
-            session_id=session_id  # F4: Permitir retomada baseada em session_id
+            session_id=session_id,  # F4: Permitir retomada baseada em session_id
+            llm_client=get_llm_client(),  # Pool HTTP compartilhado (None fora da API)
+            # Texto parcial dos resumos em streaming (LLM_STREAM_SUMMARIES) vai para o SSE
+            stream_callback=lambda chapter, attempt, partial: tracker.publish_partial(
+                session_id, chapter, attempt, partial
+            )
         )
 
         tracker.update_progress(session_id, "processing", 30, "Detectando capítulos...")
@@ -569,8 +628,8 @@ async def process_with_progress(
         periodic_task = asyncio.create_task(send_periodic_updates())
         
         try:
-            print(f"🔄 [PROCESSING] Iniciando pipeline robusto para {len(content_text.split())} palavras", file=sys.stderr)
-            result = await summarizer.summarize_robust(content_text)
+            print(f"🔄 [PROCESSING] Iniciando pipeline robusto para {text_index.word_count} palavras", file=sys.stderr)
+            result = await summarizer.summarize_robust(content_text, text_index=text_index)
             metadata_collector.end_process()
             print(f"✅ [PROCESSING] Pipeline robusto concluído com sucesso", file=sys.stderr)
         except Exception as e:
@@ -633,7 +692,7 @@ async def process_with_progress(
             # Prepare metadata
             metadata = {
                 "data": datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
-                "total_palavras": len(content_text.split())
+                "total_palavras": text_index.word_count
             }
             if filename:
                 metadata["arquivo"] = filename
@@ -663,7 +722,9 @@ async def process_with_progress(
         timings = _finalize_timings(timings, total_time)
         
         # Print detailed timing summary
-        _print_timing_report(timings, total_time, filename, content_text)
+        _print_timing_report(
+            timings, total_time, filename, text_index.word_count, result.get('schedule_report')
+        )
 
         tracker.update_progress(session_id, "complete", 100, f"Concluído em {total_time:.1f}s!")
 
@@ -714,7 +775,7 @@ async def process_with_progress(
                 exported_files=exported_files,
                 referencias=result.get('referencias'),
                 tracker_info=result.get('tracker_info'),
-                total_words_input=len(content_text.split()) if content_text else None,
+                total_words_input=text_index.word_count if content_text else None,
                 total_words_output=len(result.get('summary', '').split()) if result.get('summary') else None,
                 processing_time=total_time,
                 process_metadata=metadata_collector.to_dict()  # NOVO: dados detalhados do processo
@@ -8,9 +8,29 @@ from typing import List, Optional, Tuple
 import re
 import logging
 
+from src.text_index import TextIndex
+
 logger = logging.getLogger(__name__)
 
 
+def _compile_patterns(patterns: dict) -> Tuple[re.Pattern, List[Tuple[str, re.Pattern, float]]]:
+    """
+    Compila os padrões de capítulo uma única vez.
+
+    Returns:
+        Tupla (alternação de todos os padrões, lista (nome, padrão compilado, confiança))
+    """
+    compiled = [
+        (name, re.compile(pattern, re.IGNORECASE), confidence)
+        for name, (pattern, confidence) in patterns.items()
+    ]
+    any_pattern = re.compile(
+        '|'.join(f'(?:{pattern})' for pattern, _ in patterns.values()),
+        re.IGNORECASE
+    )
+    return any_pattern, compiled
+
+
 @dataclass
 class Chapter:
     """Represents a detected chapter in the book."""
@@ -72,41 +92,29 @@ class ChapterDetector:
         )
     }
 
-    def detect_chapters(self, text: str) -> List[Chapter]:
+    # Todo padrão começa com dígito ou com C/I/V/X/L (mesma semântica de IGNORECASE)
+    _FIRST_CHAR_FILTER = re.compile(r'[\dcivxl]', re.IGNORECASE)
+    _ANY_PATTERN, _COMPILED_PATTERNS = _compile_patterns(PATTERNS)
+
+    def detect_chapters(self, text: str, text_index: Optional[TextIndex] = None) -> List[Chapter]:
         """
         Detecta capítulos usando multi-pattern matching com scoring.
 
         Args:
             text: Texto completo extraído do PDF
+            text_index: Índice de palavras de `text` (opcional); quando
+                informado, as contagens de palavras saem do índice
 
         Returns:
             Lista de objetos Chapter detectados, ou lista vazia se não
             detectar estrutura válida (< 3 capítulos).
         """
-        candidates = []
         lines = text.split('\n')
 
         logger.info(f"Iniciando detecção de capítulos em {len(lines)} linhas de texto")
 
         # 1. Buscar matches de todos os padrões
-        for i, line in enumerate(lines):
-            stripped = line.strip()
-            if not stripped or len(stripped) < 5:
-                continue
-
-            for pattern_name, (pattern, confidence) in self.PATTERNS.items():
-                match = re.match(pattern, stripped, re.IGNORECASE)
-                if match:
-                    candidates.append({
-                        'line_num': i,
-                        'line_text': stripped,
-                        'pattern': pattern_name,
-                        'confidence': confidence,
-                        'chapter_num': match.group(1),
-                        'title': match.group(2).strip() if match.lastindex >= 2 else '',
-                        'start_pos': sum(len(l) + 1 for l in lines[:i])
-                    })
-                    logger.debug(f"Candidato detectado (linha {i}, padrão {pattern_name}): {stripped[:60]}")
+        candidates = self._find_candidates(lines)
 
         logger.info(f"Total de candidatos encontrados: {len(candidates)}")
 
@@ -130,7 +138,10 @@ class ChapterDetector:
                 end_pos=end_pos,
                 start_line=candidate['line_num'],
                 page_markers=self._extract_page_markers(chapter_text),
-                word_count=len(chapter_text.split()),
+                word_count=(
+                    text_index.count_words(candidate['start_pos'], end_pos)
+                    if text_index is not None else len(chapter_text.split())
+                ),
                 pattern_matched=candidate['pattern'],
                 confidence=candidate['confidence']
             ))
@@ -141,6 +152,51 @@ class ChapterDetector:
 
         return chapters
 
+    def _find_candidates(self, lines: List[str]) -> List[dict]:
+        """
+        Varre as linhas uma única vez coletando candidatos a capítulo.
+
+        O offset de cada linha é acumulado durante a varredura (linear), e
+        linhas são descartadas por um pré-filtro de primeiro caractere e por
+        uma alternação única de todos os padrões antes de testar cada padrão
+        individualmente. Uma linha pode gerar um candidato por padrão casado.
+
+        Args:
+            lines: Linhas do texto (text.split('\\n'))
+
+        Returns:
+            Lista de candidatos na ordem do texto
+        """
+        candidates = []
+        line_start = 0
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        for i, line in enumerate(lines):
+            start_pos = line_start
+            line_start += len(line) + 1
+
+            stripped = line.strip()
+            if len(stripped) < 5 or not self._FIRST_CHAR_FILTER.match(stripped):
+                continue
+            if not self._ANY_PATTERN.match(stripped):
+                continue
+
+            for pattern_name, pattern, confidence in self._COMPILED_PATTERNS:
+                match = pattern.match(stripped)
+                if match:
+                    candidates.append({
+                        'line_num': i,
+                        'line_text': stripped,
+                        'pattern': pattern_name,
+                        'confidence': confidence,
+                        'chapter_num': match.group(1),
+                        'title': match.group(2).strip() if match.lastindex >= 2 else '',
+                        'start_pos': start_pos
+                    })
+                    if debug_enabled:
+                        logger.debug(f"Candidato detectado (linha {i}, padrão {pattern_name}): {stripped[:60]}")
+
+        return candidates
+
     def _is_valid_structure(self, candidates: List[dict]) -> bool:
         """
         Valida se candidatos formam estrutura válida de capítulos.
@@ -0,0 +1,393 @@
+"""
+Escalonador de capítulos para o pipeline robusto.
+
+Capítulos são independentes entre si: cada um passa por chunking, extração,
+Recall Set e auditoria sem depender dos demais. O escalonador executa esses
+capítulos em paralelo, limitado por um teto de concorrência configurável,
+e devolve os resultados na ordem original dos capítulos.
+
+Os tamanhos variam muito (um prefácio curto ao lado de capítulos de 15 mil
+palavras); despachados na ordem do livro, o tempo total fica preso ao
+capítulo grande que começa por último. Com um ChapterCostModel, o custo de
+cada capítulo é estimado pelo número de palavras (calibrado com o histórico
+de tempos por capítulo) e o despacho segue a ordem LPT (maior custo
+primeiro), com relatório de makespan previsto x real. Capítulos com acertos
+no cache do LLM não entram no histórico (o tempo medido não representa o
+custo real) e o histórico é gravado fora do event loop.
+"""
+import asyncio
+import heapq
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+from src.llm_cache import track_cache_hits
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENT_CHAPTERS = int(os.getenv("MAX_CONCURRENT_CHAPTERS", "4"))
+
+# Histórico de tempos por capítulo (palavras, segundos) usado para estimar custos
+DEFAULT_TIMING_HISTORY_PATH = os.getenv(
+    "CHAPTER_TIMING_HISTORY_PATH", "/app/volumes/cache/chapter_timings.json"
+)
+MAX_TIMING_SAMPLES = 200
+MIN_SAMPLES_FOR_FIT = 3
+
+# Medições mais rápidas que isso não são execuções reais (p.ex. clientes
+# simulados em testes) e ficam fora do histórico
+MIN_SAMPLE_SECONDS = float(os.getenv("CHAPTER_TIMING_MIN_SECONDS", "0.5"))
+MIN_SAMPLE_SECONDS_PER_WORD = float(os.getenv("CHAPTER_TIMING_MIN_SECONDS_PER_WORD", "0.0001"))
+
+# Estimativa sem histórico: custo fixo por capítulo + custo por palavra
+DEFAULT_OVERHEAD_SECONDS = 5.0
+DEFAULT_SECONDS_PER_WORD = 0.01
+
+ChapterT = TypeVar("ChapterT")
+ResultT = TypeVar("ResultT")
+
+
+class ChapterCostModel:
+    """
+    Estima o tempo de processamento de um capítulo a partir do número de palavras.
+
+    Ajusta segundos = fixo + por_palavra * palavras (mínimos quadrados) sobre
+    as últimas MAX_TIMING_SAMPLES medições, persistidas em JSON entre execuções.
+    Sem histórico suficiente, usa DEFAULT_OVERHEAD_SECONDS/DEFAULT_SECONDS_PER_WORD.
+    Medições implausíveis (rápidas demais para o tamanho do capítulo) são
+    descartadas ao registrar e ao carregar o histórico.
+    """
+
+    def __init__(
+        self,
+        history_path: Optional[str] = DEFAULT_TIMING_HISTORY_PATH,
+        max_samples: int = MAX_TIMING_SAMPLES,
+        min_sample_seconds: float = MIN_SAMPLE_SECONDS,
+        min_sample_seconds_per_word: float = MIN_SAMPLE_SECONDS_PER_WORD
+    ):
+        """
+        Inicializa o modelo carregando o histórico.
+
+        Args:
+            history_path: Arquivo JSON do histórico (None = só em memória)
+            max_samples: Máximo de medições mantidas
+            min_sample_seconds: Duração mínima de uma medição plausível
+            min_sample_seconds_per_word: Duração mínima por palavra do capítulo
+        """
+        self.history_path = Path(history_path) if history_path else None
+        self.max_samples = max(MIN_SAMPLES_FOR_FIT, max_samples)
+        self.min_sample_seconds = min_sample_seconds
+        self.min_sample_seconds_per_word = min_sample_seconds_per_word
+        self.samples: List[Tuple[int, float]] = self._load()
+        self._save_lock = threading.Lock()
+
+    def _load(self) -> List[Tuple[int, float]]:
+        """Lê as medições do arquivo de histórico (lista vazia se ausente ou inválido)."""
+        if self.history_path is None or not self.history_path.exists():
+            return []
+        try:
+            data = json.loads(self.history_path.read_text(encoding="utf-8"))
+            samples = [(int(words), float(seconds)) for words, seconds in data.get("samples", [])]
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            logger.warning(f"Histórico de tempos de capítulos ignorado ({self.history_path}): {e}")
+            return []
+        plausible = [sample for sample in samples if self.is_plausible(*sample)]
+        if len(plausible) < len(samples):
+            logger.warning(
+                f"{len(samples) - len(plausible)} medições implausíveis descartadas do histórico "
+                f"({self.history_path})"
+            )
+        return plausible[-self.max_samples:]
+
+    def save(self) -> None:
+        """
+        Grava as medições no arquivo de histórico (falhas só geram aviso).
+
+        Bloqueante (I/O de arquivo): no pipeline assíncrono, chamar via
+        asyncio.to_thread.
+        """
+        if self.history_path is None:
+            return
+        samples = list(self.samples)
+        try:
+            with self._save_lock:
+                self.history_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.history_path.with_suffix(".tmp")
+                tmp_path.write_text(json.dumps({"samples": samples}), encoding="utf-8")
+                os.replace(tmp_path, self.history_path)
+        except OSError as e:
+            logger.warning(f"Não foi possível gravar o histórico de tempos ({self.history_path}): {e}")
+
+    def is_plausible(self, words: int, seconds: float) -> bool:
+        """
+        Indica se uma medição pode vir de um processamento real do capítulo.
+
+        Args:
+            words: Palavras do capítulo
+            seconds: Tempo de processamento em segundos
+
+        Returns:
+            False para durações rápidas demais (p.ex. ~1ms com LLM simulado)
+        """
+        return seconds >= max(self.min_sample_seconds, self.min_sample_seconds_per_word * words)
+
+    def observe(self, words: int, seconds: float) -> bool:
+        """
+        Registra o tempo medido de um capítulo.
+
+        Args:
+            words: Palavras do capítulo
+            seconds: Tempo de processamento em segundos
+
+        Returns:
+            True se a medição entrou no histórico (False se implausível)
+        """
+        if not self.is_plausible(words, seconds):
+            logger.debug(f"Medição implausível ignorada: {words} palavras em {seconds:.3f}s")
+            return False
+        self.samples.append((int(words), float(seconds)))
+        del self.samples[:-self.max_samples]
+        return True
+
+    def coefficients(self) -> Tuple[float, float]:
+        """
+        Coeficientes (fixo, por_palavra) do modelo linear.
+
+        Returns:
+            Tupla (segundos fixos, segundos por palavra), ambos >= 0
+        """
+        if len(self.samples) < MIN_SAMPLES_FOR_FIT:
+            return DEFAULT_OVERHEAD_SECONDS, DEFAULT_SECONDS_PER_WORD
+        n = len(self.samples)
+        mean_words = sum(words for words, _ in self.samples) / n
+        mean_seconds = sum(seconds for _, seconds in self.samples) / n
+        variance = sum((words - mean_words) ** 2 for words, _ in self.samples)
+        covariance = sum(
+            (words - mean_words) * (seconds - mean_seconds) for words, seconds in self.samples
+        )
+        if variance > 0 and covariance > 0:
+            per_word = covariance / variance
+            return max(0.0, mean_seconds - per_word * mean_words), per_word
+        # Tamanhos iguais ou sem correlação: custo proporcional às palavras
+        per_word = mean_seconds / mean_words if mean_words else DEFAULT_SECONDS_PER_WORD
+        return 0.0, per_word
+
+    def estimate(self, words: int) -> float:
+        """
+        Tempo estimado de um capítulo.
+
+        Args:
+            words: Palavras do capítulo
+
+        Returns:
+            Segundos estimados
+        """
+        overhead, per_word = self.coefficients()
+        return overhead + per_word * words
+
+
+@dataclass
+class ScheduleReport:
+    """Relatório de uma execução escalonada (makespan previsto x real)."""
+    max_concurrent: int
+    predicted_makespan: float
+    actual_makespan: float
+    # Por capítulo, na ordem de despacho: label, words, predicted_seconds, actual_seconds,
+    # cache_hits (capítulos com acertos no cache do LLM não alimentam o histórico)
+    chapters: List[Dict] = field(default_factory=list)
+
+    def to_dict(self) -> Dict:
+        """Relatório como dicionário (para logs e resultado do pipeline)."""
+        return asdict(self)
+
+
+def predict_makespan(costs: Sequence[float], max_concurrent: int) -> float:
+    """
+    Makespan previsto despachando `costs` na ordem dada para o primeiro worker livre.
+
+    Args:
+        costs: Custos estimados na ordem de despacho
+        max_concurrent: Número de workers
+
+    Returns:
+        Tempo previsto até o último capítulo terminar
+    """
+    workers = [0.0] * min(max(1, max_concurrent), max(1, len(costs)))
+    for cost in costs:
+        heapq.heappush(workers, heapq.heappop(workers) + cost)
+    return max(workers)
+
+
+class ChapterScheduler:
+    """
+    Executa um worker assíncrono por capítulo com concorrência limitada.
+
+    Garantias:
+    - No máximo `max_concurrent` capítulos em processamento simultâneo
+    - Resultados retornados na mesma ordem dos capítulos de entrada
+    - Se um capítulo falhar, os demais em andamento são cancelados e o erro propaga
+    - Com cost_model e `size`, despacho em ordem LPT (maior custo estimado primeiro)
+      e relatório em `last_report`; o histórico só recebe capítulos sem acertos
+      no cache do LLM
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = DEFAULT_MAX_CONCURRENT_CHAPTERS,
+        cost_model: Optional[ChapterCostModel] = None
+    ):
+        """
+        Inicializa o escalonador.
+
+        Args:
+            max_concurrent: Máximo de capítulos processados ao mesmo tempo (mínimo 1)
+            cost_model: Estimador de custo por capítulo (opcional; sem ele, despacho na ordem de entrada)
+        """
+        self.max_concurrent = max(1, max_concurrent)
+        self.cost_model = cost_model
+        self.last_report: Optional[ScheduleReport] = None
+
+    async def run(
+        self,
+        chapters: Sequence[ChapterT],
+        worker: Callable[[ChapterT], Awaitable[ResultT]],
+        size: Optional[Callable[[ChapterT], int]] = None
+    ) -> List[ResultT]:
+        """
+        Processa todos os capítulos respeitando o limite de concorrência.
+
+        Args:
+            chapters: Capítulos a processar (ordem define a ordem do resultado)
+            worker: Corrotina que processa um capítulo
+            size: Palavras de um capítulo (com cost_model, ativa o despacho LPT)
+
+        Returns:
+            Lista de resultados na ordem dos capítulos
+
+        Raises:
+            Exception: Primeiro erro levantado por algum worker
+        """
+        if not chapters:
+            return []
+
+        dispatch_order = list(range(len(chapters)))
+        sizes: Optional[List[int]] = None
+        estimates: List[float] = []
+        if size is not None and self.cost_model is not None:
+            sizes = [size(chapter) for chapter in chapters]
+            estimates = [self.cost_model.estimate(words) for words in sizes]
+            dispatch_order.sort(key=lambda index: estimates[index], reverse=True)
+
+        logger.info(
+            f"  → Escalonando {len(chapters)} capítulos "
+            f"(concorrência máxima: {self.max_concurrent}"
+            f"{', ordem LPT' if sizes is not None else ''})"
+        )
+        semaphore = asyncio.Semaphore(self.max_concurrent)
+        durations = [0.0] * len(chapters)
+        cache_hits = [0] * len(chapters)
+        start = time.perf_counter()
+        # Tasks criadas na ordem de despacho: o semáforo (FIFO) libera nessa ordem
+        tasks_by_index = {
+            index: asyncio.create_task(
+                self._run_bounded(semaphore, worker, chapters[index], durations, cache_hits, index)
+            )
+            for index in dispatch_order
+        }
+        results = await self._gather_or_cancel([tasks_by_index[i] for i in range(len(chapters))])
+
+        if sizes is not None:
+            self._report(
+                chapters, dispatch_order, sizes, estimates, durations, cache_hits,
+                time.perf_counter() - start
+            )
+            await asyncio.to_thread(self.cost_model.save)
+        return results
+
+    async def _run_bounded(
+        self,
+        semaphore: asyncio.Semaphore,
+        worker: Callable[[ChapterT], Awaitable[ResultT]],
+        chapter: ChapterT,
+        durations: List[float],
+        cache_hits: List[int],
+        index: int
+    ) -> ResultT:
+        """Executa worker dentro do semáforo (fila FIFO preserva a ordem de despacho)."""
+        async with semaphore:
+            started = time.perf_counter()
+            with track_cache_hits() as counter:
+                try:
+                    return await worker(chapter)
+                finally:
+                    durations[index] = time.perf_counter() - started
+                    cache_hits[index] = counter.hits
+
+    def _report(
+        self,
+        chapters: Sequence[ChapterT],
+        dispatch_order: List[int],
+        sizes: List[int],
+        estimates: List[float],
+        durations: List[float],
+        cache_hits: List[int],
+        actual_makespan: float
+    ) -> None:
+        """Alimenta o histórico do cost_model e monta o relatório previsto x real."""
+        for words, seconds, hits in zip(sizes, durations, cache_hits):
+            if not hits:
+                self.cost_model.observe(words, seconds)
+
+        self.last_report = ScheduleReport(
+            max_concurrent=self.max_concurrent,
+            predicted_makespan=predict_makespan(
+                [estimates[index] for index in dispatch_order], self.max_concurrent
+            ),
+            actual_makespan=actual_makespan,
+            chapters=[
+                {
+                    "label": str(getattr(chapters[index], "number", index)),
+                    "words": sizes[index],
+                    "predicted_seconds": estimates[index],
+                    "actual_seconds": durations[index],
+                    "cache_hits": cache_hits[index]
+                }
+                for index in dispatch_order
+            ]
+        )
+        logger.info(
+            f"  → Makespan dos capítulos: previsto {self.last_report.predicted_makespan:.1f}s, "
+            f"real {actual_makespan:.1f}s"
+        )
+
+    async def _gather_or_cancel(self, tasks: List[asyncio.Task]) -> List:
+        """Aguarda todas as tasks; em caso de falha cancela as restantes e propaga o erro."""
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+
+# Instância global (histórico de tempos compartilhado entre execuções)
+_chapter_cost_model: Optional[ChapterCostModel] = None
+
+
+def get_chapter_cost_model() -> ChapterCostModel:
+    """
+    Retorna o estimador de custo de capítulos compartilhado.
+
+    Returns:
+        Instância de ChapterCostModel
+    """
+    global _chapter_cost_model
+    if _chapter_cost_model is None:
+        _chapter_cost_model = ChapterCostModel()
+    return _chapter_cost_model
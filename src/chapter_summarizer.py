@@ -5,15 +5,134 @@ Generates structured summaries per chapter with specific details, examples, and
 
 Gate Z5: Pipeline robusto com chunking, extração, Recall Set, auditoria e loop de regeneração.
 """
+from contextlib import aclosing
 from dataclasses import dataclass, asdict
-from typing import List, Dict, Optional, Tuple
+from typing import Callable, List, Dict, Optional, Tuple
 import asyncio
 import logging
+import os
 import re
 import sys
 
+from src.text_index import ChunkView, TextIndex
+from src.token_budget import DEFAULT_CHUNK_TOKEN_BUDGET, TokenBudget, get_token_budget
+from src.json_extraction import JSON_OBJECT_FORMAT, PARSE_FAILED, extract_json, get_parse_stats
+from src.recall_auditor import IncrementalRecallAuditor
+from src.tree_reducer import TreeReducer
+from src.repair_policy import (
+    REPAIR_ADDENDUM, REPAIR_INSERT, REPAIR_POLICY_ENABLED, REPAIR_REGENERATE, RepairPolicy
+)
+
 logger = logging.getLogger(__name__)
 
+DEFAULT_MAX_CONCURRENT_CHUNKS = int(os.getenv("MAX_CONCURRENT_CHUNKS", "8"))
+
+# Chunks por chamada de extração (1 = uma chamada por chunk)
+DEFAULT_EXTRACTION_BATCH_SIZE = int(os.getenv("EXTRACTION_BATCH_SIZE", "1"))
+
+# Pede saída em JSON mode (response_format json_object) nas extrações
+LLM_JSON_MODE = os.getenv("LLM_JSON_MODE", "true").lower() == "true"
+
+# Candidatos de resumo gerados em paralelo por rodada (1 = tentativas sequenciais)
+DEFAULT_SPECULATIVE_CANDIDATES = int(os.getenv("SPECULATIVE_CANDIDATES", "1"))
+MARKERS_TEMPERATURE = 0.3
+# Temperaturas dos candidatos especulativos, na ordem das tentativas
+SPECULATIVE_TEMPERATURES = (0.3, 0.5, 0.7, 0.9, 1.0)
+
+# Gera os resumos com marcadores em streaming, auditando marcadores durante a geração
+LLM_STREAM_SUMMARIES = os.getenv("LLM_STREAM_SUMMARIES", "false").lower() == "true"
+# Caracteres acumulados antes de repassar texto parcial ao stream_callback
+STREAM_PARTIAL_MIN_CHARS = 200
+
+# Tamanho de chunk quando não há orçamento de tokens configurado
+DEFAULT_CHUNK_WORDS = 1000
+DEFAULT_CHUNK_OVERLAP_WORDS = 100
+
+EXTRACTION_MAX_OUTPUT_TOKENS = 500
+MARKERS_MAX_OUTPUT_TOKENS = 2000
+# Resumo executivo: tokens de saída por palavra alvo e saída das reduções parciais
+EXECUTIVE_TOKENS_PER_WORD = 3
+EXECUTIVE_TARGET_WORDS = (200, 500)
+PARTIAL_REDUCE_MAX_OUTPUT_TOKENS = 800
+# Reparo por inserção: uma frase curta por item faltante
+INSERTION_MAX_OUTPUT_TOKENS_PER_ITEM = 80
+
+EXTRACTION_SYSTEM_MESSAGE = "Você é um extrator de informações estruturadas. Retorne apenas JSON válido."
+EXTRACTION_PROMPT = """Extraia do seguinte texto:
+- Conceitos principais (nomes, termos técnicos, definições)
+- Ideias centrais (afirmações do autor)
+- Exemplos mencionados
+
+Texto:
+{text}
+
+Formato JSON:
+{{
+    "concepts": ["conceito1", "conceito2"],
+    "ideas": ["ideia1", "ideia2"],
+    "examples": ["exemplo1"]
+}}"""
+
+BATCH_EXTRACTION_PROMPT = """Para CADA um dos {count} trechos abaixo, extraia:
+- Conceitos principais (nomes, termos técnicos, definições)
+- Ideias centrais (afirmações do autor)
+- Exemplos mencionados
+
+{sections}
+
+Responda com um objeto JSON cuja chave "chunks" tem exatamente um objeto por trecho, usando o chunk_id de cada trecho:
+{{
+    "chunks": [
+        {{"chunk_id": 0, "concepts": ["conceito1"], "ideas": ["ideia1"], "examples": ["exemplo1"]}}
+    ]
+}}"""
+BATCH_SECTION = "### Trecho chunk_id={chunk_id}\n{text}"
+
+EXECUTIVE_PROMPT = """Baseado nos resumos de todos os capítulos abaixo, crie um resumo executivo de aproximadamente {target_words} palavras do livro completo.
+
+Resumos dos capítulos:
+{combined}
+
+Alguns exemplos concretos mencionados no livro:
+{exemplos_text}
+
+**IMPORTANTE**:
+- Seja ESPECÍFICO, não genérico
+- Mencione exemplos concretos do livro
+- Não use frases vagas como "o livro explora..." ou "discute questões..."
+- Se o livro menciona casos, estudos, pessoas - CITE-OS
+- Foque no argumento central e evidências apresentadas
+
+Resumo executivo (~{target_words} palavras):"""
+
+PARTIAL_REDUCE_PROMPT = """Condense os resumos de capítulos abaixo em um único resumo intermediário.
+Preserve os números e títulos dos capítulos, o argumento central de cada um e os
+exemplos concretos, nomes, casos e estudos citados. Não invente fatos.
+
+{combined}
+
+Resumo intermediário:"""
+
+INSERTION_SYSTEM_MESSAGE = (
+    "Você complementa resumos existentes. Retorne apenas as frases pedidas, "
+    "uma por linha, cada uma com seu marcador."
+)
+INSERTION_PROMPT = """O resumo abaixo do Capítulo {chapter_number} omitiu {count} item(ns) crítico(s).
+
+RESUMO ATUAL:
+{summary}
+
+Escreva UMA frase (15-30 palavras) para cada item abaixo, coerente com o resumo,
+terminando com o marcador copiado sem alterações:
+{items}
+
+FRASES (uma por linha):"""
+# Seções que seguem o corpo do resumo (ver _parse_structured_response)
+SUMMARY_SECTION_PATTERN = re.compile(
+    r'^[ \t]*(?:PONTOS[- ]CHAVE|CITAÇÕES|CITACOES|QUOTES|EXEMPLOS|EXAMPLES):',
+    re.IGNORECASE | re.MULTILINE
+)
+
 
 @dataclass
 class ChapterSummary:
@@ -48,17 +167,56 @@ class ChapterSummarizer:
     depois combina em um resumo executivo do livro completo.
     """
 
-    def __init__(self, metadata_collector=None):
+    def __init__(
+        self,
+        metadata_collector=None,
+        max_concurrent_chunks: int = DEFAULT_MAX_CONCURRENT_CHUNKS,
+        client=None,
+        token_budget: Optional[TokenBudget] = None,
+        chunk_token_budget: int = DEFAULT_CHUNK_TOKEN_BUDGET,
+        extraction_batch_size: int = DEFAULT_EXTRACTION_BATCH_SIZE,
+        json_mode: bool = LLM_JSON_MODE,
+        speculative_candidates: int = DEFAULT_SPECULATIVE_CANDIDATES,
+        repair_policy: Optional[RepairPolicy] = None,
+        repair_policy_enabled: bool = REPAIR_POLICY_ENABLED,
+        stream_summaries: bool = LLM_STREAM_SUMMARIES,
+        stream_callback: Optional[Callable[[str, int, str], None]] = None
+    ):
         """
         Inicializa o ChapterSummarizer.
         
         Args:
             metadata_collector: Coletor de metadados do processo (opcional)
+            max_concurrent_chunks: Máximo de extrações de chunk simultâneas por capítulo
+            client: AsyncOpenAIClient compartilhado (opcional; se None, cria um próprio)
+            token_budget: Orçamento de tokens do modelo (opcional; se None, usa o do modelo do cliente)
+            chunk_token_budget: Tokens por chunk (0 = DEFAULT_CHUNK_WORDS palavras por chunk)
+            extraction_batch_size: Chunks agrupados por chamada de extração (1 = sem lote)
+            json_mode: Se True, pede response_format json_object nas extrações
+            speculative_candidates: Resumos candidatos gerados em paralelo por rodada
+                em _audit_and_regenerate (1 = tentativas sequenciais)
+            repair_policy: Política de reparo de resumos reprovados (opcional; se None, usa a padrão)
+            repair_policy_enabled: Se False, resumos reprovados só são regenerados por completo
+            stream_summaries: Se True, gera os resumos com marcadores em streaming e
+                aborta gerações com marcadores inventados/malformados
+            stream_callback: Recebe (capítulo, tentativa, texto parcial) durante o streaming
+                (ex.: repasse ao SSE de progresso)
         """
-        # Import here to avoid circular import
-        from summarizer import AsyncOpenAIClient
-        self.client = AsyncOpenAIClient()
+        if client is None:
+            # Import here to avoid circular import
+            from summarizer import AsyncOpenAIClient
+            client = AsyncOpenAIClient()
+        self.client = client
         self.metadata_collector = metadata_collector
+        self.max_concurrent_chunks = max(1, max_concurrent_chunks)
+        self.token_budget = token_budget or get_token_budget(getattr(client, 'model', None))
+        self.chunk_token_budget = max(0, chunk_token_budget)
+        self.extraction_batch_size = max(1, extraction_batch_size)
+        self.json_mode = json_mode
+        self.speculative_candidates = max(1, speculative_candidates)
+        self.repair_policy = (repair_policy or RepairPolicy()) if repair_policy_enabled else None
+        self.stream_summaries = stream_summaries
+        self.stream_callback = stream_callback
 
     async def summarize_chapter(
         self,
@@ -192,17 +350,15 @@ EXEMPLOS:
         # 2. Gerar resumo executivo baseado nos capítulos
         logger.info("Gerando resumo executivo do livro completo...")
 
-        combined_summaries = "\n\n".join([
-            f"Capítulo {cs.numero} - {cs.titulo}:\n{cs.resumo[:300]}..."
-            for cs in chapter_summaries
-        ])
+        combined_summaries = await self._combine_chapter_summaries(chapter_summaries)
 
-        executive_curto = await self._generate_executive(
-            combined_summaries, target_words=200, chapter_summaries=chapter_summaries
-        )
-        executive_medio = await self._generate_executive(
-            combined_summaries, target_words=500, chapter_summaries=chapter_summaries
-        )
+        # Os dois resumos executivos são independentes: gerados em paralelo
+        executive_curto, executive_medio = await asyncio.gather(*[
+            self._generate_executive(
+                combined_summaries, target_words=target_words, chapter_summaries=chapter_summaries
+            )
+            for target_words in EXECUTIVE_TARGET_WORDS
+        ])
 
         # 3. Extrair bullets gerais (top pontos de cada capítulo)
         all_points = []
@@ -245,42 +401,78 @@ EXEMPLOS:
         Returns:
             Resumo executivo do livro completo
         """
-        # Extrair alguns exemplos concretos dos capítulos
-        exemplos_destaque = []
-        for cs in chapter_summaries[:5]:  # Primeiros 5 capítulos
-            if cs.exemplos:
-                exemplos_destaque.append(cs.exemplos[0])
+        prompt = EXECUTIVE_PROMPT.format(
+            target_words=target_words,
+            combined=combined,
+            exemplos_text=self._executive_examples(chapter_summaries)
+        )
 
-        exemplos_text = "\n".join(f"- {ex}" for ex in exemplos_destaque[:3])
+        # Import here to avoid circular import
+        from summarizer import SummarySpecs
 
-        prompt = f"""Baseado nos resumos de todos os capítulos abaixo, crie um resumo executivo de aproximadamente {target_words} palavras do livro completo.
+        response = await self.client.complete(
+            system_message=SummarySpecs.BASE_SYSTEM_MESSAGE,
+            user_message=prompt,
+            max_output_tokens=target_words * EXECUTIVE_TOKENS_PER_WORD,
+            temperature=0.4
+        )
 
-Resumos dos capítulos:
-{combined}
+        return response.strip()
 
-Alguns exemplos concretos mencionados no livro:
-{exemplos_text}
+    @staticmethod
+    def _executive_examples(chapter_summaries: List[ChapterSummary]) -> str:
+        """Até 3 exemplos concretos dos primeiros 5 capítulos, como lista."""
+        exemplos_destaque = [cs.exemplos[0] for cs in chapter_summaries[:5] if cs.exemplos]
+        return "\n".join(f"- {ex}" for ex in exemplos_destaque[:3])
 
-**IMPORTANTE**:
-- Seja ESPECÍFICO, não genérico
-- Mencione exemplos concretos do livro
-- Não use frases vagas como "o livro explora..." ou "discute questões..."
-- Se o livro menciona casos, estudos, pessoas - CITE-OS
-- Foque no argumento central e evidências apresentadas
+    async def _combine_chapter_summaries(self, chapter_summaries: List[ChapterSummary]) -> str:
+        """
+        Junta os resumos dos capítulos para os prompts do resumo executivo.
 
-Resumo executivo (~{target_words} palavras):"""
+        Se a junção não cabe no orçamento do prompt executivo (livros com
+        dezenas de capítulos), os resumos são dobrados em árvore por
+        reduções parciais paralelas (ver TreeReducer) em vez de um único
+        prompt gigante.
+
+        Args:
+            chapter_summaries: Resumos dos capítulos, na ordem do livro
 
+        Returns:
+            Texto combinado que cabe no prompt executivo
+        """
+        parts = [
+            f"Capítulo {cs.numero} - {cs.titulo}:\n{cs.resumo[:300]}..."
+            for cs in chapter_summaries
+        ]
         # Import here to avoid circular import
         from summarizer import SummarySpecs
 
-        response = await self.client.complete(
-            system_message=SummarySpecs.BASE_SYSTEM_MESSAGE,
-            user_message=prompt,
-            max_output_tokens=target_words * 3,
-            temperature=0.4
+        overhead = SummarySpecs.BASE_SYSTEM_MESSAGE + EXECUTIVE_PROMPT.format(
+            target_words=max(EXECUTIVE_TARGET_WORDS),
+            combined="",
+            exemplos_text=self._executive_examples(chapter_summaries)
         )
+        budget = self.token_budget.prompt_budget(
+            max(EXECUTIVE_TARGET_WORDS) * EXECUTIVE_TOKENS_PER_WORD, overhead
+        )
+        reducer = TreeReducer(self.token_budget.count, budget)
+
+        async def reduce_group(group: List[str], level: int) -> str:
+            response = await self.client.complete(
+                system_message=SummarySpecs.BASE_SYSTEM_MESSAGE,
+                user_message=PARTIAL_REDUCE_PROMPT.format(combined="\n\n".join(group)),
+                max_output_tokens=PARTIAL_REDUCE_MAX_OUTPUT_TOKENS,
+                temperature=0.3
+            )
+            return response.strip()
 
-        return response.strip()
+        folded = await reducer.fold(parts, reduce_group)
+        if reducer.depth:
+            logger.info(
+                f"Resumos de {len(parts)} capítulos dobrados em {reducer.depth} níveis "
+                f"({len(folded)} partes) para o resumo executivo"
+            )
+        return "\n\n".join(folded)
 
     def _parse_structured_response(self, response: str) -> Dict:
         """
@@ -362,52 +554,123 @@ Resumo executivo (~{target_words} palavras):"""
 
     # ============ Gate Z5: Pipeline Robusto ============
 
-    def _chunk_chapter(self, chapter_text: str, chapter_number: str, chunk_word_target: int = 1000, overlap_words: int = 100) -> List[Dict]:
+    def _chunk_chapter(
+        self,
+        chapter_text: str,
+        chapter_number: str,
+        chunk_word_target: Optional[int] = None,
+        overlap_words: Optional[int] = None,
+        text_index: Optional[TextIndex] = None,
+        start_char: int = 0
+    ) -> List[Dict]:
         """
         Divide capítulo em chunks numerados.
         
         Gate Z5: Cada chunk recebe chunk_id único.
         
+        Os chunks são visões (ChunkView) com offsets no texto: o texto do
+        chunk é a fatia original (espaços e quebras de linha preservados),
+        materializada apenas quando acessada. Offsets de palavras e de
+        caracteres são relativos ao início do capítulo, com ou sem text_index.
+        
         Args:
             chapter_text: Texto do capítulo
             chapter_number: Número do capítulo
             chunk_word_target: Tamanho alvo de chunks em palavras
-            overlap_words: Overlap entre chunks em palavras
+                (None = planejado por _plan_chunk_words)
+            overlap_words: Overlap entre chunks em palavras (None = planejado)
+            text_index: Índice de palavras do texto completo (opcional); quando
+                informado, as faixas dos chunks saem do índice sem split
+            start_char: Offset de chapter_text no texto indexado
             
         Returns:
-            Lista de dicionários com chunks:
+            Lista de chunks (ChunkView, acessíveis como dict):
             [
                 {
                     'chunk_id': 'cap_1_chunk_0',
                     'text': '...',
-                    'words': 1000
+                    'words': 1000,
+                    'start_word': 0,
+                    'end_word': 1000,
+                    'start_char': 0,
+                    'end_char': 6120
                 },
                 ...
             ]
         """
-        words = chapter_text.split()
-        chunks = []
-        chunk_idx = 0
-        i = 0
-        
-        while i < len(words):
-            chunk_words = words[i:i + chunk_word_target]
-            chunk_text = ' '.join(chunk_words)
-            chunk_id = f"cap_{chapter_number}_chunk_{chunk_idx}"
-            
-            chunks.append({
-                'chunk_id': chunk_id,
-                'text': chunk_text,
-                'words': len(chunk_words),
-                'start_word': i,
-                'end_word': i + len(chunk_words)
-            })
-            
-            chunk_idx += 1
-            # Avançar com overlap
-            i += chunk_word_target - overlap_words
-            
-        return chunks
+        if chunk_word_target is None or overlap_words is None:
+            planned_words, planned_overlap = self._plan_chunk_words(chapter_text)
+            chunk_word_target = chunk_word_target or planned_words
+            overlap_words = planned_overlap if overlap_words is None else overlap_words
+
+        end_char = start_char + len(chapter_text)
+        if text_index is None or not text_index.is_clean_range(start_char, end_char):
+            # Sem índice compartilhado (ou limites cortando palavras): indexar só o capítulo
+            text_index, start_char, end_char = TextIndex(chapter_text), 0, len(chapter_text)
+
+        first, last = text_index.word_range(start_char, end_char)
+        ranges = text_index.word_chunks(chunk_word_target, chunk_word_target - overlap_words, first, last)
+        return [
+            ChunkView(
+                text_index.text,
+                *text_index.char_span(start, end),
+                base_char=start_char,
+                chunk_id=f"cap_{chapter_number}_chunk_{chunk_idx}",
+                words=end - start,
+                start_word=start - first,
+                end_word=end - first
+            )
+            for chunk_idx, (start, end) in enumerate(ranges)
+        ]
+
+    def _plan_chunk_words(self, chapter_text: str) -> Tuple[int, int]:
+        """
+        Define palavras por chunk e overlap a partir do orçamento de tokens.
+
+        Sem orçamento configurado, mantém DEFAULT_CHUNK_WORDS/DEFAULT_CHUNK_OVERLAP_WORDS.
+        Com orçamento, converte tokens em palavras pela razão tokens/palavra
+        medida no próprio capítulo, limitado ao que cabe no prompt de extração.
+
+        Args:
+            chapter_text: Texto do capítulo
+
+        Returns:
+            Tupla (palavras por chunk, palavras de overlap)
+        """
+        if self.chunk_token_budget <= 0:
+            return DEFAULT_CHUNK_WORDS, DEFAULT_CHUNK_OVERLAP_WORDS
+
+        budget = min(
+            self.chunk_token_budget,
+            self.token_budget.prompt_budget(
+                EXTRACTION_MAX_OUTPUT_TOKENS,
+                EXTRACTION_SYSTEM_MESSAGE + EXTRACTION_PROMPT.format(text="")
+            )
+        )
+        words = self.token_budget.words_for_tokens(budget, chapter_text)
+        return words, words // 10
+
+    def _fit_prompt_text(self, text: str, max_output_tokens: int, prompt_overhead: str, label: str) -> str:
+        """
+        Maior trecho de `text` que cabe no prompt, avisando quando truncar.
+
+        Args:
+            text: Texto-fonte a incluir no prompt
+            max_output_tokens: Tokens reservados para a resposta
+            prompt_overhead: Restante do prompt (instruções + mensagem de sistema)
+            label: Identificação para o log (ex.: "chunk 3")
+
+        Returns:
+            Texto inteiro ou o maior prefixo que cabe
+        """
+        budget = self.token_budget.prompt_budget(max_output_tokens, prompt_overhead)
+        excerpt, truncated = self.token_budget.fit_text(text, budget)
+        if truncated:
+            logger.warning(
+                f"Texto de {label} truncado para caber no prompt: "
+                f"{len(excerpt)}/{len(text)} caracteres ({budget} tokens disponíveis)"
+            )
+        return excerpt
 
     async def _extract_from_chunks(self, chunks: List[Dict]) -> List[Dict]:
         """
@@ -415,11 +678,18 @@ Resumo executivo (~{target_words} palavras):"""
         
         Gate Z5: Extração primária por chunk (pode mockar LLM nos testes).
         
+        Os chunks são extraídos em paralelo (fan-out limitado por semáforo por
+        capítulo). Cada chunk trata suas próprias falhas: um chunk com erro
+        (incluindo o backoff de retry do cliente) não serializa os demais.
+        
+        Com extraction_batch_size > 1, até K chunks vão em uma única chamada
+        (ver _extract_batch); o formato das extrações não muda.
+        
         Args:
             chunks: Lista de chunks retornada por _chunk_chapter()
             
         Returns:
-            Lista de extrações:
+            Lista de extrações na mesma ordem de chunk_id dos chunks:
             [
                 {
                     'chunk_id': 1,
@@ -430,74 +700,236 @@ Resumo executivo (~{target_words} palavras):"""
                 ...
             ]
         """
-        extractions = []
-        
+        semaphore = asyncio.Semaphore(self.max_concurrent_chunks)
+        if self.extraction_batch_size > 1:
+            batches = await asyncio.gather(*[
+                self._extract_batch(batch, semaphore)
+                for batch in self._pack_extraction_batches(chunks)
+            ])
+            return [extraction for batch in batches for extraction in batch]
+
+        extractions = await asyncio.gather(*[
+            self._extract_single_chunk(chunk, semaphore)
+            for chunk in chunks
+        ])
+        return list(extractions)
+
+    def _pack_extraction_batches(self, chunks: List[Dict]) -> List[List[Dict]]:
+        """
+        Agrupa chunks consecutivos em lotes de até extraction_batch_size.
+
+        Um lote também é fechado antes de exceder o orçamento de tokens do
+        prompt (saída reservada proporcional ao número de chunks).
+
+        Args:
+            chunks: Lista de chunks retornada por _chunk_chapter()
+
+        Returns:
+            Lista de lotes, na ordem original dos chunks
+        """
+        budget = self.token_budget.prompt_budget(
+            EXTRACTION_MAX_OUTPUT_TOKENS * self.extraction_batch_size,
+            EXTRACTION_SYSTEM_MESSAGE + BATCH_EXTRACTION_PROMPT.format(count=0, sections="")
+        )
+        batches: List[List[Dict]] = []
+        current: List[Dict] = []
+        current_tokens = 0
         for chunk in chunks:
-            chunk_id_num = int(chunk['chunk_id'].split('_')[-1])
-            chunk_text = chunk['text']
-            is_heading = chunk_text.strip().startswith('#') or len(chunk_text.strip().split('\n')) < 3
-            
-            # Prompt para extração
-            prompt = f"""Extraia do seguinte texto:
-- Conceitos principais (nomes, termos técnicos, definições)
-- Ideias centrais (afirmações do autor)
-- Exemplos mencionados
+            tokens = self.token_budget.count(chunk['text'])
+            if current and (len(current) >= self.extraction_batch_size or current_tokens + tokens > budget):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(chunk)
+            current_tokens += tokens
+        if current:
+            batches.append(current)
+        return batches
+
+    async def _extract_batch(self, batch: List[Dict], semaphore: asyncio.Semaphore) -> List[Dict]:
+        """
+        Extrai vários chunks em uma única chamada ao LLM.
 
-Texto:
-{chunk_text[:2000]}
+        Pede um array JSON com um objeto por chunk_id e valida a resposta;
+        se a chamada falhar ou a resposta não cobrir exatamente os chunks do
+        lote, cada chunk é extraído individualmente (_extract_single_chunk).
 
-Formato JSON:
-{{
-    "concepts": ["conceito1", "conceito2"],
-    "ideas": ["ideia1", "ideia2"],
-    "examples": ["exemplo1"]
-}}"""
+        Args:
+            batch: Chunks consecutivos do capítulo
+            semaphore: Semáforo que limita extrações simultâneas do capítulo
+
+        Returns:
+            Extrações dos chunks do lote, na ordem do lote
+        """
+        if len(batch) == 1:
+            return [await self._extract_single_chunk(batch[0], semaphore)]
 
+        chunk_ids = [self._chunk_id_number(chunk) for chunk in batch]
+        sections = "\n\n".join(
+            BATCH_SECTION.format(chunk_id=chunk_id, text=chunk['text'])
+            for chunk_id, chunk in zip(chunk_ids, batch)
+        )
+        prompt = BATCH_EXTRACTION_PROMPT.format(count=len(batch), sections=sections)
+
+        try:
+            async with semaphore:
+                response = await self.client.complete(
+                    system_message=EXTRACTION_SYSTEM_MESSAGE,
+                    user_message=prompt,
+                    max_output_tokens=EXTRACTION_MAX_OUTPUT_TOKENS * len(batch),
+                    temperature=0.2,
+                    **self._extraction_format()
+                )
+            extracted_by_id = self._parse_batch_extraction(response, chunk_ids)
+        except Exception as e:
+            logger.warning(f"Erro na extração em lote dos chunks {chunk_ids}: {e}")
+            extracted_by_id = None
+
+        if extracted_by_id is None:
+            logger.warning(f"Lote de chunks {chunk_ids} inválido; extraindo chunk a chunk")
+            return list(await asyncio.gather(*[
+                self._extract_single_chunk(chunk, semaphore) for chunk in batch
+            ]))
+
+        return [
+            self._build_extraction(chunk_id, extracted_by_id[chunk_id], self._is_heading(chunk['text']))
+            for chunk_id, chunk in zip(chunk_ids, batch)
+        ]
+
+    def _parse_batch_extraction(self, response: str, chunk_ids: List[int]) -> Optional[Dict[int, Dict]]:
+        """
+        Valida a resposta de uma extração em lote.
+
+        Args:
+            response: Resposta do LLM ({"chunks": [...]} ou array JSON)
+            chunk_ids: chunk_ids esperados
+
+        Returns:
+            Extração por chunk_id, ou None se o JSON for inválido ou não cobrir
+            exatamente os chunk_ids do lote
+        """
+        items = self._parse_json(response, f"lote {chunk_ids}")
+        if isinstance(items, dict):
+            items = items.get('chunks')
+        if not isinstance(items, list):
+            return None
+
+        extracted_by_id: Dict[int, Dict] = {}
+        for item in items:
+            if not isinstance(item, dict):
+                return None
             try:
-                from summarizer import SummarySpecs
+                chunk_id = int(item.get('chunk_id'))
+            except (TypeError, ValueError):
+                return None
+            if 'concepts' not in item:
+                return None  # Objeto truncado
+            if not all(isinstance(item.get(key, []), list) for key in ('concepts', 'ideas', 'examples')):
+                return None
+            extracted_by_id[chunk_id] = item
+
+        if sorted(extracted_by_id) != sorted(chunk_ids) or len(items) != len(chunk_ids):
+            return None
+        return extracted_by_id
+
+    def _extraction_format(self) -> Dict:
+        """Parâmetros de formato de saída das extrações (JSON mode, se habilitado)."""
+        return {'response_format': JSON_OBJECT_FORMAT} if self.json_mode else {}
+
+    def _parse_json(self, response: str, label: str) -> Optional[object]:
+        """
+        Extrai JSON da resposta de forma tolerante e registra o resultado do parse.
+
+        Args:
+            response: Resposta do LLM
+            label: Identificação para o log (ex.: "chunk 3")
+
+        Returns:
+            Objeto/array extraído ou None se não houver JSON aproveitável
+        """
+        value, outcome = extract_json(response)
+        get_parse_stats().record(outcome)
+        if self.metadata_collector is not None and hasattr(self.metadata_collector, 'record_json_parse'):
+            self.metadata_collector.record_json_parse(outcome)
+        if outcome == PARSE_FAILED:
+            logger.warning(f"Resposta de extração sem JSON válido ({label})")
+        return value
+
+    @staticmethod
+    def _chunk_id_number(chunk: Dict) -> int:
+        """Número do chunk a partir do chunk_id ('cap_1_chunk_3' → 3)."""
+        return int(chunk['chunk_id'].split('_')[-1])
+
+    @staticmethod
+    def _is_heading(chunk_text: str) -> bool:
+        """Indica se o chunk é estrutural (título ou poucas linhas)."""
+        return chunk_text.strip().startswith('#') or len(chunk_text.strip().split('\n')) < 3
+
+    @staticmethod
+    def _build_extraction(chunk_id: int, extracted: Dict, is_heading: bool) -> Dict:
+        """Monta a extração de um chunk no formato consumido por generate_recall_set."""
+        return {
+            'chunk_id': chunk_id,
+            'concepts': extracted.get('concepts', []),
+            'ideas': extracted.get('ideas', []),
+            'examples': extracted.get('examples', []),
+            'is_heading': is_heading
+        }
+
+    async def _extract_single_chunk(self, chunk: Dict, semaphore: asyncio.Semaphore) -> Dict:
+        """
+        Extrai informações de um único chunk (isolado dos demais).
+        
+        Args:
+            chunk: Chunk retornado por _chunk_chapter()
+            semaphore: Semáforo que limita extrações simultâneas do capítulo
+            
+        Returns:
+            Extração do chunk (vazia se a chamada ao LLM falhar)
+        """
+        chunk_id_num = self._chunk_id_number(chunk)
+        chunk_text = chunk['text']
+        is_heading = self._is_heading(chunk_text)
+        
+        # Prompt para extração (chunk inteiro, salvo se exceder o orçamento do modelo)
+        excerpt = self._fit_prompt_text(
+            chunk_text, EXTRACTION_MAX_OUTPUT_TOKENS,
+            EXTRACTION_SYSTEM_MESSAGE + EXTRACTION_PROMPT.format(text=""),
+            f"chunk {chunk['chunk_id']}"
+        )
+        prompt = EXTRACTION_PROMPT.format(text=excerpt)
+
+        try:
+            async with semaphore:
                 response = await self.client.complete(
-                    system_message="Você é um extrator de informações estruturadas. Retorne apenas JSON válido.",
+                    system_message=EXTRACTION_SYSTEM_MESSAGE,
                     user_message=prompt,
-                    max_output_tokens=500,
-                    temperature=0.2
+                    max_output_tokens=EXTRACTION_MAX_OUTPUT_TOKENS,
+                    temperature=0.2,
+                    **self._extraction_format()
                 )
-                
-                # Parse JSON (simplificado - em produção usar json.loads com tratamento de erro)
-                import json
-                try:
-                    extracted = json.loads(response)
-                except:
-                    # Fallback: extrair conceitos simples
-                    extracted = {
-                        'concepts': [w for w in chunk_text.split() if len(w) > 5 and w[0].isupper()][:5],
-                        'ideas': [],
-                        'examples': []
-                    }
-                
-                extractions.append({
-                    'chunk_id': chunk_id_num,
-                    'concepts': extracted.get('concepts', []),
-                    'ideas': extracted.get('ideas', []),
-                    'examples': extracted.get('examples', []),
-                    'is_heading': is_heading
-                })
-            except Exception as e:
-                logger.warning(f"Erro na extração do chunk {chunk_id_num}: {e}")
-                extractions.append({
-                    'chunk_id': chunk_id_num,
-                    'concepts': [],
+            
+            # Parse JSON tolerante (cercas, prosa ao redor, saída truncada)
+            extracted = self._parse_json(response, f"chunk {chunk_id_num}")
+            if not isinstance(extracted, dict):
+                # Fallback: extrair conceitos simples
+                extracted = {
+                    'concepts': [w for w in chunk_text.split() if len(w) > 5 and w[0].isupper()][:5],
                     'ideas': [],
-                    'examples': [],
-                    'is_heading': is_heading
-                })
-        
-        return extractions
+                    'examples': []
+                }
+            
+            return self._build_extraction(chunk_id_num, extracted, is_heading)
+        except Exception as e:
+            logger.warning(f"Erro na extração do chunk {chunk_id_num}: {e}")
+            return self._build_extraction(chunk_id_num, {}, is_heading)
 
     async def _generate_summary_with_markers(
         self,
         chapter: 'Chapter',
         recall_set: 'RecallSet',
-        full_text: str
+        full_text: str,
+        attempt_number: int = 1,
+        temperature: float = MARKERS_TEMPERATURE
     ) -> str:
         """
         Gera resumo incluindo marcadores [[RS:capX:hash|chunks:N,M]].
@@ -508,9 +940,13 @@ Formato JSON:
             chapter: Objeto Chapter
             recall_set: RecallSet do capítulo
             full_text: Texto completo do livro
+            attempt_number: Tentativa de geração; só a primeira usa o cache do LLM,
+                regenerações precisam de respostas novas
+            temperature: Temperatura da geração (candidatos especulativos variam)
             
         Returns:
-            Texto do resumo com marcadores
+            Tupla (texto do resumo com marcadores, abortado?). Um resumo
+            abortado no streaming é parcial: só serve para regenerar.
         """
         chapter_text = full_text[chapter.start_pos:chapter.end_pos]
         
@@ -524,10 +960,11 @@ Formato JSON:
         
         critical_items_text = '\n'.join(critical_items_list)
         
-        prompt = f"""Você está resumindo o Capítulo {chapter.number}: "{chapter.title}"
+        prompt_header = f"""Você está resumindo o Capítulo {chapter.number}: "{chapter.title}"
 
 Texto do capítulo ({chapter.word_count} palavras):
-{chapter_text[:5000]}
+"""
+        prompt_footer = f"""
 
 **CRÍTICO E OBRIGATÓRIO**: Você DEVE incluir TODOS os {len(recall_set.critical_items)} itens críticos abaixo no resumo, cada um COM seu marcador EXATO:
 
@@ -546,14 +983,109 @@ RESUMO:"""
 
         from summarizer import SummarySpecs
         
+        # Maior trecho do capítulo que cabe no orçamento do modelo
+        chapter_excerpt = self._fit_prompt_text(
+            chapter_text, MARKERS_MAX_OUTPUT_TOKENS,
+            SummarySpecs.BASE_SYSTEM_MESSAGE + prompt_header + prompt_footer,
+            f"capítulo {chapter.number}"
+        )
+        prompt = prompt_header + chapter_excerpt + prompt_footer
+        
+        if self.stream_summaries:
+            return await self._stream_summary_with_markers(
+                chapter, recall_set, SummarySpecs.BASE_SYSTEM_MESSAGE, prompt, attempt_number, temperature
+            )
+        
         response = await self.client.complete(
             system_message=SummarySpecs.BASE_SYSTEM_MESSAGE,
             user_message=prompt,
-            max_output_tokens=2000,  # Aumentar para dar mais espaço aos marcadores
-            temperature=0.3  # Reduzir temperatura para ser mais determinístico
+            max_output_tokens=MARKERS_MAX_OUTPUT_TOKENS,  # Aumentar para dar mais espaço aos marcadores
+            temperature=temperature,  # Padrão baixo (0.3) para ser mais determinístico
+            use_cache=attempt_number == 1,
+            cache_salt=f"attempt:{attempt_number}"
         )
         
-        return response.strip()
+        return response.strip(), False
+
+    async def _stream_summary_with_markers(
+        self,
+        chapter: 'Chapter',
+        recall_set: 'RecallSet',
+        system_message: str,
+        prompt: str,
+        attempt_number: int,
+        temperature: float
+    ) -> Tuple[str, bool]:
+        """
+        Gera o resumo em streaming, auditando marcadores à medida que chegam.
+        
+        O texto parcial é repassado ao stream_callback a cada
+        STREAM_PARTIAL_MIN_CHARS caracteres. Ao primeiro marcador inventado,
+        com chunks inválidos ou malformado, a geração é abortada (a auditoria
+        final reprovaria de qualquer forma) e o texto parcial é devolvido
+        marcado como abortado: _audit_and_regenerate nunca o repara nem o
+        completa com addendum, apenas regenera.
+        
+        Args:
+            chapter: Objeto Chapter
+            recall_set: RecallSet do capítulo
+            system_message: Mensagem de sistema
+            prompt: Prompt completo do resumo
+            attempt_number: Tentativa de geração (só a primeira usa o cache)
+            temperature: Temperatura da geração
+            
+        Returns:
+            Tupla (texto do resumo, abortado?); o texto é parcial se abortado
+        """
+        auditor = IncrementalRecallAuditor(self._auditor_recall_set(recall_set), chapter.number)
+        unsent: List[str] = []
+        unsent_chars = 0
+        aborted = False
+        
+        stream = self.client.stream_complete(
+            system_message=system_message,
+            user_message=prompt,
+            max_output_tokens=MARKERS_MAX_OUTPUT_TOKENS,
+            temperature=temperature,
+            use_cache=attempt_number == 1,
+            cache_salt=f"attempt:{attempt_number}"
+        )
+        async with aclosing(stream):
+            async for delta in stream:
+                auditor.feed(delta)
+                if self.stream_callback:
+                    unsent.append(delta)
+                    unsent_chars += len(delta)
+                    if unsent_chars >= STREAM_PARTIAL_MIN_CHARS:
+                        self.stream_callback(chapter.number, attempt_number, ''.join(unsent))
+                        unsent, unsent_chars = [], 0
+                if auditor.should_abort:
+                    message = (
+                        f"Geração do resumo do capítulo {chapter.number} (tentativa {attempt_number}) "
+                        f"abortada após {len(auditor.text)} caracteres: {auditor.errors}"
+                    )
+                    logger.warning(message)
+                    if self.metadata_collector:
+                        self.metadata_collector.log("WARNING", chapter.number, message)
+                    aborted = True
+                    break
+        
+        if self.stream_callback and unsent:
+            self.stream_callback(chapter.number, attempt_number, ''.join(unsent))
+        return auditor.text.strip(), aborted
+
+    @staticmethod
+    def _auditor_recall_set(recall_set: 'RecallSet') -> Dict:
+        """Itens críticos do Recall Set no formato do RecallAuditor."""
+        return {
+            'critical_items': [
+                {
+                    'item_id': item.item_id,
+                    'source_chunks': item.source_chunks
+                }
+                for item in recall_set.critical_items
+            ]
+        }
 
     def _build_addendum_items_list(
         self,
@@ -680,7 +1212,8 @@ BULLETS:"""
             system_message=system_message,
             user_message=prompt,
             max_output_tokens=500,
-            temperature=0.1 if attempt_number == 1 else 0.0  # Mais determinístico no fallback
+            temperature=0.1 if attempt_number == 1 else 0.0,  # Mais determinístico no fallback
+            use_cache=False  # Addendum só ocorre após falha: sempre pedir resposta nova
         )
         
         addendum_text = response.strip()
@@ -740,8 +1273,14 @@ BULLETS:"""
         Loop de regeneração com auditoria + addendum incremental.
         
         Estratégia A (Gate Z8):
-        1. Tenta gerar resumo completo (até max_attempts)
+        1. Tenta gerar resumo completo (até max_attempts); com
+           speculative_candidates > 1, as tentativas saem em rodadas paralelas
+           (ver _speculative_summaries). Com repair_policy, um resumo reprovado
+           com poucos itens faltando é reparado (inserção de frases/addendum)
+           em vez de regenerado (ver _repair_summary). Tentativas abortadas no
+           streaming (texto parcial) nunca são reparadas: sempre regeneram
         2. Se ainda faltam marcadores, gera addendum apenas para faltantes
+           (sobre a última tentativa completa)
         3. Anexa addendum e re-audita
         4. Repete addendum até max_addendums se necessário
         
@@ -762,15 +1301,7 @@ BULLETS:"""
         from src.exceptions import CoverageError
         
         auditor = RecallAuditor()
-        recall_set_dict = {
-            'critical_items': [
-                {
-                    'item_id': item.item_id,
-                    'source_chunks': item.source_chunks
-                }
-                for item in recall_set.critical_items
-            ]
-        }
+        recall_set_dict = self._auditor_recall_set(recall_set)
         
         regeneration_count = 0
         addendum_count = 0
@@ -778,18 +1309,51 @@ BULLETS:"""
         audit_result = None
         
         # Fase 1: Tentar gerar resumo completo
-        for attempt in range(1, max_attempts + 1):
-            logger.info(f"Tentativa {attempt}/{max_attempts} de gerar resumo para capítulo {chapter.number}")
-            
-            summary_text = await self._generate_summary_with_markers(chapter, recall_set, full_text)
-            audit_result = auditor.audit_summary(summary_text, recall_set_dict, chapter.number)
-            
+        if self.speculative_candidates > 1:
+            summary_text, audit_result, regeneration_count = await self._speculative_summaries(
+                chapter, recall_set, full_text, max_attempts, auditor, recall_set_dict
+            )
             if audit_result.passed:
-                logger.info(f"✓ Resumo do capítulo {chapter.number} aprovado na tentativa {attempt}")
                 return (summary_text, regeneration_count, addendum_count)
+            if self.repair_policy is not None:
+                summary_text, audit_result, _ = await self._repair_summary(
+                    chapter, recall_set, summary_text, audit_result, auditor, recall_set_dict, regeneration_count
+                )
+                if audit_result.passed:
+                    return (summary_text, regeneration_count, addendum_count)
+        else:
+            for attempt in range(1, max_attempts + 1):
+                logger.info(f"Tentativa {attempt}/{max_attempts} de gerar resumo para capítulo {chapter.number}")
+            
+                candidate, aborted = await self._generate_summary_with_markers(
+                    chapter, recall_set, full_text, attempt_number=attempt
+                )
+                if aborted:
+                    # Texto parcial: reparo/addendum fariam passar um resumo pela metade
+                    logger.warning(
+                        f"✗ Resumo do capítulo {chapter.number} abortado na tentativa {attempt}: regenerando"
+                    )
+                    regeneration_count = attempt
+                    continue
+                summary_text = candidate
+                audit_result = auditor.audit_summary(summary_text, recall_set_dict, chapter.number)
+            
+                if audit_result.passed:
+                    logger.info(f"✓ Resumo do capítulo {chapter.number} aprovado na tentativa {attempt}")
+                    return (summary_text, regeneration_count, addendum_count)
             
-            logger.warning(f"✗ Resumo do capítulo {chapter.number} falhou na tentativa {attempt}: {len(audit_result.missing_markers)} marcadores faltando")
-            regeneration_count = attempt
+                logger.warning(f"✗ Resumo do capítulo {chapter.number} falhou na tentativa {attempt}: {len(audit_result.missing_markers)} marcadores faltando")
+                regeneration_count = attempt
+            
+                if self.repair_policy is not None:
+                    summary_text, audit_result, action = await self._repair_summary(
+                        chapter, recall_set, summary_text, audit_result, auditor, recall_set_dict, attempt
+                    )
+                    if audit_result.passed:
+                        return (summary_text, regeneration_count, addendum_count)
+                    if action != REPAIR_REGENERATE:
+                        # Poucos itens faltando: addendum (Fase 2) sai mais barato que regenerar
+                        break
         
         # Fase 2: Se ainda faltam marcadores, gerar addendum incremental
         if audit_result and audit_result.missing_markers:
@@ -912,6 +1476,217 @@ BULLETS:"""
                 f"Capítulo {chapter.number}: Cobertura não atingiu 100% após {max_attempts} tentativas."
             )
 
+    async def _repair_summary(
+        self,
+        chapter: 'Chapter',
+        recall_set: 'RecallSet',
+        summary_text: str,
+        audit_result,
+        auditor,
+        recall_set_dict: Dict,
+        attempt_number: int
+    ) -> Tuple[str, object, str]:
+        """
+        Aplica o reparo escolhido pela repair_policy a um resumo reprovado.
+        
+        Só a inserção de frases é aplicada aqui; addendum e regeneração ficam
+        com o loop de _audit_and_regenerate. A decisão é registrada no
+        metadata_collector.
+        
+        Args:
+            chapter: Objeto Chapter
+            recall_set: RecallSet do capítulo
+            summary_text: Resumo reprovado
+            audit_result: AuditResult do resumo
+            auditor: RecallAuditor
+            recall_set_dict: Itens críticos no formato do auditor
+            attempt_number: Tentativa de resumo que gerou summary_text
+            
+        Returns:
+            Tupla (summary_text, audit_result, ação). O resumo reparado só
+            substitui o original se passar ou tiver menos itens faltando.
+        """
+        decision = self.repair_policy.decide(audit_result, len(recall_set.critical_items))
+        missing_markers = list(audit_result.missing_markers)
+        logger.info(f"Reparo do capítulo {chapter.number} (tentativa {attempt_number}): {decision.action} - {decision.reason}")
+        
+        result = "applied"
+        if decision.action == REPAIR_INSERT:
+            missing_items = [
+                item for item in recall_set.critical_items
+                if item.item_id in audit_result.missing_markers
+            ]
+            repaired = await self._insert_missing_sentences(chapter, summary_text, missing_items, attempt_number)
+            repaired_audit = auditor.audit_summary(repaired, recall_set_dict, chapter.number)
+            result = "passed" if repaired_audit.passed else "failed"
+            improved = (
+                not repaired_audit.invented_markers and not repaired_audit.invalid_chunks
+                and len(repaired_audit.missing_markers) < len(audit_result.missing_markers)
+            )
+            if repaired_audit.passed or improved:
+                summary_text, audit_result = repaired, repaired_audit
+            if repaired_audit.passed:
+                logger.info(f"✓ Inserção de frases fechou cobertura 100% para capítulo {chapter.number}")
+        
+        if self.metadata_collector:
+            self.metadata_collector.log_repair_decision(
+                chapter_number=chapter.number,
+                attempt_number=attempt_number,
+                action=decision.action,
+                reason=decision.reason,
+                missing_markers=missing_markers,
+                result=result
+            )
+        return (summary_text, audit_result, decision.action)
+
+    async def _insert_missing_sentences(
+        self,
+        chapter: 'Chapter',
+        summary_text: str,
+        missing_items: List['RecallSetItem'],
+        attempt_number: int = 1
+    ) -> str:
+        """
+        Reparo por inserção: gera uma frase por item faltante e a insere no resumo.
+        
+        O prompt leva só o resumo atual e os itens faltantes (sem o texto do
+        capítulo), e a saída é limitada a INSERTION_MAX_OUTPUT_TOKENS_PER_ITEM
+        por item, em vez dos MARKERS_MAX_OUTPUT_TOKENS de uma regeneração.
+        
+        Args:
+            chapter: Objeto Chapter
+            summary_text: Resumo reprovado
+            missing_items: Itens críticos sem marcador no resumo
+            attempt_number: Tentativa de resumo (para o cache do LLM)
+            
+        Returns:
+            Resumo com as frases inseridas em um parágrafo ao fim do corpo
+            (antes de PONTOS-CHAVE/CITAÇÕES/EXEMPLOS, se houver)
+        """
+        if not missing_items:
+            return summary_text
+        
+        prompt = INSERTION_PROMPT.format(
+            chapter_number=chapter.number,
+            count=len(missing_items),
+            summary=summary_text,
+            items=self._build_addendum_items_list(chapter, missing_items)
+        )
+        response = await self.client.complete(
+            system_message=INSERTION_SYSTEM_MESSAGE,
+            user_message=prompt,
+            max_output_tokens=INSERTION_MAX_OUTPUT_TOKENS_PER_ITEM * len(missing_items),
+            temperature=0.1,
+            use_cache=False,  # Reparo só ocorre após falha: sempre pedir resposta nova
+            cache_salt=f"insert:{attempt_number}"
+        )
+        
+        # Só linhas com marcador entram no resumo
+        sentences = [
+            line.strip().lstrip('-•* ').strip()
+            for line in response.splitlines()
+            if '[[RS:' in line
+        ]
+        if not sentences:
+            return summary_text
+        paragraph = ' '.join(sentences)
+        section = SUMMARY_SECTION_PATTERN.search(summary_text)
+        if section is None:
+            return f"{summary_text.rstrip()}\n\n{paragraph}"
+        body, rest = summary_text[:section.start()], summary_text[section.start():]
+        return f"{body.rstrip()}\n\n{paragraph}\n\n{rest}"
+
+    async def _speculative_summaries(
+        self,
+        chapter: 'Chapter',
+        recall_set: 'RecallSet',
+        full_text: str,
+        max_attempts: int,
+        auditor,
+        recall_set_dict: Dict
+    ) -> Tuple[str, object, int]:
+        """
+        Gera candidatos de resumo em paralelo e fica com o primeiro aprovado.
+
+        Cada rodada dispara até speculative_candidates tentativas simultâneas
+        (temperaturas de SPECULATIVE_TEMPERATURES) e audita cada candidato
+        assim que chega (auditoria por regex, barata). O primeiro aprovado é
+        mantido e os demais são cancelados (e aguardados). Sem aprovação, segue para a
+        próxima rodada até max_attempts tentativas no total.
+
+        Args:
+            chapter: Objeto Chapter
+            recall_set: RecallSet do capítulo
+            full_text: Texto completo do livro
+            max_attempts: Total de tentativas permitidas (somando as rodadas)
+            auditor: RecallAuditor
+            recall_set_dict: Itens críticos no formato do auditor
+
+        Returns:
+            Tupla (summary_text, audit_result, regeneration_count). Sem aprovação,
+            devolve o candidato completo com menos marcadores faltando (base do
+            addendum); candidatos abortados no streaming nunca são devolvidos.
+        """
+        best_summary, best_audit = "", None
+        regeneration_count = 0
+        attempt = 0
+
+        while attempt < max_attempts:
+            round_size = min(self.speculative_candidates, max_attempts - attempt)
+            tasks = [
+                asyncio.create_task(self._generate_summary_with_markers(
+                    chapter, recall_set, full_text,
+                    attempt_number=number,
+                    temperature=SPECULATIVE_TEMPERATURES[(number - 1) % len(SPECULATIVE_TEMPERATURES)]
+                ))
+                for number in range(attempt + 1, attempt + round_size + 1)
+            ]
+            attempt += round_size
+            logger.info(
+                f"Rodada especulativa com {round_size} candidatos para capítulo {chapter.number} "
+                f"(tentativas até {attempt}/{max_attempts})"
+            )
+
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    try:
+                        candidate, aborted = await next_done
+                    except Exception as e:
+                        logger.warning(f"✗ Candidato do capítulo {chapter.number} falhou: {e}")
+                        regeneration_count += 1
+                        continue
+                    if aborted:
+                        # Texto parcial: nunca vira base de reparo/addendum
+                        logger.warning(f"✗ Candidato do capítulo {chapter.number} abortado no streaming")
+                        regeneration_count += 1
+                        continue
+
+                    audit_result = auditor.audit_summary(candidate, recall_set_dict, chapter.number)
+                    if audit_result.passed:
+                        logger.info(f"✓ Candidato especulativo aprovado para capítulo {chapter.number}")
+                        return (candidate, audit_result, regeneration_count)
+
+                    regeneration_count += 1
+                    if best_audit is None or len(audit_result.missing_markers) < len(best_audit.missing_markers):
+                        best_summary, best_audit = candidate, audit_result
+            finally:
+                for task in tasks:
+                    task.cancel()
+                # Aguarda os cancelados: nenhuma chamada ao LLM sobrevive à rodada
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+            logger.warning(
+                f"✗ Nenhum candidato aprovado para capítulo {chapter.number} "
+                f"({regeneration_count}/{max_attempts} tentativas)"
+            )
+
+        if best_audit is None:
+            from src.exceptions import CoverageError
+            raise CoverageError(
+                f"Capítulo {chapter.number}: todas as {max_attempts} gerações de resumo falharam."
+            )
+        return (best_summary, best_audit, regeneration_count)
+
     async def summarize_chapter_robust(
         self,
         chapter: 'Chapter',
@@ -29,11 +29,44 @@ from exceptions import CoverageError
 
 # Tentar usar document_reader primeiro, fallback para pdf_reader
 try:
-    from document_reader import read_pdf_to_markdown
+    from document_reader import read_pdf_to_markdown, get_converter_signature
     READ_PDF_FUNC = read_pdf_to_markdown
 except ImportError:
     from pdf_reader import read_pdf_file
     READ_PDF_FUNC = read_pdf_file
+    get_converter_signature = None
+
+from storage import get_conversion_cache
+
+
+def read_pdf_cached(pdf_path: Path) -> str:
+    """
+    Lê o PDF reutilizando a conversão em cache quando o mesmo arquivo já foi convertido.
+
+    Args:
+        pdf_path: Caminho do PDF
+
+    Returns:
+        Texto convertido
+    """
+    cache = get_conversion_cache()
+    if cache is None:
+        return READ_PDF_FUNC(str(pdf_path))
+
+    # document_reader disponível → Markdown; senão, texto puro do pdf_reader legado
+    prefer_markdown = get_converter_signature is not None
+    # Assinatura do conversor que READ_PDF_FUNC realmente usa (serial, sem fallback silencioso)
+    converter = (
+        get_converter_signature(prefer_markdown=True, parallel_workers=0) if prefer_markdown else "pdf_reader"
+    )
+    file_hash = cache.hash_file(str(pdf_path))
+    text = cache.get(file_hash, converter, prefer_markdown)
+    if text is None:
+        text = READ_PDF_FUNC(str(pdf_path))
+        cache.put(file_hash, converter, prefer_markdown, text)
+    else:
+        print("♻️ Conversão reutilizada do cache", file=sys.stderr)
+    return text
 
 
 def validate_z8(evidencias_dir: str = "/app/EVIDENCIAS") -> Tuple[bool, List[str]]:
@@ -127,7 +160,7 @@ Exemplo:
     # Ler PDF
     print(f"📖 Lendo PDF: {args.file}", file=sys.stderr)
     try:
-        text = READ_PDF_FUNC(str(pdf_path))
+        text = read_pdf_cached(pdf_path)
         print(f"✅ PDF lido: {len(text)} caracteres, {len(text.split())} palavras", file=sys.stderr)
     except Exception as e:
         print(f"❌ Erro ao ler PDF: {e}", file=sys.stderr)
@@ -0,0 +1,157 @@
+"""
+Serviço de conversão de documentos fora do event loop.
+
+A conversão PDF→Markdown (pymupdf4llm) é CPU-bound e pode levar dezenas de
+segundos em um livro grande. Chamada diretamente do código assíncrono, ela
+bloqueia todas as outras requisições, inclusive os keepalives SSE. Este
+serviço executa a conversão em um ProcessPoolExecutor com número de workers,
+timeout por job e cancelamento.
+
+Enquanto não for iniciado (CLI, testes), a conversão roda em uma thread via
+asyncio.to_thread, sem bloquear o loop.
+"""
+import asyncio
+import functools
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Optional
+
+from src.exceptions import ConversionTimeoutError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONVERSION_WORKERS = int(os.getenv("CONVERSION_WORKERS", "2"))
+DEFAULT_CONVERSION_TIMEOUT = float(os.getenv("CONVERSION_TIMEOUT_SECONDS", "600"))
+
+
+def _default_reader(file_path: str, prefer_markdown: bool = True) -> str:
+    """Leitor padrão (import tardio para não carregar libs de PDF no import)."""
+    from src.document_reader import read_file
+    return read_file(file_path, prefer_markdown=prefer_markdown)
+
+
+class ConversionService:
+    """
+    Executa conversões de documentos em um pool de processos.
+
+    - Timeout por job: o job é abandonado e o pool é reciclado (o processo
+      travado é encerrado); jobs que estavam no mesmo pool são reenviados uma vez
+    - Cancelamento: se a requisição for cancelada, o job pendente é removido
+      da fila; um job já em execução faz o pool ser reciclado
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_CONVERSION_WORKERS,
+        timeout: float = DEFAULT_CONVERSION_TIMEOUT
+    ):
+        """
+        Inicializa o serviço (parado).
+
+        Args:
+            max_workers: Número de processos de conversão
+            timeout: Tempo máximo por conversão em segundos
+        """
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def is_running(self) -> bool:
+        """Indica se o pool de processos está ativo."""
+        return self._executor is not None
+
+    def start(self) -> None:
+        """Cria o pool de processos (idempotente)."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            logger.info(f"Serviço de conversão iniciado com {self.max_workers} workers")
+
+    def shutdown(self) -> None:
+        """Encerra o pool, cancelando jobs pendentes."""
+        executor = self._executor
+        self._executor = None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+            logger.info("Serviço de conversão encerrado")
+
+    def _recycle(self) -> None:
+        """Encerra o pool atual (matando processos em execução) e cria outro."""
+        executor = self._executor
+        self._executor = None
+        if executor is not None:
+            # ProcessPoolExecutor não expõe como interromper um job em execução
+            for process in list(getattr(executor, "_processes", {}).values()):
+                process.terminate()
+            executor.shutdown(wait=False, cancel_futures=True)
+        self.start()
+
+    async def convert(
+        self,
+        file_path: str,
+        prefer_markdown: bool = True,
+        reader: Optional[Callable[..., str]] = None,
+        timeout: Optional[float] = None
+    ) -> str:
+        """
+        Converte um documento sem bloquear o event loop.
+
+        Args:
+            file_path: Caminho do documento
+            prefer_markdown: Se True, converte PDF para Markdown
+            reader: Função de leitura (padrão: document_reader.read_file);
+                precisa ser importável no nível de módulo quando o pool está ativo
+            timeout: Timeout em segundos (padrão: o do serviço)
+
+        Returns:
+            Saída do reader (texto extraído do documento, no leitor padrão)
+
+        Raises:
+            ConversionTimeoutError: Se a conversão exceder o timeout
+        """
+        job = functools.partial(reader or _default_reader, file_path, prefer_markdown=prefer_markdown)
+        timeout = timeout or self.timeout
+
+        if not self.is_running:
+            return await self._await_with_timeout(asyncio.to_thread(job), file_path, timeout)
+
+        try:
+            return await self._run_in_pool(job, file_path, timeout)
+        except BrokenProcessPool:
+            # Pool reciclado por timeout de outro job: reenviar uma vez
+            logger.warning(f"Pool de conversão reciclado; reenviando {file_path}")
+            return await self._run_in_pool(job, file_path, timeout)
+
+    async def _run_in_pool(self, job: Callable[[], str], file_path: str, timeout: float) -> str:
+        """Submete o job ao pool; recicla o pool se o job for abandonado em execução."""
+        future = self._executor.submit(job)
+        try:
+            return await self._await_with_timeout(asyncio.wrap_future(future), file_path, timeout)
+        except (ConversionTimeoutError, asyncio.CancelledError):
+            if not future.cancel():
+                self._recycle()
+            raise
+
+    @staticmethod
+    async def _await_with_timeout(awaitable, file_path: str, timeout: float) -> str:
+        """Aguarda a conversão convertendo asyncio.TimeoutError em ConversionTimeoutError."""
+        try:
+            return await asyncio.wait_for(awaitable, timeout)
+        except asyncio.TimeoutError as e:
+            raise ConversionTimeoutError(
+                f"Conversão de {file_path} excedeu {timeout:.0f}s"
+            ) from e
+
+
+# Instância global do serviço
+_conversion_service: Optional[ConversionService] = None
+
+
+def get_conversion_service() -> ConversionService:
+    """Retorna a instância global do serviço de conversão."""
+    global _conversion_service
+    if _conversion_service is None:
+        _conversion_service = ConversionService()
+    return _conversion_service
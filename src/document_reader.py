@@ -4,12 +4,21 @@ CoverageSummarizer - Document Reader (Universal)
 Supports PDF, TXT, and Markdown files with PDF→Markdown conversion
 """
 
+import os
 import sys
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Callable, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Page-parallel conversion: 0/1 = serial (default)
+DEFAULT_PARALLEL_WORKERS = int(os.getenv("PDF_PARALLEL_WORKERS", "0"))
+MIN_PAGES_PER_SHARD = 8
+
+PageRange = Tuple[int, int]  # 0-based, [start, end)
+
 # Try to import PDF libraries
 try:
     import pymupdf4llm
@@ -30,7 +39,11 @@ except ImportError:
     PYPDF2_AVAILABLE = False
 
 
-def read_pdf_to_markdown(file_path: str) -> str:
+def read_pdf_to_markdown(
+    file_path: str,
+    parallel_workers: int = 0,
+    page_range: Optional[PageRange] = None
+) -> str:
     """
     Convert PDF to Markdown using PyMuPDF4LLM.
 
@@ -42,6 +55,8 @@ def read_pdf_to_markdown(file_path: str) -> str:
 
     Args:
         file_path: Path to PDF file
+        parallel_workers: If > 1, convert page ranges in parallel processes
+        page_range: Convert only these pages (0-based, [start, end))
 
     Returns:
         Markdown-formatted text
@@ -57,14 +72,19 @@ def read_pdf_to_markdown(file_path: str) -> str:
 
     try:
         logger.info(f"Converting PDF to Markdown: {file_path}")
-        md_text = pymupdf4llm.to_markdown(file_path)
+        if parallel_workers > 1 and page_range is None:
+            md_text = _read_pdf_sharded(file_path, read_pdf_to_markdown, parallel_workers, separator="")
+        elif page_range is not None:
+            md_text = pymupdf4llm.to_markdown(file_path, pages=list(range(*page_range)))
+        else:
+            md_text = pymupdf4llm.to_markdown(file_path)
         logger.info(f"✅ PDF→MD conversion successful: {len(md_text)} chars")
         return md_text
     except Exception as e:
         raise Exception(f"Error converting PDF to Markdown: {e}")
 
 
-def read_pdf_plain_text(file_path: str) -> str:
+def read_pdf_plain_text(file_path: str, parallel_workers: int = 0) -> str:
     """
     Read PDF as plain text (fallback method).
 
@@ -73,6 +93,7 @@ def read_pdf_plain_text(file_path: str) -> str:
 
     Args:
         file_path: Path to PDF file
+        parallel_workers: If > 1, read page ranges in parallel processes
 
     Returns:
         Plain text extracted from PDF
@@ -80,14 +101,14 @@ def read_pdf_plain_text(file_path: str) -> str:
     # Try pdfplumber first
     if PDFPLUMBER_AVAILABLE:
         try:
-            return _read_pdf_pdfplumber(file_path)
+            return _read_pdf_pages(file_path, _read_pdf_pdfplumber, parallel_workers)
         except Exception as e:
             logger.warning(f"pdfplumber failed, trying PyPDF2... ({e})")
 
     # Fallback to PyPDF2
     if PYPDF2_AVAILABLE:
         try:
-            return _read_pdf_pypdf2(file_path)
+            return _read_pdf_pages(file_path, _read_pdf_pypdf2, parallel_workers)
         except Exception as e:
             raise Exception(f"Error reading PDF: {e}")
 
@@ -97,13 +118,25 @@ def read_pdf_plain_text(file_path: str) -> str:
     )
 
 
-def _read_pdf_pdfplumber(file_path: str) -> str:
+def _read_pdf_pages(
+    file_path: str,
+    page_reader: Callable[..., str],
+    parallel_workers: int
+) -> str:
+    """Run a page reader serially or sharded by page range (internal helper)."""
+    if parallel_workers > 1:
+        return _read_pdf_sharded(file_path, page_reader, parallel_workers, separator="\n")
+    return page_reader(file_path)
+
+
+def _read_pdf_pdfplumber(file_path: str, page_range: Optional[PageRange] = None) -> str:
     """Read PDF using pdfplumber (internal helper)."""
     text_parts = []
 
     try:
         with pdfplumber.open(file_path) as pdf:
-            for page_num, page in enumerate(pdf.pages, 1):
+            start, end = page_range or (0, len(pdf.pages))
+            for page_num, page in enumerate(pdf.pages[start:end], start + 1):
                 text = page.extract_text()
                 if text:
                     text_parts.append(f"--- Página {page_num} ---\n{text}\n")
@@ -113,14 +146,16 @@ def _read_pdf_pdfplumber(file_path: str) -> str:
     return "\n".join(text_parts)
 
 
-def _read_pdf_pypdf2(file_path: str) -> str:
+def _read_pdf_pypdf2(file_path: str, page_range: Optional[PageRange] = None) -> str:
     """Read PDF using PyPDF2 (internal helper)."""
     text_parts = []
 
     try:
         with open(file_path, 'rb') as file:
             pdf_reader = PyPDF2.PdfReader(file)
-            for page_num, page in enumerate(pdf_reader.pages, 1):
+            start, end = page_range or (0, len(pdf_reader.pages))
+            for page_num in range(start + 1, end + 1):
+                page = pdf_reader.pages[page_num - 1]
                 text = page.extract_text()
                 if text:
                     text_parts.append(f"--- Página {page_num} ---\n{text}\n")
@@ -130,7 +165,109 @@ def _read_pdf_pypdf2(file_path: str) -> str:
     return "\n".join(text_parts)
 
 
-def read_file(file_path: str, prefer_markdown: bool = True) -> str:
+def _get_pdf_page_count(file_path: str) -> int:
+    """Count PDF pages with the first available library (internal helper)."""
+    if PYMUPDF4LLM_AVAILABLE:
+        import pymupdf
+        with pymupdf.open(file_path) as doc:
+            return doc.page_count
+    if PDFPLUMBER_AVAILABLE:
+        with pdfplumber.open(file_path) as pdf:
+            return len(pdf.pages)
+    with open(file_path, 'rb') as file:
+        return len(PyPDF2.PdfReader(file).pages)
+
+
+def split_page_ranges(page_count: int, shards: int) -> List[PageRange]:
+    """
+    Split pages into contiguous, balanced ranges.
+
+    Args:
+        page_count: Total number of pages
+        shards: Desired number of ranges
+
+    Returns:
+        List of (start, end) ranges, 0-based and end-exclusive, in page order
+    """
+    shards = max(1, min(shards, page_count))
+    base, extra = divmod(page_count, shards)
+    ranges = []
+    start = 0
+    for shard in range(shards):
+        end = start + base + (1 if shard < extra else 0)
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
+def _read_page_range(page_reader: Callable[..., str], file_path: str, page_range: PageRange) -> str:
+    """Worker entry point: read one page range (module-level so it can be pickled)."""
+    return page_reader(file_path, page_range=page_range)
+
+
+def _read_pdf_sharded(
+    file_path: str,
+    page_reader: Callable[..., str],
+    parallel_workers: int,
+    separator: str
+) -> str:
+    """
+    Read a PDF by page ranges in parallel processes and stitch results in order.
+
+    Page markers (`--- Página N ---`) keep absolute page numbers because each
+    range reader numbers pages from its range start. Small documents (fewer
+    than MIN_PAGES_PER_SHARD pages per worker) fall back to the serial path.
+    """
+    page_count = _get_pdf_page_count(file_path)
+    shards = min(parallel_workers, page_count // MIN_PAGES_PER_SHARD)
+    if shards < 2:
+        return page_reader(file_path)
+
+    ranges = split_page_ranges(page_count, shards)
+    logger.info(f"Reading {page_count} pages in {len(ranges)} parallel ranges: {file_path}")
+    with ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+        parts = list(executor.map(
+            _read_page_range,
+            [page_reader] * len(ranges),
+            [file_path] * len(ranges),
+            ranges
+        ))
+    return separator.join(part for part in parts if part)
+
+
+def get_converter_signature(
+    prefer_markdown: bool = True,
+    parallel_workers: int = DEFAULT_PARALLEL_WORKERS
+) -> str:
+    """
+    Name and version of the converter read_file would use for a PDF.
+
+    Used as part of conversion cache keys, so upgrading a PDF library
+    invalidates previously cached conversions.
+
+    Args:
+        prefer_markdown: Same flag passed to read_file
+        parallel_workers: Same value passed to read_file (sharded Markdown
+                          detects headings per page range)
+
+    Returns:
+        Converter signature, e.g. "pymupdf4llm-0.0.17"
+    """
+    if prefer_markdown and PYMUPDF4LLM_AVAILABLE:
+        signature = f"pymupdf4llm-{getattr(pymupdf4llm, '__version__', 'unknown')}"
+        return f"{signature}-sharded" if parallel_workers > 1 else signature
+    if PDFPLUMBER_AVAILABLE:
+        return f"pdfplumber-{getattr(pdfplumber, '__version__', 'unknown')}"
+    if PYPDF2_AVAILABLE:
+        return f"PyPDF2-{getattr(PyPDF2, '__version__', 'unknown')}"
+    return "unavailable"
+
+
+def read_file(
+    file_path: str,
+    prefer_markdown: bool = True,
+    parallel_workers: int = DEFAULT_PARALLEL_WORKERS
+) -> str:
     """
     Universal file reader: PDF, TXT, MD.
 
@@ -138,10 +275,40 @@ def read_file(file_path: str, prefer_markdown: bool = True) -> str:
         file_path: Path to file
         prefer_markdown: If True, convert PDF to Markdown (RECOMMENDED).
                          If False, extract plain text.
+        parallel_workers: If > 1, convert PDF page ranges in parallel
+                          processes (default: PDF_PARALLEL_WORKERS, serial)
 
     Returns:
         File content (Markdown for PDF, plain text for TXT/MD)
 
+    Raises:
+        FileNotFoundError: If file doesn't exist
+        ValueError: If file format not supported
+    """
+    text, _ = read_file_with_converter(file_path, prefer_markdown, parallel_workers)
+    return text
+
+
+def read_file_with_converter(
+    file_path: str,
+    prefer_markdown: bool = True,
+    parallel_workers: int = DEFAULT_PARALLEL_WORKERS
+) -> Tuple[str, str]:
+    """
+    Same as read_file, also reporting which converter produced the text.
+
+    When PDF→Markdown fails, read_file silently falls back to plain text
+    extraction; callers that cache conversions by converter signature must
+    key (or skip) the entry by the converter that actually ran.
+
+    Args:
+        file_path: Path to file
+        prefer_markdown: Same as read_file
+        parallel_workers: Same as read_file
+
+    Returns:
+        Tuple (content, converter signature; "text" for TXT/MD files)
+
     Raises:
         FileNotFoundError: If file doesn't exist
         ValueError: If file format not supported
@@ -155,19 +322,23 @@ def read_file(file_path: str, prefer_markdown: bool = True) -> str:
 
     # PDF: Convert to Markdown (preferred) or plain text
     if ext == '.pdf':
+        plain_converter = get_converter_signature(False, parallel_workers)
         if prefer_markdown and PYMUPDF4LLM_AVAILABLE:
             try:
-                return read_pdf_to_markdown(str(path))
+                return (
+                    read_pdf_to_markdown(str(path), parallel_workers=parallel_workers),
+                    get_converter_signature(True, parallel_workers)
+                )
             except Exception as e:
                 logger.warning(f"PDF→MD failed, using plain text extraction: {e}")
-                return read_pdf_plain_text(str(path))
+                return read_pdf_plain_text(str(path), parallel_workers=parallel_workers), plain_converter
         else:
-            return read_pdf_plain_text(str(path))
+            return read_pdf_plain_text(str(path), parallel_workers=parallel_workers), plain_converter
 
     # TXT or MD: Read directly
     elif ext in ['.txt', '.md', '.markdown']:
         try:
-            return path.read_text(encoding='utf-8')
+            return path.read_text(encoding='utf-8'), "text"
         except Exception as e:
             raise Exception(f"Error reading text file: {e}")
 
@@ -0,0 +1,257 @@
+"""
+Alinhamento aproximado (MinHash/LSH) entre sentenças de resumos e o texto-fonte.
+
+O mapa de referências do TextTracker só encontrava uma sentença do resumo
+quando ela aparecia literalmente no livro, o que quase nunca acontece com
+paráfrases do LLM. O MinHashAligner indexa janelas de palavras de cada
+segmento do TextTracker com assinaturas MinHash em uma tabela LSH (bandas de
+linhas da assinatura): cada sentença só é comparada com as janelas que
+colidem com ela em alguma banda, e os segmentos candidatos são ordenados pela
+similaridade de Jaccard estimada (fração de posições iguais na assinatura).
+"""
+import logging
+import os
+import random
+import re
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Referências aproximadas quando a sentença não aparece literalmente no texto
+REFERENCE_FUZZY_ALIGNMENT = os.getenv("REFERENCE_FUZZY_ALIGNMENT", "true").lower() == "true"
+
+# Tempo máximo (ms) de alinhamento por mapa de referências; sentenças além dele ficam sem match
+REFERENCE_ALIGNMENT_BUDGET_MS = int(os.getenv("REFERENCE_ALIGNMENT_BUDGET_MS", "250"))
+
+DEFAULT_NUM_PERM = 64
+DEFAULT_BAND_ROWS = 2            # 32 bandas de 2 linhas: candidatos a partir de Jaccard ~0.15
+DEFAULT_WINDOW_WORDS = 50        # Janela comparável ao tamanho de uma sentença parafraseada
+DEFAULT_MIN_SIMILARITY = 0.1
+MIN_TOKEN_LENGTH = 4             # Ignora artigos, preposições e conectivos curtos
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_TOKEN_PATTERN = re.compile(r'\w+')
+
+
+@dataclass
+class AlignmentMatch:
+    """Segmento do TextTracker alinhado a uma sentença."""
+    segment_id: int
+    similarity: float
+
+
+def content_tokens(text: str) -> List[str]:
+    """
+    Palavras de conteúdo de um texto (minúsculas, sem pontuação).
+
+    Args:
+        text: Texto a tokenizar
+
+    Returns:
+        Tokens com pelo menos MIN_TOKEN_LENGTH caracteres
+    """
+    return [token for token in _TOKEN_PATTERN.findall(text.lower()) if len(token) >= MIN_TOKEN_LENGTH]
+
+
+class MinHashAligner:
+    """
+    Índice MinHash/LSH sobre os segmentos de um TextTracker.
+    """
+
+    def __init__(
+        self,
+        tracker,
+        num_perm: int = DEFAULT_NUM_PERM,
+        band_rows: int = DEFAULT_BAND_ROWS,
+        window_words: int = DEFAULT_WINDOW_WORDS,
+        seed: int = 1,
+        build: bool = True
+    ):
+        """
+        Prepara o índice das janelas de palavras de todos os segmentos.
+
+        Args:
+            tracker: TextTracker cujos segmentos serão indexados
+            num_perm: Tamanho da assinatura MinHash
+            band_rows: Linhas por banda LSH (num_perm deve ser múltiplo)
+            window_words: Palavras por janela (janelas se sobrepõem pela metade)
+            seed: Semente das permutações (assinaturas determinísticas)
+            build: Se True, indexa tudo já; se False, o índice é construído
+                por build_index (em etapas, com prazo)
+        """
+        if num_perm % band_rows:
+            raise ValueError(f"num_perm ({num_perm}) deve ser múltiplo de band_rows ({band_rows})")
+
+        self.num_perm = num_perm
+        self.band_rows = band_rows
+        self.window_words = max(1, window_words)
+        rng = random.Random(seed)
+        self._permutations = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+        self._token_hashes: Dict[str, Tuple[int, ...]] = {}
+        self._signatures: List[Tuple[int, ...]] = []
+        self._window_segments: List[int] = []
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = {}
+        self._tracker = tracker
+        self._next_segment = 0
+        self._build_seconds = 0.0
+
+        if build:
+            self.build_index()
+
+    @property
+    def is_built(self) -> bool:
+        """Indica se todos os segmentos já foram indexados."""
+        return self._next_segment >= len(self._tracker.segments)
+
+    def _hash_token(self, token: str) -> Tuple[int, ...]:
+        """Valores das num_perm permutações para um token (memorizados por token)."""
+        hashes = self._token_hashes.get(token)
+        if hashes is None:
+            x = zlib.crc32(token.encode('utf-8'))
+            hashes = tuple((a * x + b) % _MERSENNE_PRIME for a, b in self._permutations)
+            self._token_hashes[token] = hashes
+        return hashes
+
+    def signature(self, tokens: Sequence[str]) -> Optional[Tuple[int, ...]]:
+        """
+        Assinatura MinHash do conjunto de tokens.
+
+        Args:
+            tokens: Tokens do texto (repetições são ignoradas)
+
+        Returns:
+            Assinatura com num_perm mínimos, ou None se não há tokens
+        """
+        unique = set(tokens)
+        if not unique:
+            return None
+        return tuple(map(min, zip(*(self._hash_token(token) for token in unique))))
+
+    def _bands(self, signature: Tuple[int, ...]):
+        """Chaves LSH (índice da banda, linhas da banda) de uma assinatura."""
+        rows = self.band_rows
+        for band in range(self.num_perm // rows):
+            yield band, signature[band * rows:(band + 1) * rows]
+
+    def build_index(self, deadline: Optional[float] = None) -> bool:
+        """
+        Indexa os segmentos ainda não indexados, retomando de onde parou.
+
+        Args:
+            deadline: Instante (time.perf_counter) em que a construção para;
+                None = indexar tudo
+
+        Returns:
+            True se o índice está completo
+        """
+        segments = self._tracker.segments
+        start = time.perf_counter()
+        while not self.is_built:
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+            self._index_segment(segments[self._next_segment])
+            self._next_segment += 1
+        self._build_seconds += time.perf_counter() - start
+
+        if self.is_built:
+            logger.info(
+                f"Índice MinHash: {len(self._signatures)} janelas de {len(segments)} segmentos "
+                f"em {self._build_seconds:.2f}s"
+            )
+        return self.is_built
+
+    def _index_segment(self, segment: Dict) -> None:
+        """Calcula assinaturas das janelas de um segmento e preenche as bandas LSH."""
+        words = self._tracker.words[segment['start_word']:segment['end_word']]
+        step = max(1, self.window_words // 2)
+        for offset in range(0, max(1, len(words) - step), step):
+            signature = self.signature(content_tokens(' '.join(words[offset:offset + self.window_words])))
+            if signature is None:
+                continue
+            window = len(self._signatures)
+            self._signatures.append(signature)
+            self._window_segments.append(segment['id'])
+            for key in self._bands(signature):
+                self._buckets.setdefault(key, []).append(window)
+
+    def align(
+        self,
+        sentence: str,
+        top_k: int = 3,
+        min_similarity: float = DEFAULT_MIN_SIMILARITY
+    ) -> List[AlignmentMatch]:
+        """
+        Segmentos mais parecidos com a sentença.
+
+        Args:
+            sentence: Sentença do resumo
+            top_k: Máximo de segmentos retornados
+            min_similarity: Similaridade de Jaccard estimada mínima
+
+        Returns:
+            Até top_k matches, do mais para o menos similar
+        """
+        signature = self.signature(content_tokens(sentence))
+        if signature is None:
+            return []
+
+        candidates = set()
+        for key in self._bands(signature):
+            candidates.update(self._buckets.get(key, ()))
+
+        # Similaridade do segmento = melhor janela do segmento
+        best: Dict[int, float] = {}
+        for window in candidates:
+            window_signature = self._signatures[window]
+            similarity = sum(
+                1 for a, b in zip(signature, window_signature) if a == b
+            ) / self.num_perm
+            segment_id = self._window_segments[window]
+            if similarity >= min_similarity and similarity > best.get(segment_id, 0.0):
+                best[segment_id] = similarity
+
+        ranked = sorted(best.items(), key=lambda item: (-item[1], item[0]))
+        return [AlignmentMatch(segment_id, similarity) for segment_id, similarity in ranked[:top_k]]
+
+    def align_all(
+        self,
+        sentences: Sequence[str],
+        top_k: int = 3,
+        budget_ms: Optional[int] = REFERENCE_ALIGNMENT_BUDGET_MS,
+        min_similarity: float = DEFAULT_MIN_SIMILARITY,
+        deadline: Optional[float] = None
+    ) -> List[List[AlignmentMatch]]:
+        """
+        Alinha várias sentenças respeitando um orçamento de latência.
+
+        Args:
+            sentences: Sentenças do resumo, em ordem de prioridade
+            top_k: Máximo de segmentos por sentença
+            budget_ms: Tempo máximo em ms (None = sem limite); ao estourar, as
+                sentenças restantes ficam sem match
+            min_similarity: Similaridade de Jaccard estimada mínima
+            deadline: Prazo absoluto (time.perf_counter) compartilhado com outras
+                etapas (ex.: construção do índice); substitui budget_ms
+
+        Returns:
+            Matches de cada sentença (lista vazia se sem match ou fora do orçamento)
+        """
+        if deadline is None and budget_ms is not None:
+            deadline = time.perf_counter() + budget_ms / 1000
+        results: List[List[AlignmentMatch]] = []
+        for index, sentence in enumerate(sentences):
+            if deadline is not None and time.perf_counter() > deadline:
+                logger.warning(
+                    f"Orçamento de alinhamento esgotado: "
+                    f"{len(sentences) - index} sentenças sem referência aproximada"
+                )
+                results.extend([] for _ in range(len(sentences) - index))
+                break
+            results.append(self.align(sentence, top_k, min_similarity))
+        return results
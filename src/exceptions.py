@@ -6,3 +6,8 @@ Exceções customizadas para o CoverageSummarizer.
 class CoverageError(Exception):
     """Erro quando cobertura não atinge 100% após max tentativas."""
     pass
+
+
+class ConversionTimeoutError(Exception):
+    """Erro quando a conversão de documento excede o tempo limite."""
+    pass
@@ -0,0 +1,190 @@
+"""
+Extração tolerante de JSON em respostas do LLM.
+
+Mesmo pedindo "apenas JSON", o modelo às vezes envolve a resposta em prosa
+ou blocos ```json```, ou corta a saída no limite de tokens. Em vez de
+descartar a resposta, o extrator:
+1. tenta json.loads direto
+2. procura o primeiro valor JSON completo dentro do texto (cercas, prosa)
+3. fecha incrementalmente um JSON parcial (strings/colchetes abertos),
+   recuando até o último elemento completo
+
+Cada tentativa é contabilizada em JSONParseStats (direto/recuperado/falha)
+para expor a taxa de falhas de parse.
+"""
+import json
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+PARSE_DIRECT = "direct"
+PARSE_RECOVERED = "recovered"
+PARSE_FAILED = "failed"
+
+JSON_OBJECT_FORMAT = {"type": "json_object"}
+
+FENCE_PATTERN = re.compile(r'```(?:json)?\s*(.*?)(?:```|$)', re.DOTALL | re.IGNORECASE)
+MAX_REPAIR_CUTS = 64
+
+_CLOSERS = {'{': '}', '[': ']'}
+
+
+def extract_json(text: Optional[str]) -> Tuple[Optional[Any], str]:
+    """
+    Extrai um objeto ou array JSON de uma resposta do LLM.
+
+    Args:
+        text: Resposta bruta do modelo
+
+    Returns:
+        Tupla (valor, resultado) onde resultado é PARSE_DIRECT, PARSE_RECOVERED
+        ou PARSE_FAILED (valor None)
+    """
+    if not text or not text.strip():
+        return None, PARSE_FAILED
+
+    stripped = text.strip()
+    try:
+        value = json.loads(stripped)
+        if isinstance(value, (dict, list)):
+            return value, PARSE_DIRECT
+    except ValueError:
+        pass
+
+    fenced = FENCE_PATTERN.search(stripped)
+    candidates = [fenced.group(1).strip()] if fenced else []
+    candidates.append(stripped)
+    for candidate in candidates:
+        # Valor que começa no primeiro '{'/'[': completo, senão fechado;
+        # só então valores completos mais adiante no texto
+        value = _first_complete_value(candidate, first_only=True)
+        if value is None:
+            value = _close_partial(candidate)
+        if value is None:
+            value = _first_complete_value(candidate)
+        if value is not None:
+            return value, PARSE_RECOVERED
+
+    return None, PARSE_FAILED
+
+
+def _first_complete_value(text: str, first_only: bool = False) -> Optional[Any]:
+    """Primeiro objeto/array JSON completo a partir de um '{' ou '[' (ou só do primeiro)."""
+    decoder = json.JSONDecoder()
+    for match in re.finditer(r'[\[{]', text):
+        try:
+            value, _ = decoder.raw_decode(text, match.start())
+        except ValueError:
+            value = None
+        if isinstance(value, (dict, list)):
+            return value
+        if first_only:
+            break
+    return None
+
+
+def _close_partial(text: str) -> Optional[Any]:
+    """
+    Fecha um JSON truncado em uma única varredura.
+
+    Registra pontos de corte seguros (após cada valor completo de um
+    container) com a pilha de containers abertos; tenta fechar o texto
+    inteiro e depois recua pelos cortes até obter JSON válido.
+    """
+    start = min((i for i in (text.find('{'), text.find('[')) if i >= 0), default=-1)
+    if start < 0:
+        return None
+
+    stack: List[str] = []
+    cuts: List[Tuple[int, str]] = []
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+            continue
+        if char == '"':
+            in_string = True
+        elif char in _CLOSERS:
+            stack.append(_CLOSERS[char])
+        elif char in '}]':
+            if not stack:
+                break
+            stack.pop()
+            if not stack:
+                break
+            cuts.append((i + 1, ''.join(reversed(stack))))
+        elif char == ',':
+            cuts.append((i, ''.join(reversed(stack))))
+
+    attempts = []
+    if stack:
+        tail = text[start:].rstrip().rstrip(',')
+        if in_string and not escaped:
+            tail += '"'
+        attempts.append(tail + ''.join(reversed(stack)))
+    attempts.extend(text[start:cut] + closers for cut, closers in reversed(cuts[-MAX_REPAIR_CUTS:]))
+
+    for attempt in attempts:
+        try:
+            value = json.loads(attempt)
+        except ValueError:
+            continue
+        if isinstance(value, (dict, list)):
+            return value
+    return None
+
+
+class JSONParseStats:
+    """
+    Contadores de parse de respostas JSON (seguros entre threads).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts: Dict[str, int] = {PARSE_DIRECT: 0, PARSE_RECOVERED: 0, PARSE_FAILED: 0}
+
+    def record(self, outcome: str) -> None:
+        """Registra o resultado de um parse (PARSE_DIRECT/RECOVERED/FAILED)."""
+        with self._lock:
+            self.counts[outcome] = self.counts.get(outcome, 0) + 1
+
+    @property
+    def total(self) -> int:
+        """Total de parses registrados."""
+        return sum(self.counts.values())
+
+    @property
+    def failure_rate(self) -> float:
+        """Fração de parses que falharam (0.0 sem registros)."""
+        total = self.total
+        return self.counts[PARSE_FAILED] / total if total else 0.0
+
+    def to_dict(self) -> Dict:
+        """Contadores e taxa de falha (para metadados do processo)."""
+        with self._lock:
+            counts = dict(self.counts)
+        return {**counts, "total": sum(counts.values()), "failure_rate": self.failure_rate}
+
+
+# Instância global (métrica do processo inteiro)
+_parse_stats: Optional[JSONParseStats] = None
+
+
+def get_parse_stats() -> JSONParseStats:
+    """
+    Retorna os contadores globais de parse de JSON.
+
+    Returns:
+        Instância de JSONParseStats
+    """
+    global _parse_stats
+    if _parse_stats is None:
+        _parse_stats = JSONParseStats()
+    return _parse_stats
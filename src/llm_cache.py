@@ -0,0 +1,252 @@
+"""
+Cache persistente de respostas do LLM endereçado por conteúdo.
+
+Reexecutar um livro (após crash, falha no Quality Gate ou nova exportação)
+repete exatamente os mesmos prompts de extração e resumo. Este cache guarda
+as respostas em SQLite, indexadas pelo hash de (modelo, mensagens,
+temperatura, max_output_tokens), com TTL e expulsão LRU por tamanho.
+
+Falhas do cache nunca interrompem o pipeline: erros de SQLite são logados e
+tratados como cache miss.
+
+Acertos podem ser contados por escopo (track_cache_hits), p.ex. para que o
+histórico de tempos por capítulo não use medições de capítulos que vieram
+(em parte) do cache.
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "/app/volumes/cache/llm_cache.sqlite3")
+DEFAULT_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "50000"))
+DEFAULT_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+CACHEABLE_MAX_TEMPERATURE = float(os.getenv("LLM_CACHE_MAX_TEMPERATURE", "0.5"))
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+
+
+class CacheHitCounter:
+    """Acertos do cache dentro de um escopo de track_cache_hits."""
+
+    def __init__(self):
+        self.hits = 0
+
+
+# Contador do escopo corrente (tasks criadas no escopo herdam o contexto).
+# O mesmo ContextVar é usado pelos caminhos de import 'llm_cache' e
+# 'src.llm_cache', para que os acertos contem em qualquer um deles.
+_other_module = sys.modules.get("src.llm_cache" if __name__ == "llm_cache" else "llm_cache")
+_hit_counter: ContextVar[Optional[CacheHitCounter]] = (
+    getattr(_other_module, "_hit_counter", None)
+    or ContextVar("llm_cache_hit_counter", default=None)
+)
+
+
+@contextmanager
+def track_cache_hits() -> Iterator[CacheHitCounter]:
+    """
+    Conta os acertos do cache dentro do bloco, inclusive em tasks criadas nele.
+
+    Yields:
+        CacheHitCounter com o número de acertos até o momento
+    """
+    counter = CacheHitCounter()
+    token = _hit_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _hit_counter.reset(token)
+
+
+class LLMResponseCache:
+    """
+    Cache SQLite de respostas do LLM com TTL e expulsão LRU.
+
+    Cada entrada guarda a resposta, o instante de criação (para TTL) e o
+    último acesso (para LRU). A expulsão roda periodicamente, mantendo no
+    máximo `max_entries` entradas.
+    """
+
+    EVICTION_INTERVAL = 100
+
+    def __init__(
+        self,
+        db_path: str = DEFAULT_CACHE_PATH,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS
+    ):
+        """
+        Inicializa o cache e cria o schema se necessário.
+
+        Args:
+            db_path: Caminho do arquivo SQLite
+            max_entries: Máximo de entradas antes da expulsão LRU
+            ttl_seconds: Validade de cada entrada em segundos
+        """
+        self.db_path = Path(db_path)
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._writes_since_eviction = 0
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, response TEXT NOT NULL, "
+                "created_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON responses(last_access)")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Abre conexão curta (uma por operação, segura entre threads) e faz commit ao sair."""
+        conn = sqlite3.connect(str(self.db_path), timeout=5.0)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def make_key(
+        model: str,
+        system_message: str,
+        user_message: str,
+        temperature: float,
+        max_output_tokens: int,
+        salt: Optional[str] = None
+    ) -> str:
+        """
+        Calcula a chave de cache (SHA-256) de uma requisição.
+
+        Args:
+            model: Modelo do LLM
+            system_message: Mensagem de sistema
+            user_message: Mensagem do usuário
+            temperature: Temperatura
+            max_output_tokens: Máximo de tokens na resposta
+            salt: Sal opcional (ex.: número da tentativa) para separar respostas
+
+        Returns:
+            Hash hexadecimal da requisição
+        """
+        payload = json.dumps(
+            [model, system_message, user_message, temperature, max_output_tokens, salt],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Busca resposta válida no cache.
+
+        Args:
+            key: Chave calculada por make_key()
+
+        Returns:
+            Resposta armazenada ou None (miss, expirada ou erro)
+        """
+        now = time.time()
+        try:
+            with self._lock, self._connect() as conn:
+                row = conn.execute(
+                    "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                if now - row[1] > self.ttl_seconds:
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    return None
+                conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+                counter = _hit_counter.get()
+                if counter is not None:
+                    counter.hits += 1
+                return row[0]
+        except sqlite3.Error as e:
+            logger.warning(f"Falha ao ler cache do LLM: {e}")
+            return None
+
+    def set(self, key: str, response: str) -> None:
+        """
+        Armazena resposta no cache.
+
+        Args:
+            key: Chave calculada por make_key()
+            response: Resposta do LLM
+        """
+        now = time.time()
+        try:
+            with self._lock, self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, response, created_at, last_access) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, response, now, now)
+                )
+                self._writes_since_eviction += 1
+                if self._writes_since_eviction >= self.EVICTION_INTERVAL:
+                    self._writes_since_eviction = 0
+                    self._evict(conn)
+        except sqlite3.Error as e:
+            logger.warning(f"Falha ao gravar cache do LLM: {e}")
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Remove entradas expiradas e as menos usadas acima de max_entries."""
+        conn.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+        conn.execute(
+            "DELETE FROM responses WHERE key IN ("
+            "SELECT key FROM responses ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+
+    def evict(self) -> None:
+        """Força a expulsão imediata (TTL + LRU)."""
+        try:
+            with self._lock, self._connect() as conn:
+                self._evict(conn)
+        except sqlite3.Error as e:
+            logger.warning(f"Falha ao expulsar entradas do cache do LLM: {e}")
+
+    def __len__(self) -> int:
+        """Número de entradas armazenadas."""
+        with self._lock, self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+def is_cacheable_temperature(temperature: float) -> bool:
+    """Indica se a temperatura é determinística o bastante para usar cache."""
+    return temperature <= CACHEABLE_MAX_TEMPERATURE
+
+
+# Instância global do cache
+_llm_cache: Optional[LLMResponseCache] = None
+_llm_cache_failed = False
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """
+    Retorna a instância global do cache de respostas do LLM.
+
+    Returns:
+        Cache ou None se desabilitado (LLM_CACHE_ENABLED=false) ou indisponível
+    """
+    global _llm_cache, _llm_cache_failed
+    if not LLM_CACHE_ENABLED or _llm_cache_failed:
+        return None
+    if _llm_cache is None:
+        try:
+            _llm_cache = LLMResponseCache()
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Cache do LLM indisponível, seguindo sem cache: {e}")
+            _llm_cache_failed = True
+            return None
+    return _llm_cache
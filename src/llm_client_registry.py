@@ -0,0 +1,139 @@
+"""
+Registro do cliente LLM compartilhado pelo processo.
+
+Sem o registro, cada BookSummarizerRobust criado por requisição instancia um
+novo AsyncOpenAIClient (e um novo AsyncOpenAI), pagando handshakes TLS e
+começando com o pool de conexões frio. O registro é aberto no startup da
+FastAPI e fechado no shutdown, mantendo um único pool HTTP com keep-alive
+reaproveitado por todos os summarizers.
+
+Enquanto não for aberto (CLI, testes), get_llm_client() retorna None e cada
+summarizer cria seu próprio cliente, como antes.
+"""
+import logging
+import os
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONNECTIONS = int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "100"))
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+DEFAULT_KEEPALIVE_EXPIRY = float(os.getenv("LLM_HTTP_KEEPALIVE_EXPIRY", "30"))
+DEFAULT_REQUEST_TIMEOUT = float(os.getenv("LLM_HTTP_TIMEOUT", "60"))
+
+
+class LLMClientRegistry:
+    """
+    Mantém o AsyncOpenAIClient compartilhado e seu pool HTTP.
+
+    Ciclo de vida: open() no startup, close() no shutdown.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+        timeout: float = DEFAULT_REQUEST_TIMEOUT
+    ):
+        """
+        Inicializa o registro (fechado).
+
+        Args:
+            max_connections: Máximo de conexões HTTP simultâneas no pool
+            max_keepalive_connections: Máximo de conexões ociosas mantidas abertas
+            keepalive_expiry: Segundos até fechar uma conexão ociosa
+            timeout: Timeout das requisições em segundos
+        """
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.timeout = timeout
+        self._http_client = None
+        self._llm_client = None
+
+    @property
+    def is_open(self) -> bool:
+        """Indica se o cliente compartilhado está disponível."""
+        return self._llm_client is not None
+
+    @property
+    def client(self):
+        """AsyncOpenAIClient compartilhado ou None se o registro estiver fechado."""
+        return self._llm_client
+
+    def open(self, api_key: Optional[str] = None, model: Optional[str] = None) -> bool:
+        """
+        Cria o pool HTTP e o cliente compartilhado.
+
+        Sem OPENAI_API_KEY o registro permanece fechado (o erro continua
+        aparecendo por requisição, como antes).
+
+        Args:
+            api_key: Chave de API (usa OPENAI_API_KEY se None)
+            model: Modelo a usar (padrão do AsyncOpenAIClient se None)
+
+        Returns:
+            True se o cliente compartilhado foi aberto
+        """
+        if self.is_open:
+            return True
+
+        api_key = api_key or os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            logger.warning("OPENAI_API_KEY ausente: cliente LLM compartilhado não foi aberto")
+            return False
+
+        # Import here to avoid circular import
+        import httpx
+        from openai import AsyncOpenAI
+        from summarizer import AsyncOpenAIClient
+
+        self._http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry
+            ),
+            timeout=self.timeout
+        )
+        openai_client = AsyncOpenAI(api_key=api_key, http_client=self._http_client, max_retries=0)
+        self._llm_client = AsyncOpenAIClient(
+            api_key=api_key, model=model, timeout=self.timeout, client=openai_client
+        )
+        logger.info(
+            f"Cliente LLM compartilhado aberto (max_connections={self.max_connections}, "
+            f"keepalive={self.max_keepalive_connections}/{self.keepalive_expiry:.0f}s)"
+        )
+        return True
+
+    async def close(self) -> None:
+        """Fecha o pool HTTP e descarta o cliente compartilhado."""
+        http_client = self._http_client
+        self._http_client = None
+        self._llm_client = None
+        if http_client is not None:
+            await http_client.aclose()
+            logger.info("Cliente LLM compartilhado fechado")
+
+
+# Instância global do registro
+_client_registry: Optional[LLMClientRegistry] = None
+
+
+def get_client_registry() -> LLMClientRegistry:
+    """Retorna a instância global do registro de clientes LLM."""
+    global _client_registry
+    if _client_registry is None:
+        _client_registry = LLMClientRegistry()
+    return _client_registry
+
+
+def get_llm_client():
+    """
+    Retorna o AsyncOpenAIClient compartilhado.
+
+    Returns:
+        Cliente compartilhado ou None se o registro não foi aberto
+    """
+    return get_client_registry().client
@@ -0,0 +1,366 @@
+"""
+Governador global de concorrência e rate limit para chamadas ao LLM.
+
+Com paralelismo por capítulo e por chunk, várias instâncias de
+AsyncOpenAIClient disparam requisições ao mesmo tempo. Este módulo centraliza
+o controle em uma única instância por processo:
+- Teto de requisições por minuto (RPM) via token bucket
+- Teto de tokens por minuto (TPM) estimado a partir do prompt + max_output_tokens
+- Teto de requisições simultâneas (in-flight)
+- Respeito ao header Retry-After e ajuste adaptativo dos limites em 429
+
+O estado é protegido por primitivas de threading (não de asyncio), de modo
+que os tetos valem para o processo inteiro, mesmo com vários event loops
+(p.ex. asyncio.run em threads de jobs em background).
+"""
+import asyncio
+import email.utils
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Deque, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_RPM = int(os.getenv("LLM_MAX_RPM", "500"))
+DEFAULT_MAX_TPM = int(os.getenv("LLM_MAX_TPM", "200000"))
+DEFAULT_MAX_IN_FLIGHT = int(os.getenv("LLM_MAX_IN_FLIGHT", "16"))
+
+CHARS_PER_TOKEN = 4
+DEFAULT_RATE_LIMIT_COOLDOWN = 1.0
+MAX_RATE_LIMIT_COOLDOWN = 60.0
+
+
+def estimate_tokens(system_message: str, user_message: str, max_output_tokens: int) -> int:
+    """
+    Estima o custo em tokens de uma requisição (entrada + saída máxima).
+
+    Args:
+        system_message: Mensagem de sistema
+        user_message: Mensagem do usuário
+        max_output_tokens: Máximo de tokens na resposta
+
+    Returns:
+        Estimativa de tokens consumidos do orçamento TPM
+    """
+    prompt_chars = len(system_message) + len(user_message)
+    return prompt_chars // CHARS_PER_TOKEN + max_output_tokens
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """Indica se o erro corresponde a um HTTP 429 (rate limit)."""
+    if getattr(error, "status_code", None) == 429:
+        return True
+    return type(error).__name__ == "RateLimitError"
+
+
+def parse_retry_after(error: Exception) -> Optional[float]:
+    """
+    Lê o tempo de espera sugerido pelo servidor a partir do erro.
+
+    Suporta `retry-after-ms`, `retry-after` em segundos e `retry-after` em
+    formato HTTP-date.
+
+    Args:
+        error: Exceção levantada pelo cliente HTTP/OpenAI
+
+    Returns:
+        Segundos a aguardar ou None se não houver header válido
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms is not None:
+        try:
+            return max(0.0, float(retry_after_ms) / 1000.0)
+        except (TypeError, ValueError):
+            pass
+
+    retry_after = headers.get("retry-after")
+    if retry_after is None:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except (TypeError, ValueError):
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(retry_after)
+        return max(0.0, retry_at.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Token bucket com capacidade por minuto e reposição contínua."""
+
+    def __init__(self, capacity_per_minute: float, clock: Callable[[], float] = time.monotonic):
+        """
+        Inicializa o bucket cheio.
+
+        Args:
+            capacity_per_minute: Capacidade (e taxa de reposição) por minuto
+            clock: Relógio monotônico (injetável para testes)
+        """
+        self._clock = clock
+        self.capacity = float(max(1.0, capacity_per_minute))
+        self._tokens = self.capacity
+        self._updated_at = clock()
+
+    def _refill(self) -> None:
+        """Repõe tokens proporcionalmente ao tempo decorrido."""
+        now = self._clock()
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.capacity / 60.0)
+
+    def time_until_available(self, amount: float) -> float:
+        """Segundos até haver `amount` tokens disponíveis (0 se já houver)."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        missing = amount - self._tokens
+        if missing <= 0:
+            return 0.0
+        return missing * 60.0 / self.capacity
+
+    def consume(self, amount: float) -> None:
+        """Consome tokens (pode deixar saldo negativo para requisições maiores que a capacidade)."""
+        self._refill()
+        self._tokens -= amount
+
+    def set_capacity(self, capacity_per_minute: float) -> None:
+        """Altera capacidade e taxa de reposição, preservando o saldo atual."""
+        self._refill()
+        self.capacity = float(max(1.0, capacity_per_minute))
+        self._tokens = min(self._tokens, self.capacity)
+
+
+class ProcessSemaphore:
+    """
+    Semáforo assíncrono compartilhado entre event loops e threads.
+
+    asyncio.Semaphore é preso ao loop em que é usado; aqui a contagem fica
+    sob um threading.Lock e cada espera é um future do loop de quem aguarda,
+    acordado com call_soon_threadsafe quando uma vaga é liberada (FIFO).
+    """
+
+    def __init__(self, value: int):
+        """
+        Args:
+            value: Número de vagas
+        """
+        self._value = value
+        self._lock = threading.Lock()
+        self._waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+
+    async def acquire(self) -> None:
+        """Aguarda e ocupa uma vaga."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._value > 0 and not self._waiters:
+                self._value -= 1
+                return
+            waiter = (loop, loop.create_future())
+            self._waiters.append(waiter)
+
+        try:
+            await waiter[1]
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                    raise
+            # A vaga já foi repassada a esta espera: devolvê-la
+            if waiter[1].done() and not waiter[1].cancelled():
+                self.release()
+            raise
+
+    def release(self) -> None:
+        """Libera uma vaga, repassando-a à espera mais antiga (de qualquer loop)."""
+        with self._lock:
+            while self._waiters:
+                loop, future = self._waiters.popleft()
+                if loop.is_closed():
+                    continue
+                loop.call_soon_threadsafe(self._grant, future)
+                return
+            self._value += 1
+
+    def _grant(self, future: asyncio.Future) -> None:
+        """Entrega a vaga no loop da espera (ou a libera se a espera foi cancelada)."""
+        if future.cancelled():
+            self.release()
+        else:
+            future.set_result(None)
+
+
+class LLMRateLimiter:
+    """
+    Limitador global compartilhado por todas as chamadas `complete()`.
+
+    Os tetos são por processo: o semáforo in-flight e os buckets são
+    compartilhados por todos os event loops e threads.
+
+    Em 429 os limites efetivos de RPM/TPM caem pela metade (até um piso) e
+    todas as requisições aguardam o Retry-After. Após uma sequência de
+    sucessos os limites voltam a subir gradualmente até os valores configurados.
+    """
+
+    DECREASE_FACTOR = 0.5
+    INCREASE_FACTOR = 1.1
+    MIN_LIMIT_FRACTION = 0.1
+    SUCCESSES_BEFORE_INCREASE = 20
+
+    def __init__(
+        self,
+        max_rpm: int = DEFAULT_MAX_RPM,
+        max_tpm: int = DEFAULT_MAX_TPM,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Inicializa o limitador.
+
+        Args:
+            max_rpm: Máximo de requisições por minuto
+            max_tpm: Máximo de tokens (estimados) por minuto
+            max_in_flight: Máximo de requisições simultâneas
+            clock: Relógio monotônico (injetável para testes)
+        """
+        self._clock = clock
+        self.max_rpm = max(1, max_rpm)
+        self.max_tpm = max(1, max_tpm)
+        self.max_in_flight = max(1, max_in_flight)
+        self.requests = TokenBucket(self.max_rpm, clock)
+        self.tokens = TokenBucket(self.max_tpm, clock)
+        self._blocked_until = 0.0
+        self._consecutive_rate_limits = 0
+        self._successes_since_adjust = 0
+        self._lock = threading.Lock()
+        self._in_flight = ProcessSemaphore(self.max_in_flight)
+
+    @property
+    def current_rpm(self) -> float:
+        """Limite efetivo atual de RPM."""
+        return self.requests.capacity
+
+    @property
+    def current_tpm(self) -> float:
+        """Limite efetivo atual de TPM."""
+        return self.tokens.capacity
+
+    def time_until_ready(self, estimated_tokens: int) -> float:
+        """Segundos até a próxima requisição poder ser despachada."""
+        with self._lock:
+            cooldown = self._blocked_until - self._clock()
+            return max(
+                cooldown,
+                self.requests.time_until_available(1),
+                self.tokens.time_until_available(estimated_tokens)
+            )
+
+    def _reserve(self, estimated_tokens: int) -> float:
+        """
+        Reserva o orçamento de RPM/TPM da requisição.
+
+        O consumo é imediato (o saldo pode ficar negativo), de modo que as
+        requisições seguintes esperam atrás desta, em ordem de chegada.
+
+        Returns:
+            Instante (relógio do limitador) a partir do qual o orçamento está disponível
+        """
+        with self._lock:
+            wait_s = max(
+                self.requests.time_until_available(1),
+                self.tokens.time_until_available(estimated_tokens)
+            )
+            self.requests.consume(1)
+            self.tokens.consume(estimated_tokens)
+            return self._clock() + wait_s
+
+    @asynccontextmanager
+    async def slot(self, estimated_tokens: int) -> AsyncIterator[None]:
+        """
+        Reserva uma vaga para uma requisição ao LLM.
+
+        Aguarda vaga in-flight, orçamento de RPM/TPM e eventual cooldown de
+        Retry-After antes de liberar a execução. A vaga in-flight fica ocupada
+        até o fim do bloco.
+
+        Args:
+            estimated_tokens: Tokens estimados da requisição (ver estimate_tokens)
+        """
+        await self._in_flight.acquire()
+        try:
+            ready_at = self._reserve(estimated_tokens)
+            while True:
+                now = self._clock()
+                wait_s = max(ready_at, self._blocked_until) - now
+                if wait_s <= 0:
+                    break
+                await asyncio.sleep(wait_s)
+            yield
+        finally:
+            self._in_flight.release()
+
+    def record_success(self) -> None:
+        """Registra sucesso e, após uma sequência estável, relaxa os limites."""
+        with self._lock:
+            self._consecutive_rate_limits = 0
+            self._successes_since_adjust += 1
+            if self._successes_since_adjust < self.SUCCESSES_BEFORE_INCREASE:
+                return
+            self._successes_since_adjust = 0
+            if self.current_rpm < self.max_rpm or self.current_tpm < self.max_tpm:
+                self.requests.set_capacity(min(self.max_rpm, self.current_rpm * self.INCREASE_FACTOR))
+                self.tokens.set_capacity(min(self.max_tpm, self.current_tpm * self.INCREASE_FACTOR))
+                logger.info(f"Rate limit relaxado: {self.current_rpm:.0f} RPM / {self.current_tpm:.0f} TPM")
+
+    def record_failure(self, error: Exception) -> Optional[float]:
+        """
+        Registra falha; em 429 aplica cooldown global e reduz os limites.
+
+        Args:
+            error: Exceção levantada pela chamada ao LLM
+
+        Returns:
+            Segundos de cooldown aplicados se o erro for rate limit, senão None
+        """
+        if not is_rate_limit_error(error):
+            return None
+
+        with self._lock:
+            self._consecutive_rate_limits += 1
+            self._successes_since_adjust = 0
+            cooldown = parse_retry_after(error)
+            if cooldown is None:
+                cooldown = DEFAULT_RATE_LIMIT_COOLDOWN * (2 ** (self._consecutive_rate_limits - 1))
+            cooldown = min(cooldown, MAX_RATE_LIMIT_COOLDOWN)
+            self._blocked_until = max(self._blocked_until, self._clock() + cooldown)
+
+            self.requests.set_capacity(max(self.max_rpm * self.MIN_LIMIT_FRACTION, self.current_rpm * self.DECREASE_FACTOR))
+            self.tokens.set_capacity(max(self.max_tpm * self.MIN_LIMIT_FRACTION, self.current_tpm * self.DECREASE_FACTOR))
+        logger.warning(
+            f"Rate limit (429): pausando {cooldown:.1f}s; "
+            f"novos limites {self.current_rpm:.0f} RPM / {self.current_tpm:.0f} TPM"
+        )
+        return cooldown
+
+
+# Instância global do limitador
+_rate_limiter: Optional[LLMRateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> LLMRateLimiter:
+    """Retorna a instância global do limitador de chamadas ao LLM."""
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = LLMRateLimiter()
+    return _rate_limiter
@@ -5,14 +5,24 @@ Parses Markdown structure to extract chapters and sections.
 Replaces complex regex-based chapter detection with simple Markdown parsing.
 """
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Dict, List, Optional
 import logging
+import re
 
 logger = logging.getLogger(__name__)
 
+HEADER_LEVELS = (1, 2, 3)
+
+# Markdown formatting removed from header titles
+BOLD_PATTERN = re.compile(r'\*\*([^*]+)\*\*')
+ITALIC_STAR_PATTERN = re.compile(r'\*([^*]+)\*')
+ITALIC_UNDERSCORE_PATTERN = re.compile(r'_([^_]+)_')
+PAGE_MARKER_PATTERN = re.compile(r'---\s*Página\s+(\d+)\s*---', re.IGNORECASE)
+
 
 # Reuse Chapter dataclass from chapter_detector for compatibility
 from src.chapter_detector import Chapter
+from src.text_index import TextIndex
 
 
 class MarkdownParser:
@@ -31,7 +41,7 @@ class MarkdownParser:
         """
         self.min_headers = min_headers
 
-    def parse_chapters(self, md_text: str) -> List[Chapter]:
+    def parse_chapters(self, md_text: str, text_index: Optional[TextIndex] = None) -> List[Chapter]:
         """
         Extract chapters from Markdown text based on headers.
 
@@ -44,16 +54,19 @@ class MarkdownParser:
 
         Args:
             md_text: Markdown text
+            text_index: Word index of `md_text` (optional); when given,
+                word counts come from the index instead of re-splitting
 
         Returns:
             List of Chapter objects, or empty list if structure invalid
         """
         lines = md_text.split('\n')
 
-        # Extract headers from all levels
-        h2_candidates = self._extract_headers_by_level(lines, level=2)
-        h3_candidates = self._extract_headers_by_level(lines, level=3)
-        h1_candidates = self._extract_headers_by_level(lines, level=1)
+        # Extract headers from all levels (single pass)
+        headers_by_level = self._scan_headers(lines)
+        h1_candidates = headers_by_level[1]
+        h2_candidates = headers_by_level[2]
+        h3_candidates = headers_by_level[3]
 
         logger.info(f"📊 Headers encontrados: level-1={len(h1_candidates)}, level-2={len(h2_candidates)}, level-3={len(h3_candidates)}")
 
@@ -74,18 +87,21 @@ class MarkdownParser:
         # Convert to Chapter objects
         chapters = []
         for i, candidate in enumerate(header_candidates):
-            # Calculate end position
+            # End offset = start of next header line, or one past the text
+            # end for the last chapter (offset of a virtual line after the last)
             if i + 1 < len(header_candidates):
-                end_line = header_candidates[i + 1]['line_num']
+                end_pos = header_candidates[i + 1]['start_pos']
             else:
-                end_line = len(lines)
+                end_pos = len(md_text) + 1
 
-            # Extract chapter content
-            chapter_lines = lines[candidate['line_num']:end_line]
-            chapter_text = '\n'.join(chapter_lines)
+            # Extract chapter content (offset slice, no line re-join)
+            chapter_text = self.chapter_text(md_text, candidate['start_pos'], end_pos)
 
             # Count words
-            word_count = len(chapter_text.split())
+            if text_index is not None:
+                word_count = text_index.count_words(candidate['start_pos'], end_pos - 1)
+            else:
+                word_count = len(chapter_text.split())
 
             # Extract page markers if present (format: --- Página N ---)
             page_markers = self._extract_page_markers(chapter_text)
@@ -94,7 +110,7 @@ class MarkdownParser:
                 number=str(i + 1),
                 title=candidate['title'],
                 start_pos=candidate['start_pos'],
-                end_pos=sum(len(l) + 1 for l in lines[:end_line]),
+                end_pos=end_pos,
                 start_line=candidate['line_num'],
                 page_markers=page_markers,
                 word_count=word_count,
@@ -108,6 +124,84 @@ class MarkdownParser:
 
         return chapters
 
+    @staticmethod
+    def chapter_text(md_text: str, start_pos: int, end_pos: int) -> str:
+        """
+        Chapter content as an offset slice of the Markdown text.
+
+        Equivalent to joining the chapter's lines: the newline that precedes
+        the next header (or the virtual one past the end) is excluded.
+
+        Args:
+            md_text: Markdown text
+            start_pos: Chapter start offset
+            end_pos: Chapter end offset (Chapter.end_pos)
+
+        Returns:
+            Chapter text
+        """
+        return md_text[start_pos:end_pos - 1]
+
+    def _scan_headers(self, lines: List[str]) -> Dict[int, List[dict]]:
+        """
+        Extract headers of levels 1-3 from Markdown lines in a single pass.
+
+        Line offsets are accumulated during the scan (linear time).
+
+        Args:
+            lines: List of text lines
+
+        Returns:
+            Dict level -> list of header candidates with line_num, title, start_pos
+        """
+        headers: Dict[int, List[dict]] = {level: [] for level in HEADER_LEVELS}
+        line_start = 0
+        for i, line in enumerate(lines):
+            start_pos = line_start
+            line_start += len(line) + 1
+            if not line.startswith('#'):
+                continue
+
+            level = self._header_level(line)
+            if level is None:
+                continue
+
+            candidate = self._build_header_candidate(line, level, i, start_pos)
+            if candidate is not None:
+                headers[level].append(candidate)
+
+        return headers
+
+    @staticmethod
+    def _header_level(line: str) -> Optional[int]:
+        """Return the header level (1-3) of a line, or None if it is not one."""
+        for level in HEADER_LEVELS:
+            if line.startswith('#' * level + ' '):
+                return level
+        return None
+
+    def _build_header_candidate(self, line: str, level: int, line_num: int, start_pos: int) -> Optional[dict]:
+        """Build a header candidate, or None if the title is an artifact."""
+        title = line[level + 1:].strip()
+
+        # Remove Markdown formatting (**bold**, _italic_, etc.)
+        title_clean = BOLD_PATTERN.sub(r'\1', title)  # Remove **bold**
+        title_clean = ITALIC_STAR_PATTERN.sub(r'\1', title_clean)  # Remove *italic*
+        title_clean = ITALIC_UNDERSCORE_PATTERN.sub(r'\1', title_clean)  # Remove _italic_
+        title_clean = title_clean.strip()
+
+        # Filter artifacts (use cleaned title for validation)
+        if not self._is_valid_header(title_clean):
+            return None
+
+        # But keep original title for display (remove markdown for cleaner display)
+        candidate_title = title_clean if title_clean != title else title
+        return {
+            'line_num': line_num,
+            'title': candidate_title,
+            'start_pos': start_pos
+        }
+
     def _extract_headers_by_level(self, lines: List[str], level: int) -> List[dict]:
         """
         Extract headers of a specific level from Markdown lines.
@@ -119,44 +213,9 @@ class MarkdownParser:
         Returns:
             List of header candidates with line_num, title, start_pos
         """
-        if level == 1:
-            prefix = '# '
-            exclude_prefix = '## '
-            strip_len = 2
-        elif level == 2:
-            prefix = '## '
-            exclude_prefix = '### '
-            strip_len = 3
-        elif level == 3:
-            prefix = '### '
-            exclude_prefix = '#### '
-            strip_len = 4
-        else:
+        if level not in HEADER_LEVELS:
             return []
-
-        header_candidates = []
-        for i, line in enumerate(lines):
-            if line.startswith(prefix) and not line.startswith(exclude_prefix):
-                title = line[strip_len:].strip()
-                
-                # Remove Markdown formatting (**bold**, _italic_, etc.)
-                import re
-                title_clean = re.sub(r'\*\*([^*]+)\*\*', r'\1', title)  # Remove **bold**
-                title_clean = re.sub(r'\*([^*]+)\*', r'\1', title_clean)  # Remove *italic*
-                title_clean = re.sub(r'_([^_]+)_', r'\1', title_clean)  # Remove _italic_
-                title_clean = title_clean.strip()
-
-                # Filter artifacts (use cleaned title for validation)
-                if self._is_valid_header(title_clean):
-                    # But keep original title for display (remove markdown for cleaner display)
-                    candidate_title = title_clean if title_clean != title else title
-                    header_candidates.append({
-                        'line_num': i,
-                        'title': candidate_title,
-                        'start_pos': sum(len(l) + 1 for l in lines[:i])
-                    })
-
-        return header_candidates
+        return self._scan_headers(lines)[level]
 
     def _select_best_level(self, h1: List[dict], h2: List[dict], h3: List[dict]) -> tuple:
         """
@@ -273,9 +332,8 @@ class MarkdownParser:
         Returns:
             List of page numbers found
         """
-        import re
         page_numbers = []
-        for match in re.finditer(r'---\s*Página\s+(\d+)\s*---', text, re.IGNORECASE):
+        for match in PAGE_MARKER_PATTERN.finditer(text):
             page_numbers.append(int(match.group(1)))
 
         return sorted(set(page_numbers))  # Remove duplicates and sort
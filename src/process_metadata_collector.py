@@ -9,6 +9,8 @@ from datetime import datetime
 from typing import Dict, List, Optional
 from dataclasses import dataclass, field, asdict
 
+from src.json_extraction import JSONParseStats
+
 
 @dataclass
 class RegenerationAttempt:
@@ -36,6 +38,17 @@ class AddendumAttempt:
     result: str = "failed"  # "failed" | "passed"
 
 
+@dataclass
+class RepairDecisionRecord:
+    """Decisão da política de reparo para um resumo reprovado."""
+    attempt_number: int
+    timestamp: str
+    action: str  # "insert" | "addendum" | "regenerate"
+    reason: str
+    missing_markers: List[str] = field(default_factory=list)
+    result: str = "applied"  # "applied" | "passed" | "failed"
+
+
 @dataclass
 class ChapterProcessData:
     """Dados completos do processamento de um capítulo."""
@@ -43,6 +56,7 @@ class ChapterProcessData:
     chapter_title: str
     regeneration_attempts: List[RegenerationAttempt] = field(default_factory=list)
     addendum_attempts: List[AddendumAttempt] = field(default_factory=list)
+    repair_decisions: List[RepairDecisionRecord] = field(default_factory=list)
     final_regeneration_count: int = 0
     final_addendum_count: int = 0
     final_missing_markers: List[str] = field(default_factory=list)
@@ -64,6 +78,7 @@ class ProcessMetadataCollector:
     Coleta todos os dados do processo para rastreabilidade completa:
     - Tentativas de regeneração (prompts, temperaturas, resultados)
     - Tentativas de addendum (conteúdo, validações, estratégias)
+    - Decisões de reparo (inserção, addendum ou regeneração)
     - Logs detalhados de cada capítulo
     - Métricas de processamento
     """
@@ -74,6 +89,7 @@ class ProcessMetadataCollector:
         self.logs: List[ProcessLog] = []
         self.start_time: Optional[datetime] = None
         self.end_time: Optional[datetime] = None
+        self.json_parse = JSONParseStats()
     
     def start_process(self) -> None:
         """Marca início do processo."""
@@ -189,6 +205,42 @@ class ProcessMetadataCollector:
             f"Tentativa {attempt_number} de addendum: {result}, validação: {validation_passed}"
         )
     
+    def log_repair_decision(
+        self,
+        chapter_number: str,
+        attempt_number: int,
+        action: str,
+        reason: str,
+        missing_markers: List[str],
+        result: str = "applied"
+    ) -> None:
+        """
+        Registra uma decisão da política de reparo.
+        
+        Args:
+            chapter_number: Número do capítulo
+            attempt_number: Tentativa de resumo reparada
+            action: Reparo escolhido ("insert" | "addendum" | "regenerate")
+            reason: Motivo da decisão
+            missing_markers: Marcadores faltantes no resumo reprovado
+            result: Resultado ("applied" | "passed" | "failed")
+        """
+        chapter_data = self.get_chapter_data(chapter_number)
+        chapter_data.repair_decisions.append(RepairDecisionRecord(
+            attempt_number=attempt_number,
+            timestamp=datetime.now().isoformat(),
+            action=action,
+            reason=reason,
+            missing_markers=missing_markers,
+            result=result
+        ))
+        
+        self.log(
+            "WARNING" if result == "failed" else "INFO",
+            chapter_number,
+            f"Reparo da tentativa {attempt_number}: {action} ({reason}), resultado: {result}"
+        )
+    
     def finalize_chapter(
         self,
         chapter_number: str,
@@ -227,6 +279,15 @@ class ProcessMetadataCollector:
         )
         self.logs.append(log_entry)
     
+    def record_json_parse(self, outcome: str) -> None:
+        """
+        Registra o resultado do parse de uma resposta JSON de extração.
+        
+        Args:
+            outcome: "direct" | "recovered" | "failed"
+        """
+        self.json_parse.record(outcome)
+    
     def to_dict(self) -> Dict:
         """
         Converte coletor para dicionário (para persistência).
@@ -244,5 +305,6 @@ class ProcessMetadataCollector:
             "duration_seconds": (
                 (self.end_time - self.start_time).total_seconds()
                 if self.start_time and self.end_time else None
-            )
+            ),
+            "json_parse": self.json_parse.to_dict()
         }
@@ -4,7 +4,10 @@ CoverageSummarizer - Módulo de Quality Gate
 INCR-4: Validação automática de qualidade dos resumos
 """
 
-from typing import Dict, List, Tuple, Optional
+from collections import OrderedDict
+from typing import Dict, FrozenSet, List, Tuple, Optional
+from dataclasses import dataclass
+import hashlib
 import re
 import json
 import os
@@ -13,6 +16,27 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+SUMMARY_TYPES = ["curto", "medio", "longo", "bullets"]
+MIN_KEYWORD_LENGTH = 4    # Palavras com mais de 4 caracteres contam como palavras-chave
+MIN_COMMON_KEYWORDS = 3   # Palavras-chave em comum com o original para o resumo ser relevante
+MAX_CACHED_VALIDATORS = 4  # Documentos com validador (vocabulário) em memória
+MAX_CACHED_FEATURES = 64   # Resumos com medidas em cache por validador
+
+
+def extract_keywords(text: str) -> FrozenSet[str]:
+    """Palavras-chave (minúsculas, mais de MIN_KEYWORD_LENGTH caracteres) de um texto."""
+    return frozenset(word.lower() for word in text.split() if len(word) > MIN_KEYWORD_LENGTH)
+
+
+@dataclass(frozen=True)
+class SummaryFeatures:
+    """Medidas de um resumo usadas pelos critérios de validação."""
+    word_count: int
+    bullet_count: int
+    unique_sentences: int      # Sentenças distintas com mais de 20 caracteres
+    complete_sentences: int    # Sentenças com mais de 10 caracteres
+    keywords: FrozenSet[str]
+
 
 class QualityGate:
     """Classe responsável por validar a qualidade dos resumos gerados."""
@@ -32,6 +56,7 @@ class QualityGate:
             "longo": 600,     # Máximo 600 palavras para resumo longo
             "bullets": 20     # Máximo 20 bullets
         }
+        self._validators: "OrderedDict[str, SummaryValidator]" = OrderedDict()
     
     def count_words(self, text: str) -> int:
         """Conta o número de palavras em um texto."""
@@ -64,26 +89,8 @@ class QualityGate:
         Returns:
             Tupla (é_válido, mensagem_erro)
         """
-        if summary_type == "bullets":
-            count = self.count_bullets(summary)
-            min_count = self.min_word_count["bullets"]
-            max_count = self.max_word_count["bullets"]
-            
-            if count < min_count:
-                return False, f"Resumo tem apenas {count} bullets, mínimo esperado: {min_count}"
-            if count > max_count:
-                return False, f"Resumo tem {count} bullets, máximo esperado: {max_count}"
-            return True, None
-        else:
-            word_count = self.count_words(summary)
-            min_words = self.min_word_count.get(summary_type, 0)
-            max_words = self.max_word_count.get(summary_type, float('inf'))
-            
-            if word_count < min_words:
-                return False, f"Resumo tem apenas {word_count} palavras, mínimo esperado: {min_words}"
-            if word_count > max_words:
-                return False, f"Resumo tem {word_count} palavras, máximo esperado: {max_words}"
-            return True, None
+        # Critério independente do documento: validador do texto vazio
+        return self.validator_for("").validate_length(summary, summary_type)
     
     def validate_content_quality(self, summary: str, original_text: str) -> Tuple[bool, Optional[str]]:
         """
@@ -96,26 +103,7 @@ class QualityGate:
         Returns:
             Tupla (é_válido, mensagem_erro)
         """
-        # Verificar se o resumo não está vazio
-        if not summary or len(summary.strip()) < 50:
-            return False, "Resumo muito curto ou vazio"
-        
-        # Verificar se o resumo não é apenas repetição de uma frase
-        sentences = re.split(r'[.!?]+', summary)
-        unique_sentences = set(s.strip().lower() for s in sentences if len(s.strip()) > 20)
-        if len(unique_sentences) < 2:
-            return False, "Resumo parece ser repetitivo ou muito simples"
-        
-        # Verificar se há palavras-chave do texto original no resumo
-        # (validação básica de relevância)
-        original_words = set(word.lower() for word in original_text.split() if len(word) > 4)
-        summary_words = set(word.lower() for word in summary.split() if len(word) > 4)
-        common_words = original_words.intersection(summary_words)
-        
-        if len(common_words) < 3:
-            return False, "Resumo não parece estar relacionado ao texto original (poucas palavras em comum)"
-        
-        return True, None
+        return self.validator_for(original_text).validate_content_quality(summary)
     
     def validate_structure(self, summary: str, summary_type: str) -> Tuple[bool, Optional[str]]:
         """
@@ -128,19 +116,8 @@ class QualityGate:
         Returns:
             Tupla (é_válido, mensagem_erro)
         """
-        if summary_type == "bullets":
-            # Verificar se há pelo menos alguns bullets
-            if self.count_bullets(summary) == 0:
-                return False, "Resumo de bullets não contém bullets formatados"
-        
-        # Verificar se há pelo menos algumas sentenças completas
-        sentences = re.split(r'[.!?]+', summary)
-        complete_sentences = [s.strip() for s in sentences if len(s.strip()) > 10]
-        
-        if len(complete_sentences) < 2:
-            return False, "Resumo não contém sentenças completas suficientes"
-        
-        return True, None
+        # Critério independente do documento: validador do texto vazio
+        return self.validator_for("").validate_structure(summary, summary_type)
     
     def validate_summary(self, summary: str, summary_type: str, original_text: str) -> Tuple[bool, List[str]]:
         """
@@ -154,25 +131,7 @@ class QualityGate:
         Returns:
             Tupla (é_válido, lista_de_erros)
         """
-        errors = []
-        
-        # Validar comprimento
-        is_valid_length, length_error = self.validate_length(summary, summary_type)
-        if not is_valid_length:
-            errors.append(f"Comprimento: {length_error}")
-        
-        # Validar qualidade do conteúdo
-        is_valid_content, content_error = self.validate_content_quality(summary, original_text)
-        if not is_valid_content:
-            errors.append(f"Conteúdo: {content_error}")
-        
-        # Validar estrutura
-        is_valid_structure, structure_error = self.validate_structure(summary, summary_type)
-        if not is_valid_structure:
-            errors.append(f"Estrutura: {structure_error}")
-        
-        is_valid = len(errors) == 0
-        return is_valid, errors
+        return self.validator_for(original_text).validate_summary(summary, summary_type)
     
     def validate_all_summaries(self, summaries: Dict[str, str], original_text: str) -> Dict[str, Tuple[bool, List[str]]]:
         """
@@ -185,18 +144,33 @@ class QualityGate:
         Returns:
             Dicionário com resultados de validação para cada tipo
         """
-        results = {}
-        
-        for summary_type in ["curto", "medio", "longo", "bullets"]:
-            if summary_type in summaries:
-                is_valid, errors = self.validate_summary(
-                    summaries[summary_type],
-                    summary_type,
-                    original_text
-                )
-                results[summary_type] = (is_valid, errors)
-        
-        return results
+        return self.validator_for(original_text).validate_all_summaries(summaries)
+    
+    def validator_for(self, original_text: str) -> "SummaryValidator":
+        """
+        Validador do documento, construído uma vez e reaproveitado.
+        
+        O vocabulário do texto original é O(tamanho do livro); o validador o
+        calcula uma única vez e é reutilizado para o mesmo documento (mesmo
+        hash do texto), p.ex. entre specs e tentativas de regeneração. Os
+        MAX_CACHED_VALIDATORS documentos usados mais recentemente ficam em memória.
+        
+        Args:
+            original_text: Texto original
+        
+        Returns:
+            SummaryValidator do documento
+        """
+        text_hash = hashlib.sha256(original_text.encode("utf-8")).hexdigest()
+        validator = self._validators.get(text_hash)
+        if validator is None:
+            validator = SummaryValidator(self, original_text, text_hash)
+            self._validators[text_hash] = validator
+            while len(self._validators) > MAX_CACHED_VALIDATORS:
+                self._validators.popitem(last=False)
+        else:
+            self._validators.move_to_end(text_hash)
+        return validator
     
     def should_regenerate(self, validation_results: Dict[str, Tuple[bool, List[str]]]) -> bool:
         """
@@ -279,6 +253,183 @@ class QualityGate:
         return (is_valid, errors)
 
 
+class SummaryValidator:
+    """
+    Validador de resumos de um documento.
+    
+    Pré-calcula o vocabulário do texto original (frozenset de palavras-chave)
+    e guarda as medidas de cada resumo já visto, de modo que validar um
+    resumo custa O(tamanho do resumo), e não O(tamanho do livro).
+    """
+    
+    def __init__(self, gate: QualityGate, original_text: str, text_hash: Optional[str] = None):
+        """
+        Inicializa o validador.
+        
+        Args:
+            gate: QualityGate com os critérios (limites de palavras e bullets)
+            original_text: Texto original do documento
+            text_hash: SHA-256 do texto original (chave do validador no QualityGate)
+        """
+        self.gate = gate
+        self.text_hash = text_hash
+        self.source_vocabulary = extract_keywords(original_text)
+        self._features: Dict[str, SummaryFeatures] = {}
+    
+    def features(self, summary: str) -> SummaryFeatures:
+        """
+        Medidas do resumo (calculadas uma vez por texto de resumo).
+        
+        Args:
+            summary: Texto do resumo
+        
+        Returns:
+            SummaryFeatures do resumo
+        """
+        cached = self._features.get(summary)
+        if cached is None:
+            sentences = [s.strip() for s in re.split(r'[.!?]+', summary)]
+            cached = SummaryFeatures(
+                word_count=self.gate.count_words(summary),
+                bullet_count=self.gate.count_bullets(summary),
+                unique_sentences=len(set(s.lower() for s in sentences if len(s) > 20)),
+                complete_sentences=sum(1 for s in sentences if len(s) > 10),
+                keywords=extract_keywords(summary)
+            )
+            if len(self._features) >= MAX_CACHED_FEATURES:
+                self._features.pop(next(iter(self._features)))
+            self._features[summary] = cached
+        return cached
+    
+    def validate_length(self, summary: str, summary_type: str) -> Tuple[bool, Optional[str]]:
+        """
+        Valida o comprimento do resumo.
+        
+        Args:
+            summary: Texto do resumo
+            summary_type: Tipo do resumo (curto, medio, longo, bullets)
+        
+        Returns:
+            Tupla (é_válido, mensagem_erro)
+        """
+        features = self.features(summary)
+        if summary_type == "bullets":
+            count = features.bullet_count
+            min_count = self.gate.min_word_count["bullets"]
+            max_count = self.gate.max_word_count["bullets"]
+            
+            if count < min_count:
+                return False, f"Resumo tem apenas {count} bullets, mínimo esperado: {min_count}"
+            if count > max_count:
+                return False, f"Resumo tem {count} bullets, máximo esperado: {max_count}"
+            return True, None
+        
+        word_count = features.word_count
+        min_words = self.gate.min_word_count.get(summary_type, 0)
+        max_words = self.gate.max_word_count.get(summary_type, float('inf'))
+        
+        if word_count < min_words:
+            return False, f"Resumo tem apenas {word_count} palavras, mínimo esperado: {min_words}"
+        if word_count > max_words:
+            return False, f"Resumo tem {word_count} palavras, máximo esperado: {max_words}"
+        return True, None
+    
+    def validate_content_quality(self, summary: str) -> Tuple[bool, Optional[str]]:
+        """
+        Valida a qualidade do conteúdo do resumo contra o vocabulário do documento.
+        
+        Args:
+            summary: Texto do resumo
+        
+        Returns:
+            Tupla (é_válido, mensagem_erro)
+        """
+        # Verificar se o resumo não está vazio
+        if not summary or len(summary.strip()) < 50:
+            return False, "Resumo muito curto ou vazio"
+        
+        features = self.features(summary)
+        
+        # Verificar se o resumo não é apenas repetição de uma frase
+        if features.unique_sentences < 2:
+            return False, "Resumo parece ser repetitivo ou muito simples"
+        
+        # Verificar se há palavras-chave do texto original no resumo
+        # (validação básica de relevância; iterar o resumo, não o livro)
+        common_words = sum(1 for word in features.keywords if word in self.source_vocabulary)
+        if common_words < MIN_COMMON_KEYWORDS:
+            return False, "Resumo não parece estar relacionado ao texto original (poucas palavras em comum)"
+        
+        return True, None
+    
+    def validate_structure(self, summary: str, summary_type: str) -> Tuple[bool, Optional[str]]:
+        """
+        Valida a estrutura do resumo.
+        
+        Args:
+            summary: Texto do resumo
+            summary_type: Tipo do resumo
+        
+        Returns:
+            Tupla (é_válido, mensagem_erro)
+        """
+        features = self.features(summary)
+        if summary_type == "bullets" and features.bullet_count == 0:
+            return False, "Resumo de bullets não contém bullets formatados"
+        
+        if features.complete_sentences < 2:
+            return False, "Resumo não contém sentenças completas suficientes"
+        
+        return True, None
+    
+    def validate_summary(self, summary: str, summary_type: str) -> Tuple[bool, List[str]]:
+        """
+        Valida um resumo completo usando todos os critérios.
+        
+        Args:
+            summary: Texto do resumo
+            summary_type: Tipo do resumo (curto, medio, longo, bullets)
+        
+        Returns:
+            Tupla (é_válido, lista_de_erros)
+        """
+        errors = []
+        
+        # Validar comprimento
+        is_valid_length, length_error = self.validate_length(summary, summary_type)
+        if not is_valid_length:
+            errors.append(f"Comprimento: {length_error}")
+        
+        # Validar qualidade do conteúdo
+        is_valid_content, content_error = self.validate_content_quality(summary)
+        if not is_valid_content:
+            errors.append(f"Conteúdo: {content_error}")
+        
+        # Validar estrutura
+        is_valid_structure, structure_error = self.validate_structure(summary, summary_type)
+        if not is_valid_structure:
+            errors.append(f"Estrutura: {structure_error}")
+        
+        is_valid = len(errors) == 0
+        return is_valid, errors
+    
+    def validate_all_summaries(self, summaries: Dict[str, str]) -> Dict[str, Tuple[bool, List[str]]]:
+        """
+        Valida todos os tipos de resumo do documento.
+        
+        Args:
+            summaries: Dicionário com todos os resumos
+        
+        Returns:
+            Dicionário com resultados de validação para cada tipo
+        """
+        return {
+            summary_type: self.validate_summary(summaries[summary_type], summary_type)
+            for summary_type in SUMMARY_TYPES
+            if summary_type in summaries
+        }
+
+
 def format_validation_report(validation_results: Dict[str, Tuple[bool, List[str]]]) -> str:
     """
     Formata relatório de validação para exibição.
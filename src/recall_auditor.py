@@ -6,7 +6,7 @@ usando regex e validações estruturais sem depender de LLM.
 """
 
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Tuple
 import logging
 
@@ -16,6 +16,9 @@ logger = logging.getLogger(__name__)
 # Captura também chunks vazios (para detectar anti-fraude)
 MARKER_PATTERN = r'\[\[RS:cap(\d+):([a-f0-9]{6})\|(chunks|src):([^\]]*)\]\]'
 
+# Tamanho a partir do qual um "[[" sem fechamento é considerado marcador malformado
+MAX_MARKER_CHARS = 200
+
 
 @dataclass
 class AuditResult:
@@ -25,10 +28,12 @@ class AuditResult:
     invalid_chunks: List[str]    # marcadores com chunks inválidos (formato: "item_id:chunk1,chunk2")
     invented_markers: List[str]  # marcadores com item_id inexistente
     errors: List[str]            # Mensagens de erro detalhadas
+    malformed_markers: List[str] = field(default_factory=list)  # "[[RS..." fora do formato
 
     def __post_init__(self):
         """Garantir que passed é False se houver erros."""
-        if self.missing_markers or self.invalid_chunks or self.invented_markers or self.errors:
+        if (self.missing_markers or self.invalid_chunks or self.invented_markers
+                or self.malformed_markers or self.errors):
             self.passed = False
 
 
@@ -64,6 +69,8 @@ class RecallAuditor:
         2. item_id existe: Cada item_id do marcador existe em recall_set['critical_items']
         3. Mínimo 1 chunk: Cada marcador tem pelo menos 1 chunk referenciado
         4. Chunks válidos: Chunks no marcador pertencem a source_chunks do item no Recall Set
+        5. Marcadores bem formados: nenhum "[[RS..." fora do formato ou sem
+           fechamento (mesmo critério do IncrementalRecallAuditor)
         
         Args:
             summary_text: Texto do resumo a auditar
@@ -86,6 +93,8 @@ class RecallAuditor:
         invalid_chunks: List[str] = []
         invented_markers: List[str] = []
         errors: List[str] = []
+        malformed_markers = self.find_malformed_markers(summary_text)
+        errors.extend(f"Marcador malformado: {candidate}" for candidate in malformed_markers)
         
         # Extrair critical_items do recall_set
         critical_items = recall_set.get('critical_items', [])
@@ -96,7 +105,8 @@ class RecallAuditor:
                 missing_markers=[],
                 invalid_chunks=[],
                 invented_markers=[],
-                errors=errors
+                errors=errors,
+                malformed_markers=malformed_markers
             )
         
         # Criar dicionário de item_id -> item para lookup rápido
@@ -117,50 +127,18 @@ class RecallAuditor:
             if len(match) != 4:
                 errors.append(f"Marcador inválido encontrado: {match}")
                 continue
-                
-            cap_num_str, item_hash, ref_type, chunks_str = match
-            item_id = f"RS:cap{cap_num_str}:{item_hash}"
-            
-            # Validar número do capítulo
-            if cap_num_str != chapter_number:
-                errors.append(f"Marcador {item_id} aponta para capítulo {cap_num_str}, esperado {chapter_number}")
             
-            # Verificar se item_id existe no Recall Set
-            if item_id not in items_by_id:
+            item_id, invented, invalid_entry, marker_errors = self.check_marker(
+                match, items_by_id, chapter_number
+            )
+            errors.extend(marker_errors)
+            if invented:
                 invented_markers.append(item_id)
-                errors.append(f"Marcador inventado: {item_id} não existe no Recall Set")
                 continue
             
             found_item_ids.add(item_id)
-            item = items_by_id[item_id]
-            source_chunks = item.get('source_chunks', [])
-            
-            # Validar chunks no marcador
-            if not chunks_str or not chunks_str.strip():
-                invalid_chunks.append(f"{item_id}:")
-                errors.append(f"Marcador {item_id} sem chunks (anti-fraude)")
-                continue
-            
-            # Parsear chunks do marcador
-            try:
-                chunks = [int(c.strip()) for c in chunks_str.split(',') if c.strip().isdigit()]
-            except (ValueError, AttributeError):
-                chunks = []
-            
-            # Validar que tem pelo menos 1 chunk
-            if len(chunks) == 0:
-                invalid_chunks.append(f"{item_id}:")
-                errors.append(f"Marcador {item_id} não tem chunks válidos (anti-fraude)")
-                continue
-            
-            # Validar que chunks estão em source_chunks
-            invalid_chunk_list = [c for c in chunks if c not in source_chunks]
-            if invalid_chunk_list:
-                invalid_chunks.append(f"{item_id}:{','.join(map(str, invalid_chunk_list))}")
-                errors.append(
-                    f"Marcador {item_id} aponta para chunks {invalid_chunk_list} "
-                    f"que não estão em source_chunks {source_chunks}"
-                )
+            if invalid_entry is not None:
+                invalid_chunks.append(invalid_entry)
         
         # Verificar se todos os critical_items têm marcador
         for item in critical_items:
@@ -175,7 +153,8 @@ class RecallAuditor:
             missing_markers=missing_markers,
             invalid_chunks=invalid_chunks,
             invented_markers=invented_markers,
-            errors=errors
+            errors=errors,
+            malformed_markers=malformed_markers
         )
         
         logger.debug(f"Auditoria concluída: passed={result.passed}, "
@@ -183,3 +162,209 @@ class RecallAuditor:
                     f"invented={len(invented_markers)}")
         
         return result
+    
+    def find_malformed_markers(self, summary_text: str) -> List[str]:
+        """
+        Trechos "[[RS..." que não formam um marcador válido.
+        
+        Cada "]]" fecha o "[[" mais próximo antes dele (como no
+        IncrementalRecallAuditor); um "[[RS" sem fechamento no fim do texto
+        (p.ex. resumo truncado) também é malformado.
+        
+        Args:
+            summary_text: Texto do resumo
+            
+        Returns:
+            Trechos malformados, na ordem em que aparecem
+        """
+        malformed: List[str] = []
+        pending = summary_text
+        while True:
+            close = pending.find(']]')
+            if close < 0:
+                break
+            start = pending.rfind('[[', 0, close)
+            if start >= 0:
+                candidate = pending[start:close + 2]
+                if candidate.startswith('[[RS') and self.compiled_pattern.fullmatch(candidate) is None:
+                    malformed.append(candidate)
+            pending = pending[close + 2:]
+        
+        start = pending.rfind('[[')
+        if start >= 0 and pending.startswith('[[RS', start):
+            malformed.append(pending[start:start + MAX_MARKER_CHARS])
+        return malformed
+    
+    def check_marker(
+        self,
+        match: Tuple[str, str, str, str],
+        items_by_id: Dict[str, Dict],
+        chapter_number: str
+    ) -> Tuple[str, bool, Optional[str], List[str]]:
+        """
+        Valida um marcador encontrado no resumo.
+        
+        Args:
+            match: Grupos do MARKER_PATTERN (capítulo, hash, tipo, chunks)
+            items_by_id: Itens críticos do Recall Set por item_id
+            chapter_number: Número do capítulo esperado
+            
+        Returns:
+            Tupla (item_id, inventado?, entrada de invalid_chunks ou None, erros)
+        """
+        errors: List[str] = []
+        cap_num_str, item_hash, ref_type, chunks_str = match
+        item_id = f"RS:cap{cap_num_str}:{item_hash}"
+        
+        # Validar número do capítulo
+        if cap_num_str != chapter_number:
+            errors.append(f"Marcador {item_id} aponta para capítulo {cap_num_str}, esperado {chapter_number}")
+        
+        # Verificar se item_id existe no Recall Set
+        if item_id not in items_by_id:
+            errors.append(f"Marcador inventado: {item_id} não existe no Recall Set")
+            return item_id, True, None, errors
+        
+        source_chunks = items_by_id[item_id].get('source_chunks', [])
+        
+        # Validar chunks no marcador
+        if not chunks_str or not chunks_str.strip():
+            errors.append(f"Marcador {item_id} sem chunks (anti-fraude)")
+            return item_id, False, f"{item_id}:", errors
+        
+        # Parsear chunks do marcador
+        try:
+            chunks = [int(c.strip()) for c in chunks_str.split(',') if c.strip().isdigit()]
+        except (ValueError, AttributeError):
+            chunks = []
+        
+        # Validar que tem pelo menos 1 chunk
+        if len(chunks) == 0:
+            errors.append(f"Marcador {item_id} não tem chunks válidos (anti-fraude)")
+            return item_id, False, f"{item_id}:", errors
+        
+        # Validar que chunks estão em source_chunks
+        invalid_chunk_list = [c for c in chunks if c not in source_chunks]
+        if invalid_chunk_list:
+            errors.append(
+                f"Marcador {item_id} aponta para chunks {invalid_chunk_list} "
+                f"que não estão em source_chunks {source_chunks}"
+            )
+            return item_id, False, f"{item_id}:{','.join(map(str, invalid_chunk_list))}", errors
+        
+        return item_id, False, None, errors
+
+
+class IncrementalRecallAuditor:
+    """
+    Auditoria incremental de um resumo recebido em streaming.
+    
+    Recebe o texto em pedaços (feed) e valida cada marcador [[RS:...]] assim
+    que ele fecha, acompanhando quais itens críticos já apareceram. Marcadores
+    inventados, com chunks inválidos ou malformados tornam a geração
+    condenada (a auditoria final, que também reprova marcadores malformados,
+    vai reprovar), o que permite abortá-la cedo. A auditoria final continua
+    sendo RecallAuditor.audit_summary (ver audit()).
+    """
+    
+    def __init__(self, recall_set: Dict, chapter_number: str, marker_pattern: str = MARKER_PATTERN):
+        """
+        Inicializa o auditor incremental.
+        
+        Args:
+            recall_set: Recall Set no formato de RecallAuditor.audit_summary
+            chapter_number: Número do capítulo
+            marker_pattern: Padrão regex dos marcadores
+        """
+        self.auditor = RecallAuditor(marker_pattern)
+        self.recall_set = recall_set
+        self.chapter_number = chapter_number
+        self.items_by_id: Dict[str, Dict] = {
+            item['item_id']: item for item in recall_set.get('critical_items', []) if item.get('item_id')
+        }
+        self.found_item_ids: set = set()
+        self.invented_markers: List[str] = []
+        self.invalid_chunks: List[str] = []
+        self.malformed_markers: List[str] = []
+        self.errors: List[str] = []
+        self._parts: List[str] = []
+        self._pending = ""  # Texto ainda não varrido (pode conter um marcador aberto)
+    
+    @property
+    def text(self) -> str:
+        """Texto recebido até agora."""
+        return ''.join(self._parts)
+    
+    @property
+    def missing_markers(self) -> List[str]:
+        """Itens críticos que ainda não apareceram."""
+        return [item_id for item_id in self.items_by_id if item_id not in self.found_item_ids]
+    
+    @property
+    def should_abort(self) -> bool:
+        """Indica se a geração já está condenada a reprovar na auditoria."""
+        return bool(self.errors)
+    
+    def feed(self, delta: str) -> None:
+        """
+        Processa um novo pedaço do texto.
+        
+        Args:
+            delta: Texto recebido desde a última chamada
+        """
+        if not delta:
+            return
+        self._parts.append(delta)
+        pending = self._pending + delta
+        while True:
+            close = pending.find(']]')
+            if close < 0:
+                break
+            start = pending.rfind('[[', 0, close)
+            if start >= 0:
+                self._check_candidate(pending[start:close + 2])
+            pending = pending[close + 2:]
+        
+        # Guardar só o possível início de marcador ainda aberto
+        start = pending.rfind('[[')
+        if start < 0:
+            pending = pending[-1:] if pending.endswith('[') else ""
+        elif len(pending) - start > MAX_MARKER_CHARS:
+            if pending.startswith('[[RS', start):
+                self._record_malformed(pending[start:start + MAX_MARKER_CHARS])
+            pending = ""
+        else:
+            pending = pending[start:]
+        self._pending = pending
+    
+    def _check_candidate(self, candidate: str) -> None:
+        """Valida um trecho [[...]] completo."""
+        match = self.auditor.compiled_pattern.fullmatch(candidate)
+        if match is None:
+            if candidate.startswith('[[RS'):
+                self._record_malformed(candidate)
+            return
+        item_id, invented, invalid_entry, marker_errors = self.auditor.check_marker(
+            match.groups(), self.items_by_id, self.chapter_number
+        )
+        self.errors.extend(marker_errors)
+        if invented:
+            self.invented_markers.append(item_id)
+            return
+        self.found_item_ids.add(item_id)
+        if invalid_entry is not None:
+            self.invalid_chunks.append(invalid_entry)
+    
+    def _record_malformed(self, candidate: str) -> None:
+        """Registra um marcador fora do formato [[RS:capN:hash|chunks:...]]."""
+        self.malformed_markers.append(candidate)
+        self.errors.append(f"Marcador malformado: {candidate}")
+    
+    def audit(self) -> AuditResult:
+        """
+        Auditoria completa do texto recebido (mesmo resultado de audit_summary).
+        
+        Returns:
+            AuditResult do texto acumulado
+        """
+        return self.auditor.audit_summary(self.text, self.recall_set, self.chapter_number)
@@ -0,0 +1,88 @@
+"""
+Política de reparo de resumos reprovados na auditoria.
+
+Quando um resumo deixa de fora só 1-2 dos itens críticos, regenerar o
+resumo inteiro (300-500 palavras, trecho do capítulo no prompt, até 2000
+tokens de saída) é o caminho mais caro para corrigir pouca coisa. A
+RepairPolicy escolhe o reparo mais barato compatível com o resultado da
+auditoria:
+- insert: uma frase por item faltante, inserida no corpo do resumo
+- addendum: bullets com os itens faltantes em "## Cobertura (itens críticos)"
+- regenerate: resumo completo novo (marcadores inventados/malformados/chunks inválidos
+  ou cobertura baixa demais para remendar)
+"""
+import os
+from dataclasses import dataclass
+
+REPAIR_REGENERATE = "regenerate"
+REPAIR_INSERT = "insert"
+REPAIR_ADDENDUM = "addendum"
+
+# Liga a política em _audit_and_regenerate (false = só regenerações completas)
+REPAIR_POLICY_ENABLED = os.getenv("REPAIR_POLICY_ENABLED", "true").lower() == "true"
+
+# Máximo de itens faltantes reparados por inserção de frases
+DEFAULT_MAX_MISSING_FOR_INSERT = int(os.getenv("REPAIR_MAX_MISSING_FOR_INSERT", "2"))
+
+# Fração máxima de itens faltantes reparada por addendum (acima disso, regenera)
+DEFAULT_MAX_MISSING_RATIO_FOR_ADDENDUM = float(os.getenv("REPAIR_MAX_MISSING_RATIO_FOR_ADDENDUM", "0.5"))
+
+
+@dataclass
+class RepairDecision:
+    """Reparo escolhido para um resumo reprovado."""
+    action: str  # REPAIR_INSERT | REPAIR_ADDENDUM | REPAIR_REGENERATE
+    reason: str
+
+
+class RepairPolicy:
+    """
+    Escolhe o reparo mais barato para um resultado de auditoria.
+    """
+
+    def __init__(
+        self,
+        max_missing_for_insert: int = DEFAULT_MAX_MISSING_FOR_INSERT,
+        max_missing_ratio_for_addendum: float = DEFAULT_MAX_MISSING_RATIO_FOR_ADDENDUM
+    ):
+        """
+        Inicializa a política.
+
+        Args:
+            max_missing_for_insert: Até quantos itens faltantes usar inserção de frases
+            max_missing_ratio_for_addendum: Fração de itens faltantes até a qual usar addendum
+        """
+        self.max_missing_for_insert = max_missing_for_insert
+        self.max_missing_ratio_for_addendum = max_missing_ratio_for_addendum
+
+    def decide(self, audit_result, total_critical: int) -> RepairDecision:
+        """
+        Decide como reparar um resumo reprovado.
+
+        Args:
+            audit_result: AuditResult do resumo
+            total_critical: Total de itens críticos do Recall Set
+
+        Returns:
+            RepairDecision com a ação e o motivo
+        """
+        missing = len(audit_result.missing_markers)
+        if (audit_result.invented_markers or audit_result.invalid_chunks
+                or audit_result.malformed_markers):
+            return RepairDecision(
+                REPAIR_REGENERATE,
+                "marcadores inventados, malformados ou com chunks inválidos: remendo não remove o erro"
+            )
+        if missing == 0:
+            return RepairDecision(REPAIR_REGENERATE, "reprovado sem marcadores faltando")
+        if missing <= self.max_missing_for_insert:
+            return RepairDecision(
+                REPAIR_INSERT, f"{missing}/{total_critical} itens faltando: inserir frases"
+            )
+        if total_critical and missing / total_critical <= self.max_missing_ratio_for_addendum:
+            return RepairDecision(
+                REPAIR_ADDENDUM, f"{missing}/{total_critical} itens faltando: addendum"
+            )
+        return RepairDecision(
+            REPAIR_REGENERATE, f"{missing}/{total_critical} itens faltando: cobertura baixa demais"
+        )
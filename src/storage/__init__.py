@@ -7,10 +7,16 @@ from .checkpoint_manager import (
     CheckpointManager,
     CheckpointData
 )
+from .conversion_cache import (
+    ConversionCache,
+    get_conversion_cache
+)
 
 __all__ = [
     "SummaryStorageManager",
     "get_storage_manager",
     "CheckpointManager",
-    "CheckpointData"
+    "CheckpointData",
+    "ConversionCache",
+    "get_conversion_cache"
 ]
@@ -0,0 +1,165 @@
+"""
+Cache de documentos convertidos (PDF → Markdown/texto).
+
+O mesmo PDF costuma ser enviado várias vezes (retentativas, outros usuários
+processando o mesmo livro). Este cache guarda a saída da conversão
+comprimida em disco, indexada pelo SHA-256 dos bytes do arquivo, pelo
+conversor (nome/versão) e pelo modo (Markdown ou texto puro), com limite de
+tamanho e expulsão LRU (pelo mtime, atualizado a cada acerto).
+
+Falhas do cache nunca interrompem o processamento: são logadas e tratadas
+como cache miss.
+"""
+import gzip
+import hashlib
+import logging
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.getenv("CONVERSION_CACHE_DIR", "/app/volumes/conversions")
+DEFAULT_MAX_BYTES = int(os.getenv("CONVERSION_CACHE_MAX_MB", "1024")) * 1024 * 1024
+CONVERSION_CACHE_ENABLED = os.getenv("CONVERSION_CACHE_ENABLED", "true").lower() == "true"
+
+_HASH_BLOCK_SIZE = 1024 * 1024
+
+
+class ConversionCache:
+    """
+    Cache em disco de conversões de documentos.
+
+    Cada entrada é um arquivo gzip `{sha256}_{conversor}_{modo}.txt.gz`.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Inicializa o cache.
+
+        Args:
+            cache_dir: Diretório onde as conversões serão armazenadas
+            max_bytes: Tamanho máximo do cache em bytes (comprimido)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def hash_bytes(data: bytes) -> str:
+        """Calcula o SHA-256 dos bytes enviados."""
+        return hashlib.sha256(data).hexdigest()
+
+    @staticmethod
+    def hash_file(file_path: str) -> str:
+        """Calcula o SHA-256 de um arquivo lendo em blocos."""
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(_HASH_BLOCK_SIZE), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _entry_path(self, file_hash: str, converter: str, prefer_markdown: bool) -> Path:
+        """Caminho da entrada para (hash, conversor, modo)."""
+        safe_converter = re.sub(r"[^A-Za-z0-9.-]", "_", converter)
+        mode = "md" if prefer_markdown else "txt"
+        return self.cache_dir / f"{file_hash}_{safe_converter}_{mode}.txt.gz"
+
+    def get(self, file_hash: str, converter: str, prefer_markdown: bool) -> Optional[str]:
+        """
+        Busca conversão armazenada.
+
+        Args:
+            file_hash: SHA-256 do arquivo original
+            converter: Nome/versão do conversor (ver document_reader.get_converter_signature)
+            prefer_markdown: Modo de conversão
+
+        Returns:
+            Texto convertido ou None (miss ou erro)
+        """
+        path = self._entry_path(file_hash, converter, prefer_markdown)
+        if not path.exists():
+            return None
+        try:
+            text = gzip.decompress(path.read_bytes()).decode("utf-8")
+            os.utime(path)  # LRU: acerto atualiza o mtime
+            logger.info(f"✅ Conversão encontrada no cache: {path.name}")
+            return text
+        except (OSError, EOFError, UnicodeDecodeError) as e:
+            logger.warning(f"⚠️ Entrada de cache de conversão inválida {path.name}: {e}")
+            return None
+
+    def put(self, file_hash: str, converter: str, prefer_markdown: bool, text: str) -> Optional[str]:
+        """
+        Armazena conversão atomicamente (arquivo temporário + renomeação).
+
+        O arquivo temporário tem nome único, de modo que gravações
+        concorrentes da mesma entrada não interferem entre si.
+
+        Args:
+            file_hash: SHA-256 do arquivo original
+            converter: Nome/versão do conversor
+            prefer_markdown: Modo de conversão
+            text: Texto convertido
+
+        Returns:
+            Caminho da entrada salva ou None em caso de erro
+        """
+        path = self._entry_path(file_hash, converter, prefer_markdown)
+        temp_path: Optional[Path] = None
+        try:
+            with tempfile.NamedTemporaryFile(
+                dir=self.cache_dir, prefix=f"{path.name}.", suffix=".tmp", delete=False
+            ) as temp_file:
+                temp_path = Path(temp_file.name)
+                temp_file.write(gzip.compress(text.encode("utf-8")))
+            temp_path.replace(path)
+        except OSError as e:
+            if temp_path is not None and temp_path.exists():
+                temp_path.unlink()
+            logger.warning(f"⚠️ Erro ao salvar conversão no cache: {e}")
+            return None
+        self._enforce_size_limit()
+        return str(path)
+
+    def _enforce_size_limit(self) -> None:
+        """Remove as entradas menos usadas até o cache caber em max_bytes."""
+        try:
+            entries = [(p, p.stat()) for p in self.cache_dir.glob("*.txt.gz")]
+        except OSError as e:
+            logger.warning(f"⚠️ Erro ao listar cache de conversões: {e}")
+            return
+        total = sum(stat.st_size for _, stat in entries)
+        for path, stat in sorted(entries, key=lambda entry: entry[1].st_mtime):
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+                total -= stat.st_size
+            except OSError:
+                continue
+
+
+# Instância global do cache
+_conversion_cache: Optional[ConversionCache] = None
+
+
+def get_conversion_cache() -> Optional[ConversionCache]:
+    """
+    Retorna a instância global do cache de conversões.
+
+    Returns:
+        Cache ou None se desabilitado (CONVERSION_CACHE_ENABLED=false) ou indisponível
+    """
+    global _conversion_cache
+    if not CONVERSION_CACHE_ENABLED:
+        return None
+    if _conversion_cache is None:
+        try:
+            _conversion_cache = ConversionCache()
+        except OSError as e:
+            logger.warning(f"⚠️ Cache de conversões indisponível: {e}")
+            return None
+    return _conversion_cache
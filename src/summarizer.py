@@ -25,17 +25,22 @@ import hashlib
 import logging
 from dataclasses import dataclass
 from enum import Enum
-from typing import Dict, List, Tuple, Optional, Callable, Protocol
+from typing import AsyncIterator, Dict, List, Tuple, Optional, Callable, Protocol
 from functools import lru_cache
 
 from openai import AsyncOpenAI
 from dotenv import load_dotenv
 
 from tracker import TextTracker
+from text_index import TextIndex
 from quality_gate import QualityGate, format_validation_report
 from chapter_detector import ChapterDetector, Chapter
 from chapter_summarizer import ChapterSummarizer, StructuredSummary
 from markdown_parser import MarkdownParser
+from llm_rate_limiter import get_rate_limiter, estimate_tokens
+from llm_cache import get_llm_cache, is_cacheable_temperature
+from token_budget import TokenBudget, get_token_budget
+from tree_reducer import DEFAULT_TREE_FAN_IN, TreeReducer
 
 load_dotenv()
 
@@ -81,7 +86,7 @@ class ChunkProcessor:
         self.word_target = max(300, word_target)
         self.overlap_words = max(0, min(overlap_words, self.word_target // 3))
 
-    def chunk_text(self, text: str) -> List[str]:
+    def chunk_text(self, text: str, text_index: Optional[TextIndex] = None) -> List[str]:
         """
         Divide texto em chunks por palavras com overlap para manter contexto.
 
@@ -92,10 +97,15 @@ class ChunkProcessor:
 
         Args:
             text: Texto completo a ser dividido
+            text_index: Índice de palavras de `text` (opcional); evita re-tokenizar
+                e devolve fatias do texto original (espaços e quebras preservados)
 
         Returns:
             Lista de chunks de texto
         """
+        if text_index is not None:
+            return [text[start:end] for start, end in self.chunk_spans(text, text_index)]
+
         words = text.split()
         if len(words) <= self.word_target:
             return [text]
@@ -117,6 +127,43 @@ class ChunkProcessor:
 
         return chunks
 
+    def chunk_ranges(self, text_index: TextIndex) -> List[Tuple[int, int]]:
+        """
+        Faixas de palavras [início, fim) dos chunks, com a mesma regra de overlap de chunk_text.
+
+        Args:
+            text_index: Índice de palavras do texto
+
+        Returns:
+            Lista de faixas (início, fim) em índices de palavra
+        """
+        n = text_index.word_count
+        step = max(1, self.word_target - self.overlap_words)
+        ranges = text_index.word_chunks(self.word_target, step)
+        # chunk_text para no primeiro chunk que alcança o fim do texto
+        for i, (_, end) in enumerate(ranges):
+            if end == n:
+                return ranges[:i + 1]
+        return ranges
+
+    def chunk_spans(self, text: str, text_index: TextIndex) -> List[Tuple[int, int]]:
+        """
+        Offsets de caracteres (início, fim) de cada chunk em `text`.
+
+        Os chunks ficam como faixas do texto original e só viram string
+        quando enviados ao LLM.
+
+        Args:
+            text: Texto completo
+            text_index: Índice de palavras de `text`
+
+        Returns:
+            Lista de faixas (início, fim) em offsets de caracteres
+        """
+        if text_index.word_count <= self.word_target:
+            return [(0, len(text))]
+        return [text_index.char_span(start, end) for start, end in self.chunk_ranges(text_index)]
+
     @staticmethod
     @lru_cache(maxsize=128)
     def chunk_text_cached(text_hash: str, text: str, word_target: int, overlap: int) -> Tuple[str, ...]:
@@ -134,17 +181,19 @@ class ChunkProcessor:
 
 
 class AsyncOpenAIClient:
-    """Cliente OpenAI assíncrono com retry e backoff."""
+    """Cliente OpenAI assíncrono com retry, backoff e rate limit global compartilhado."""
 
     DEFAULT_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
     DEFAULT_TEMPERATURE = 0.3
     DEFAULT_TIMEOUT = 60.0
+    MAX_RATE_LIMIT_RETRIES = 5
 
     def __init__(
         self,
         api_key: Optional[str] = None,
         model: Optional[str] = None,
-        timeout: float = DEFAULT_TIMEOUT
+        timeout: float = DEFAULT_TIMEOUT,
+        client: Optional[AsyncOpenAI] = None
     ):
         """
         Inicializa cliente OpenAI assíncrono.
@@ -153,6 +202,8 @@ class AsyncOpenAIClient:
             api_key: Chave de API (usa OPENAI_API_KEY se None)
             model: Modelo a usar (padrão: gpt-4o-mini)
             timeout: Timeout para requisições em segundos
+            client: AsyncOpenAI já configurado (ex.: pool HTTP compartilhado do
+                llm_client_registry); se None, cria um novo
 
         Raises:
             ValueError: Se API key não for encontrada
@@ -164,7 +215,8 @@ class AsyncOpenAIClient:
                 "Configure no arquivo .env ou passe como argumento."
             )
 
-        self.client = AsyncOpenAI(api_key=self.api_key)
+        # Retries ficam a cargo de complete() para que todo 429 passe pelo limitador global
+        self.client = client or AsyncOpenAI(api_key=self.api_key, max_retries=0)
         self.model = model or self.DEFAULT_MODEL
         self.timeout = timeout
 
@@ -175,18 +227,24 @@ class AsyncOpenAIClient:
         max_output_tokens: int,
         temperature: float = DEFAULT_TEMPERATURE,
         retries: int = 3,
-        backoff_base: float = 1.5
+        backoff_base: float = 1.5,
+        use_cache: bool = True,
+        cache_salt: Optional[str] = None,
+        response_format: Optional[Dict] = None
     ) -> str:
         """
-        Executa completion com retry automático e backoff exponencial.
+        Executa completion com cache persistente, retry automático e backoff exponencial.
 
         Args:
             system_message: Mensagem de sistema
             user_message: Mensagem do usuário
             max_output_tokens: Máximo de tokens na resposta
-            temperature: Temperatura (0-1)
+            temperature: Temperatura (0-1); acima de LLM_CACHE_MAX_TEMPERATURE não usa cache
             retries: Número de tentativas
             backoff_base: Base para backoff exponencial
+            use_cache: Se False, ignora o cache (leitura e escrita)
+            cache_salt: Sal opcional da chave de cache (ex.: número da tentativa)
+            response_format: Formato de saída da API (ex.: {"type": "json_object"} para JSON mode)
 
         Returns:
             Resposta do modelo
@@ -194,24 +252,190 @@ class AsyncOpenAIClient:
         Raises:
             RuntimeError: Se falhar após todas as tentativas
         """
-        last_err: Optional[Exception] = None
+        cache, cache_key = self._cache_entry(
+            system_message, user_message, max_output_tokens, temperature, use_cache, cache_salt,
+            response_format
+        )
+        if cache is not None:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        response = await self._complete_with_retries(
+            system_message, user_message, max_output_tokens, temperature, retries, backoff_base,
+            response_format
+        )
+        if cache is not None:
+            cache.set(cache_key, response)
+        return response
+
+    async def stream_complete(
+        self,
+        system_message: str,
+        user_message: str,
+        max_output_tokens: int,
+        temperature: float = DEFAULT_TEMPERATURE,
+        retries: int = 3,
+        backoff_base: float = 1.5,
+        use_cache: bool = True,
+        cache_salt: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Executa completion em streaming, entregando o texto à medida que chega.
+
+        Usa a mesma chave de cache de complete(): um acerto é entregue de uma
+        vez e uma resposta completa é gravada ao fim. Falhas antes do primeiro
+        trecho seguem o retry/backoff de complete(); no meio do stream, o erro
+        é propagado. Se o consumidor parar de iterar (aclose), a requisição é
+        encerrada e nada é gravado no cache. A vaga in-flight do limitador
+        global é ocupada só até a resposta começar a chegar.
+
+        Args:
+            system_message: Mensagem de sistema
+            user_message: Mensagem do usuário
+            max_output_tokens: Máximo de tokens na resposta
+            temperature: Temperatura (0-1)
+            retries: Número de tentativas
+            backoff_base: Base para backoff exponencial
+            use_cache: Se False, ignora o cache (leitura e escrita)
+            cache_salt: Sal opcional da chave de cache
+
+        Yields:
+            Trechos de texto da resposta
 
-        for attempt in range(1, retries + 1):
+        Raises:
+            RuntimeError: Se falhar após todas as tentativas
+        """
+        cache, cache_key = self._cache_entry(
+            system_message, user_message, max_output_tokens, temperature, use_cache, cache_salt
+        )
+        if cache is not None:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                yield cached
+                return
+
+        limiter = get_rate_limiter()
+        estimated_tokens = estimate_tokens(system_message, user_message, max_output_tokens)
+        parts: List[str] = []
+        attempt = 0
+        rate_limited = 0
+
+        while True:
             try:
-                response = await self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {"role": "system", "content": system_message},
-                        {"role": "user", "content": user_message}
-                    ],
-                    temperature=temperature,
-                    max_tokens=max_output_tokens,
-                    timeout=self.timeout
+                # A vaga in-flight cobre a abertura da requisição; o corpo do
+                # stream é lido (e entregue ao consumidor) fora dela
+                async with limiter.slot(estimated_tokens):
+                    stream = await self.client.chat.completions.create(
+                        model=self.model,
+                        messages=[
+                            {"role": "system", "content": system_message},
+                            {"role": "user", "content": user_message}
+                        ],
+                        temperature=temperature,
+                        max_tokens=max_output_tokens,
+                        timeout=self.timeout,
+                        stream=True
+                    )
+                try:
+                    async for event in stream:
+                        delta = event.choices[0].delta.content if event.choices else None
+                        if delta:
+                            parts.append(delta)
+                            yield delta
+                finally:
+                    await stream.close()
+                limiter.record_success()
+                break
+
+            except Exception as e:
+                if parts:
+                    raise
+                if limiter.record_failure(e) is not None and rate_limited < self.MAX_RATE_LIMIT_RETRIES:
+                    rate_limited += 1
+                    continue
+
+                attempt += 1
+                if attempt == retries:
+                    raise RuntimeError(f"Erro ao chamar OpenAI após {retries} tentativas: {e}") from e
+
+                sleep_s = backoff_base ** attempt
+                logger.warning(
+                    "Falha no LLM em streaming (tentativa %s/%s). Aguardando %.1fs. Erro: %s",
+                    attempt, retries, sleep_s, e
                 )
+                await asyncio.sleep(sleep_s)
+
+        if cache is not None:
+            cache.set(cache_key, ''.join(parts).strip())
+
+    def _cache_entry(
+        self,
+        system_message: str,
+        user_message: str,
+        max_output_tokens: int,
+        temperature: float,
+        use_cache: bool,
+        cache_salt: Optional[str],
+        response_format: Optional[Dict] = None
+    ) -> Tuple[Optional[object], Optional[str]]:
+        """Cache e chave da requisição (None, None se a requisição não usa cache)."""
+        if not use_cache or not is_cacheable_temperature(temperature):
+            return None, None
+        cache = get_llm_cache()
+        if cache is None:
+            return None, None
+        salt = cache_salt
+        if response_format:
+            salt = f"{cache_salt}|format:{response_format.get('type')}"
+        return cache, cache.make_key(
+            self.model, system_message, user_message, temperature, max_output_tokens, salt
+        )
+
+    async def _complete_with_retries(
+        self,
+        system_message: str,
+        user_message: str,
+        max_output_tokens: int,
+        temperature: float,
+        retries: int,
+        backoff_base: float,
+        response_format: Optional[Dict] = None
+    ) -> str:
+        """Chama a API respeitando o rate limit global, com retry e backoff."""
+        last_err: Optional[Exception] = None
+        limiter = get_rate_limiter()
+        estimated_tokens = estimate_tokens(system_message, user_message, max_output_tokens)
+        attempt = 0
+        rate_limited = 0
+        extra_params = {"response_format": response_format} if response_format else {}
+
+        while attempt < retries:
+            try:
+                async with limiter.slot(estimated_tokens):
+                    response = await self.client.chat.completions.create(
+                        model=self.model,
+                        messages=[
+                            {"role": "system", "content": system_message},
+                            {"role": "user", "content": user_message}
+                        ],
+                        temperature=temperature,
+                        max_tokens=max_output_tokens,
+                        timeout=self.timeout,
+                        **extra_params
+                    )
+                limiter.record_success()
                 return (response.choices[0].message.content or "").strip()
 
             except Exception as e:
                 last_err = e
+                # 429: o limitador global já aplicou o cooldown (Retry-After);
+                # a requisição volta para a fila sem consumir tentativa
+                if limiter.record_failure(e) is not None and rate_limited < self.MAX_RATE_LIMIT_RETRIES:
+                    rate_limited += 1
+                    continue
+
+                attempt += 1
                 if attempt == retries:
                     break
 
@@ -273,6 +497,19 @@ class SummarySpecs:
         ),
     }
 
+    # Etapa de map compartilhada: um resumo denso por chunk, reduzido depois por cada spec
+    MAP: SummarySpec = SummarySpec(
+        key="mapa",
+        instruction=(
+            "Resuma o trecho de forma densa e fiel, preservando ideias centrais, conceitos-chave, "
+            "argumentos do autor, exemplos, nomes, números e citações marcantes. "
+            "Este resumo servirá de base para resumos curtos, longos e listas de bullets."
+        ),
+        target_words=250,
+        max_words=300,
+        max_output_tokens=800,
+    )
+
     BASE_SYSTEM_MESSAGE = (
         "Você é um assistente especializado em criar resumos de livros precisos e informativos. "
         "Não invente fatos. Se algo não estiver no texto, não afirme."
@@ -285,6 +522,7 @@ class SummaryResult:
     content: str
     references: Dict
     spec_key: str
+    reduce_timings: Optional[Dict] = None  # profundidade/latência da redução em árvore
 
 
 class BookSummarizer:
@@ -298,7 +536,10 @@ class BookSummarizer:
         chunk_word_target: int = 1200,
         chunk_overlap_words: int = 120,
         use_async: bool = True,
-        use_chapters: bool = True
+        use_chapters: bool = True,
+        llm_client: Optional[AsyncOpenAIClient] = None,
+        token_budget: Optional[TokenBudget] = None,
+        reduce_fan_in: int = DEFAULT_TREE_FAN_IN
     ):
         """
         Inicializa o sumarizador otimizado.
@@ -311,8 +552,13 @@ class BookSummarizer:
             chunk_overlap_words: Overlap entre chunks
             use_async: Se True, usa processamento assíncrono (recomendado)
             use_chapters: Se True, tenta detectar capítulos antes de usar chunking (padrão: True)
+            llm_client: Cliente LLM compartilhado (opcional; se None, cria um próprio)
+            token_budget: Orçamento de tokens do modelo (opcional; se None, usa o do modelo do cliente)
+            reduce_fan_in: Máximo de resumos parciais por chamada na redução em árvore
         """
-        self.openai_client = AsyncOpenAIClient(api_key, model, request_timeout)
+        self.openai_client = llm_client or AsyncOpenAIClient(api_key, model, request_timeout)
+        self.token_budget = token_budget or get_token_budget(getattr(self.openai_client, 'model', None))
+        self.reduce_fan_in = reduce_fan_in
         self.chunk_processor = ChunkProcessor(chunk_word_target, chunk_overlap_words)
         self.quality_gate = QualityGate()
         self.use_async = use_async
@@ -322,7 +568,7 @@ class BookSummarizer:
         if use_chapters:
             self.markdown_parser = MarkdownParser()  # NEW: Markdown parser
             self.chapter_detector = ChapterDetector()  # Fallback para texto puro
-            self.chapter_summarizer = ChapterSummarizer()
+            self.chapter_summarizer = ChapterSummarizer(client=self.openai_client)
 
     @staticmethod
     def _word_count(text: str) -> int:
@@ -376,15 +622,23 @@ Resposta:"""
         chunk: str,
         spec: SummarySpec,
         localizacao: str,
-        is_meta: bool = False
+        is_meta: bool = False,
+        attempt: int = 1
     ) -> str:
-        """Sumariza um chunk de forma assíncrona."""
+        """
+        Sumariza um chunk de forma assíncrona.
+
+        Regenerações (attempt > 1) ignoram o cache: a mesma entrada devolveria
+        a mesma resposta que acabou de reprovar no Quality Gate.
+        """
         user_prompt = self._build_user_prompt(chunk, spec, localizacao, is_meta)
 
         return await self.openai_client.complete(
             system_message=SummarySpecs.BASE_SYSTEM_MESSAGE,
             user_message=user_prompt,
-            max_output_tokens=spec.max_output_tokens
+            max_output_tokens=spec.max_output_tokens,
+            use_cache=attempt == 1,
+            cache_salt=f"attempt:{attempt}"
         )
 
     async def _summarize_full_text_async(
@@ -392,7 +646,9 @@ Resposta:"""
         text: str,
         spec: SummarySpec,
         localizacao: str,
-        progress_callback: Optional[ProgressCallback] = None
+        progress_callback: Optional[ProgressCallback] = None,
+        text_index: Optional[TextIndex] = None,
+        attempt: int = 1
     ) -> str:
         """
         Sumariza texto completo de forma assíncrona com chunking inteligente.
@@ -404,39 +660,130 @@ Resposta:"""
            b) Sumariza todos os chunks EM PARALELO (otimização principal)
            c) Cria meta-resumo consolidado
         """
-        # Usar cache para chunks
-        text_hash = ChunkProcessor.get_text_hash(text)
-        chunks = list(ChunkProcessor.chunk_text_cached(
-            text_hash, text,
-            self.chunk_processor.word_target,
-            self.chunk_processor.overlap_words
-        ))
+        chunk_summaries = await self._map_chunks_async(text, spec, localizacao, text_index, attempt)
 
         # Texto pequeno: sumarizar diretamente
-        if len(chunks) == 1:
-            return await self._summarize_chunk_async(chunks[0], spec, localizacao)
+        if chunk_summaries is None:
+            return await self._summarize_chunk_async(text, spec, localizacao, attempt=attempt)
+
+        total = len(chunk_summaries)
+        if progress_callback:
+            progress_callback(total, total, f"Todos os {total} chunks processados para {spec.key}")
+
+        # Criar meta-resumo consolidado
+        meta, _ = await self._reduce_chunk_summaries_async(chunk_summaries, spec, localizacao, attempt)
+        return meta
+
+    async def _map_chunks_async(
+        self,
+        text: str,
+        spec: SummarySpec,
+        localizacao: str,
+        text_index: Optional[TextIndex] = None,
+        attempt: int = 1
+    ) -> Optional[List[str]]:
+        """
+        Etapa de map: sumariza todos os chunks do texto EM PARALELO.
+
+        Args:
+            text: Texto completo
+            spec: Spec usada nos prompts dos chunks (SummarySpecs.MAP = resumo denso
+                compartilhado por todas as specs)
+            localizacao: Contexto de localização para o prompt
+            text_index: Índice de palavras de `text` (opcional)
+            attempt: Tentativa de geração (> 1 = regeneração, sem cache)
+
+        Returns:
+            Resumos dos chunks na ordem do texto, ou None se o texto cabe em um chunk só
+        """
+        if text_index is not None:
+            # Índice compartilhado: chunks como faixas do texto, fatiados só no envio
+            spans = self.chunk_processor.chunk_spans(text, text_index)
+        else:
+            # Usar cache para chunks
+            text_hash = ChunkProcessor.get_text_hash(text)
+            chunks = ChunkProcessor.chunk_text_cached(
+                text_hash, text,
+                self.chunk_processor.word_target,
+                self.chunk_processor.overlap_words
+            )
+            spans = None
+
+        total = len(spans) if spans is not None else len(chunks)
+        if total == 1:
+            return None
 
         # Texto grande: processar chunks EM PARALELO
-        total = len(chunks)
         logger.info(f"Processando {total} chunks em paralelo para {spec.key}...")
 
+        async def summarize_span(start: int, end: int) -> str:
+            return await self._summarize_chunk_async(text[start:end], spec, localizacao, attempt=attempt)
+
         # Criar tasks para todos os chunks
-        tasks = [
-            self._summarize_chunk_async(chunk, spec, localizacao)
-            for chunk in chunks
-        ]
+        if spans is not None:
+            tasks = [summarize_span(start, end) for start, end in spans]
+        else:
+            tasks = [
+                self._summarize_chunk_async(chunk, spec, localizacao, attempt=attempt)
+                for chunk in chunks
+            ]
 
         # Executar todas as tasks em paralelo (OTIMIZAÇÃO PRINCIPAL)
-        chunk_summaries = await asyncio.gather(*tasks)
+        return list(await asyncio.gather(*tasks))
 
-        if progress_callback:
-            progress_callback(total, total, f"Todos os {total} chunks processados para {spec.key}")
+    async def _reduce_chunk_summaries_async(
+        self,
+        chunk_summaries: List[str],
+        spec: SummarySpec,
+        localizacao: str,
+        attempt: int = 1
+    ) -> Tuple[str, Dict]:
+        """
+        Etapa de reduce: consolida resumos de chunks no resumo da spec.
 
-        # Criar meta-resumo consolidado
-        combined = "\n\n".join(chunk_summaries)
-        meta = await self._summarize_chunk_async(combined, spec, localizacao, is_meta=True)
+        Se a junção dos resumos não cabe no prompt da spec, eles são dobrados
+        em árvore (TreeReducer): grupos de até reduce_fan_in resumos, medidos
+        em tokens, viram resumos intermediários densos (SummarySpecs.MAP) em
+        paralelo, nível a nível, até caberem no meta-prompt final.
 
-        return meta
+        Args:
+            chunk_summaries: Resumos dos chunks, na ordem do texto
+            spec: Spec do resumo final
+            localizacao: Contexto de localização para o prompt
+            attempt: Tentativa de geração (> 1 = regeneração, sem cache)
+
+        Returns:
+            Tupla (meta-resumo consolidado, timings da redução: profundidade e
+            latência por nível)
+        """
+        budget = min(
+            self._meta_prompt_budget(spec, localizacao),
+            self._meta_prompt_budget(SummarySpecs.MAP, localizacao)
+        )
+        reducer = TreeReducer(self.token_budget.count, budget, self.reduce_fan_in)
+
+        async def reduce_group(group: List[str], level: int) -> str:
+            return await self._summarize_chunk_async(
+                "\n\n".join(group), SummarySpecs.MAP, localizacao, is_meta=True, attempt=attempt
+            )
+
+        folded = await reducer.fold(chunk_summaries, reduce_group)
+        if reducer.depth:
+            logger.info(
+                f"Resumos de {len(chunk_summaries)} chunks dobrados em {reducer.depth} níveis "
+                f"({len(folded)} partes) para {spec.key}"
+            )
+
+        combined = "\n\n".join(folded)
+        meta = await self._summarize_chunk_async(combined, spec, localizacao, is_meta=True, attempt=attempt)
+        return meta, reducer.timings()
+
+    def _meta_prompt_budget(self, spec: SummarySpec, localizacao: str) -> int:
+        """Tokens de resumos parciais que cabem em um meta-prompt da spec."""
+        overhead = SummarySpecs.BASE_SYSTEM_MESSAGE + self._build_user_prompt(
+            "", spec, localizacao, is_meta=True
+        )
+        return self.token_budget.prompt_budget(spec.max_output_tokens, overhead)
 
     async def _compact_if_needed_async(self, summary: str, spec: SummarySpec) -> str:
         """Compacta resumo se ultrapassar limite de palavras."""
@@ -473,7 +820,10 @@ Resposta:"""
         text: str,
         spec_key: str,
         tracker: Optional[TextTracker] = None,
-        progress_callback: Optional[ProgressCallback] = None
+        progress_callback: Optional[ProgressCallback] = None,
+        text_index: Optional[TextIndex] = None,
+        chunk_summaries: Optional[List[str]] = None,
+        attempt: int = 1
     ) -> SummaryResult:
         """
         Gera um resumo de tipo específico de forma assíncrona.
@@ -483,47 +833,77 @@ Resposta:"""
         - Processamento paralelo de chunks
         - Validação e compactação automática de tamanho
         - Rastreabilidade
+
+        Com `chunk_summaries` (map compartilhado, ver _collect_all_summaries_async),
+        só a etapa de reduce da spec é executada. `attempt` > 1 (regeneração após
+        reprovação no Quality Gate) pede respostas novas em vez das do cache.
         """
         spec = SummarySpecs.CONFIGS[spec_key]
         localizacao = self._make_localizacao(text, tracker)
 
         logger.info(f"Gerando resumo {spec.key}...")
 
-        # Sumarizar texto completo
-        summary = await self._summarize_full_text_async(
-            text, spec, localizacao, progress_callback
-        )
+        reduce_timings = None
+        if chunk_summaries is not None:
+            summary, reduce_timings = await self._reduce_chunk_summaries_async(
+                chunk_summaries, spec, localizacao, attempt
+            )
+        else:
+            # Sumarizar texto completo
+            summary = await self._summarize_full_text_async(
+                text, spec, localizacao, progress_callback, text_index, attempt
+            )
 
         # Compactar se necessário
         summary = await self._compact_if_needed_async(summary, spec)
 
-        # Criar mapa de referências
-        ref_map = tracker.create_reference_map(summary) if tracker else {}
+        # Criar mapa de referências (índice do alinhamento aproximado construído fora do loop)
+        ref_map = {}
+        if tracker:
+            await tracker.prepare_alignment_async()
+            ref_map = tracker.create_reference_map(summary)
 
         return SummaryResult(
             content=summary,
             references=ref_map,
-            spec_key=spec_key
+            spec_key=spec_key,
+            reduce_timings=reduce_timings
         )
 
     async def _collect_all_summaries_async(
         self,
         text: str,
         tracker: Optional[TextTracker],
-        progress_callback: Optional[ProgressCallback]
+        progress_callback: Optional[ProgressCallback],
+        text_index: Optional[TextIndex] = None,
+        attempt: int = 1
     ) -> Dict[str, SummaryResult]:
         """
         Coleta TODOS os tipos de resumo EM PARALELO.
 
         Esta é a OTIMIZAÇÃO PRINCIPAL de performance:
-        - Gera os 4 resumos simultaneamente
-        - Reduz tempo total em ~75%
+        - Map único: cada chunk é resumido UMA vez (SummarySpecs.MAP), em vez de
+          uma vez por spec (N chunks → N chamadas, não 4N)
+        - Reduce por spec: os 4 resumos consolidam os mesmos resumos de chunks,
+          simultaneamente
+
+        `attempt` > 1 indica regeneração: map e reduces ignoram o cache do LLM.
         """
         logger.info("Gerando TODOS os resumos em paralelo...")
 
+        # Map compartilhado por todas as specs (None = texto cabe em um chunk)
+        chunk_summaries = await self._map_chunks_async(
+            text, SummarySpecs.MAP, self._make_localizacao(text, tracker), text_index, attempt
+        )
+        if chunk_summaries is not None and progress_callback:
+            total = len(chunk_summaries)
+            progress_callback(total, total, f"Todos os {total} chunks processados")
+
         # Criar tasks para todos os tipos
         tasks = {
-            spec_key: self._generate_summary_async(text, spec_key, tracker, progress_callback)
+            spec_key: self._generate_summary_async(
+                text, spec_key, tracker, progress_callback, text_index, chunk_summaries, attempt
+            )
             for spec_key in SummarySpecs.CONFIGS.keys()
         }
 
@@ -587,6 +967,15 @@ Resposta:"""
                 "total_segmentos": len(tracker.segments)
             }
 
+        # Profundidade e latência por nível da redução em árvore de cada spec
+        reduce_timings = {
+            spec_key: sr.reduce_timings
+            for spec_key, sr in summary_results.items()
+            if sr.reduce_timings is not None
+        }
+        if reduce_timings:
+            result["timings"] = {"reduce": reduce_timings}
+
         # Adicionar validação
         if validation_results:
             result["validation"] = validation_results
@@ -606,7 +995,8 @@ Resposta:"""
         text: str,
         include_tracking: bool = True,
         validate_quality: bool = True,
-        progress_callback: Optional[ProgressCallback] = None
+        progress_callback: Optional[ProgressCallback] = None,
+        text_index: Optional[TextIndex] = None
     ) -> Dict:
         """
         Gera todos os tipos de resumo de forma assíncrona e paralela.
@@ -626,10 +1016,16 @@ Resposta:"""
             include_tracking: Se True, inclui rastreabilidade
             validate_quality: Se True, valida qualidade e regenera se necessário
             progress_callback: Função callback para progresso
+            text_index: Índice de palavras de `text` (opcional); construído
+                uma vez aqui se não informado e compartilhado por detectores,
+                chunker e tracker
 
         Returns:
             Dicionário com todos os resumos, referências e validação
         """
+        if text_index is None:
+            text_index = TextIndex(text)
+
         # NOVO: Tentar detectar capítulos primeiro
         if self.use_chapters:
             chapters = None
@@ -637,7 +1033,7 @@ Resposta:"""
             # 1. Try Markdown parsing first (if text has MD structure)
             if self.markdown_parser.is_markdown(text):
                 logger.info("🔍 Detectada estrutura Markdown. Parsing headers...")
-                chapters = self.markdown_parser.parse_chapters(text)
+                chapters = self.markdown_parser.parse_chapters(text, text_index)
 
                 if chapters:
                     logger.info(f"✅ Markdown: Detectados {len(chapters)} capítulos via headers!")
@@ -645,7 +1041,7 @@ Resposta:"""
             # 2. Fallback to regex-based chapter detection (plain text)
             if not chapters:
                 logger.info("🔍 Tentando detecção de capítulos via regex (texto puro)...")
-                chapters = self.chapter_detector.detect_chapters(text)
+                chapters = self.chapter_detector.detect_chapters(text, text_index)
 
                 if chapters and len(chapters) >= 3:
                     logger.info(f"✅ Regex: Detectados {len(chapters)} capítulos!")
@@ -665,8 +1061,13 @@ Resposta:"""
         # Fallback: usar método por chunks (código existente)
         logger.info("ℹ️  Capítulos não detectados ou desabilitados. Usando chunking por palavras.")
 
-        tracker = TextTracker(text) if include_tracking else None
+        tracker = TextTracker(text, text_index) if include_tracking else None
+        if tracker:
+            # Constrói o índice MinHash em uma thread enquanto o LLM trabalha
+            tracker.prepare_alignment_async()
         max_attempts = self.quality_gate.max_retries if validate_quality else 1
+        # Vocabulário do livro calculado uma vez para todas as specs e tentativas
+        validator = self.quality_gate.validator_for(text) if validate_quality else None
 
         for attempt in range(1, max_attempts + 1):
             if attempt > 1:
@@ -674,7 +1075,7 @@ Resposta:"""
 
             # Coletar TODOS os resumos EM PARALELO (otimização principal)
             summary_results = await self._collect_all_summaries_async(
-                text, tracker, progress_callback
+                text, tracker, progress_callback, text_index, attempt
             )
 
             # Validar qualidade se solicitado
@@ -687,9 +1088,7 @@ Resposta:"""
                     for spec_key, sr in summary_results.items()
                 }
 
-                validation_results = self.quality_gate.validate_all_summaries(
-                    summaries_dict, text
-                )
+                validation_results = validator.validate_all_summaries(summaries_dict)
 
                 should_regenerate = self.quality_gate.should_regenerate(validation_results)
 
@@ -16,13 +16,17 @@ F4: Persistência progressiva e retomada segura
 
 import asyncio
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 from datetime import datetime
 
 from src.chapter_detector import ChapterDetector, Chapter
 from src.markdown_parser import MarkdownParser
 from src.chapter_summarizer import ChapterSummarizer, ChapterSummary
+from src.chapter_scheduler import (
+    ChapterCostModel, ChapterScheduler, DEFAULT_MAX_CONCURRENT_CHAPTERS, get_chapter_cost_model
+)
+from src.text_index import TextIndex
 from src.evidence_generator_robust import EvidenceGeneratorRobust
 from src.quality_gate import QualityGate
 from src.exceptions import CoverageError
@@ -39,7 +43,7 @@ class BookSummarizerRobust:
     
     Pipeline:
     1. Detectar capítulos
-    2. Processar cada capítulo com pipeline robusto
+    2. Processar capítulos em paralelo (ChapterScheduler) com pipeline robusto
     3. Coletar extrações
     4. Gerar evidências (coverage_report.json, extractions, report.md)
     5. Validar com Quality Gate
@@ -52,7 +56,11 @@ class BookSummarizerRobust:
         evidencias_dir: str = "EVIDENCIAS",
         use_chapters: bool = True,
         metadata_collector=None,
-        session_id: Optional[str] = None
+        session_id: Optional[str] = None,
+        max_concurrent_chapters: int = DEFAULT_MAX_CONCURRENT_CHAPTERS,
+        llm_client=None,
+        stream_callback=None,
+        cost_model: Optional[ChapterCostModel] = None
     ):
         """
         Inicializa o summarizer robusto.
@@ -62,6 +70,12 @@ class BookSummarizerRobust:
             use_chapters: Se True, detecta capítulos antes de processar
             metadata_collector: Coletor de metadados do processo (opcional)
             session_id: ID da sessão para retomada (opcional)
+            max_concurrent_chapters: Máximo de capítulos processados em paralelo
+            llm_client: AsyncOpenAIClient compartilhado (opcional; se None, cria um próprio)
+            stream_callback: Recebe (capítulo, tentativa, texto parcial) dos resumos
+                gerados em streaming (opcional; ver LLM_STREAM_SUMMARIES)
+            cost_model: Estimador de custo por capítulo (opcional; se None, usa o
+                compartilhado do processo, com histórico em CHAPTER_TIMING_HISTORY_PATH)
         """
         self.evidencias_dir = Path(evidencias_dir)
         self.evidencias_dir.mkdir(parents=True, exist_ok=True)
@@ -72,9 +86,17 @@ class BookSummarizerRobust:
         # Inicializar componentes
         self.markdown_parser = MarkdownParser()
         self.chapter_detector = ChapterDetector()
-        self.chapter_summarizer = ChapterSummarizer(metadata_collector=metadata_collector)
+        self.chapter_summarizer = ChapterSummarizer(
+            metadata_collector=metadata_collector,
+            client=llm_client,
+            stream_callback=stream_callback
+        )
         self.evidence_generator = EvidenceGeneratorRobust(output_dir=str(self.evidencias_dir))
         self.quality_gate = QualityGate()
+        self.chapter_scheduler = ChapterScheduler(
+            max_concurrent=max_concurrent_chapters,
+            cost_model=cost_model if cost_model is not None else get_chapter_cost_model()
+        )
         
         # F4: Inicializar gerenciador de checkpoints
         self.checkpoint_manager = CheckpointManager()
@@ -82,12 +104,14 @@ class BookSummarizerRobust:
         # F4: Metadados de processamento (inicializados na primeira execução)
         self.process_metadata = None
     
-    async def summarize_robust(self, text: str) -> Dict:
+    async def summarize_robust(self, text: str, text_index: Optional[TextIndex] = None) -> Dict:
         """
         Pipeline robusto completo (Gate Z7) com persistência progressiva (F4).
         
         Args:
             text: Texto completo do livro
+            text_index: Índice de palavras de `text` (opcional); construído uma
+                vez aqui se não informado e compartilhado por detecção e chunking
             
         Returns:
             Dicionário com resumos dos capítulos e resumo executivo
@@ -125,139 +149,33 @@ class BookSummarizerRobust:
                 'total_chunks_por_capitulo': {}
             }
         
+        if text_index is None:
+            text_index = TextIndex(text)
+
         # 1. Detectar capítulos
-        chapters = await self._detect_chapters(text)
+        chapters = await self._detect_chapters(text, text_index)
         logger.info(f"  → {len(chapters)} capítulos detectados")
         
-        # 2. Processar cada capítulo com pipeline robusto
-        chapter_summaries = []
-        all_extractions = {}
+        # 2. Restaurar capítulos já processados (F3) e escalonar os pendentes em paralelo
+        chapter_summaries: List[Optional[Dict]] = []
+        pending_indexes = []
+        for index, chapter in enumerate(chapters):
+            restored = self._restore_chapter_from_checkpoint(chapter, processed_chapters)
+            chapter_summaries.append(restored)
+            if restored is None:
+                pending_indexes.append(index)
+        
+        pending_chapters = [chapters[index] for index in pending_indexes]
+        results = await self.chapter_scheduler.run(
+            pending_chapters,
+            lambda chapter: self._process_chapter(chapter, text, text_index),
+            size=lambda chapter: chapter.word_count  # Capítulos maiores primeiro (LPT)
+        )
         
-        for chapter in chapters:
-            # F4: Pular capítulos já processados conforme F3
-            if chapter.number in processed_chapters:
-                logger.info(f"  ⏭️ Capítulo {chapter.number} já processado, restaurando do checkpoint...")
-                # Carregar checkpoint do capítulo
-                checkpoint = self.checkpoint_manager.load_checkpoint(self.session_id, chapter.number)
-                if checkpoint:
-                    # Restaurar dados do capítulo do checkpoint
-                    chapter_data = {
-                        'chapter_number': checkpoint.chapter_number,
-                        'chapter_title': checkpoint.chapter_summary['titulo'],
-                        'summary_text': checkpoint.chapter_summary['resumo'],
-                        'summary_object': checkpoint.chapter_summary,
-                        'recall_set': checkpoint.coverage_report.get('recall_set', {}),
-                        'audit_result': checkpoint.coverage_report.get('audit_result', {}),
-                        'total_chunks': checkpoint.coverage_report.get('total_chunks', 0),
-                        'processed_chunks': checkpoint.coverage_report.get('processed_chunks', 0)
-                    }
-                    chapter_summaries.append(chapter_data)
-                    logger.info(f"  ✅ Capítulo {chapter.number} restaurado do checkpoint")
-                    continue
-                else:
-                    logger.warning(f"  ⚠️ Checkpoint do capítulo {chapter.number} não encontrado, reprocessando...")
-                    # Se checkpoint não encontrado, remover da lista e reprocessar
-                    processed_chapters.remove(chapter.number)
-            
-            logger.info(f"  📖 Processando Capítulo {chapter.number}: {chapter.title}")
-            logger.info(f"  📖 Processando Capítulo {chapter.number}: {chapter.title}")
-            
-            # Processar capítulo e coletar dados do pipeline
-            # Precisamos acessar recall_set e extrações do pipeline
-            # Vamos modificar summarize_chapter_robust para retornar também esses dados
-            summary, pipeline_data = await self._summarize_chapter_with_data(
-                chapter, text
-            )
-            
-            # Coletar dados para evidências
-            # Garantir que recall_set tem estrutura correta
-            recall_set_data = pipeline_data.get('recall_set', {})
-            
-            # Debug: verificar se recall_set está vazio
-            if not recall_set_data:
-                logger.warning(f"  ⚠️ Recall Set vazio no pipeline_data para capítulo {chapter.number}")
-                recall_set_data = {
-                    'critical_items': [],
-                    'supporting_items': []
-                }
-            elif not recall_set_data.get('critical_items'):
-                logger.warning(f"  ⚠️ Recall Set sem critical_items para capítulo {chapter.number} (recall_set_data keys: {list(recall_set_data.keys())})")
-                logger.warning(f"  ⚠️ pipeline_data keys: {list(pipeline_data.keys())}")
-                logger.warning(f"  ⚠️ pipeline_data['recall_set'] type: {type(pipeline_data.get('recall_set'))}")
-                # Tentar usar recall_set do summary se disponível
-                # Por enquanto, manter estrutura vazia
-            
-            # Construir coverage_report parcial conforme F2
-            coverage_report_partial = {
-                'chapter_number': chapter.number,
-                'chapter_title': chapter.title,
-                'total_chunks': pipeline_data.get('total_chunks', 0),
-                'processed_chunks': pipeline_data.get('processed_chunks', 0),
-                'chunk_coverage_percentage': (pipeline_data.get('processed_chunks', 0) / pipeline_data.get('total_chunks', 1)) * 100.0 if pipeline_data.get('total_chunks', 0) > 0 else 0.0,
-                'recall_set': recall_set_data,
-                'audit_result': pipeline_data.get('audit_result', {
-                    'passed': True,
-                    'regeneration_count': 0,
-                    'addendum_count': 0,
-                    'missing_markers': [],
-                    'invalid_chunks': []
-                })
-            }
-            
-            chapter_data = {
-                'chapter_number': summary.numero,
-                'chapter_title': chapter.title,
-                'summary_text': summary.resumo,
-                # Dados completos do ChapterSummary para persistência
-                'summary_object': {
-                    'numero': summary.numero,
-                    'titulo': summary.titulo,
-                    'palavras': summary.palavras,
-                    'palavras_resumo': summary.palavras_resumo,
-                    'paginas': summary.paginas,
-                    'resumo': summary.resumo,
-                    'pontos_chave': summary.pontos_chave,
-                    'citacoes': summary.citacoes,
-                    'exemplos': summary.exemplos
-                },
-                'recall_set': recall_set_data,
-                'audit_result': pipeline_data.get('audit_result', {
-                    'passed': True,
-                    'regeneration_count': 0,
-                    'missing_markers': [],
-                    'invalid_chunks': []
-                }),
-                'total_chunks': pipeline_data.get('total_chunks', 0),
-                'processed_chunks': pipeline_data.get('processed_chunks', 0)
-            }
-            chapter_summaries.append(chapter_data)
-            
-            # F4: Criar checkpoint após processamento completo do capítulo (F2)
-            # Checkpoint criado no ponto definido em F2: após processamento completo de cada capítulo
-            try:
-                # Atualizar metadados de processamento
-                self.process_metadata['capitulos_processados'] = list(set(self.process_metadata.get('capitulos_processados', []) + [chapter.number]))
-                self.process_metadata['chunks_processados_por_capitulo'][chapter.number] = pipeline_data.get('processed_chunks', 0)
-                self.process_metadata['total_chunks_por_capitulo'][chapter.number] = pipeline_data.get('total_chunks', 0)
-                self.process_metadata['timestamp_ultimo_checkpoint'] = datetime.now().isoformat()
-                
-                # Salvar checkpoint atomicamente conforme F3
-                checkpoint_path = self.checkpoint_manager.save_checkpoint(
-                    session_id=self.session_id,
-                    chapter_number=chapter.number,
-                    chapter_summary=chapter_data['summary_object'],
-                    coverage_report=coverage_report_partial,
-                    metadata=self.process_metadata
-                )
-                logger.info(f"  ✅ Checkpoint salvo: {checkpoint_path}")
-            except Exception as e:
-                logger.error(f"  ❌ Erro ao salvar checkpoint do capítulo {chapter.number}: {e}")
-                # Não falhar o processamento se checkpoint falhar, mas logar erro
-                import traceback
-                traceback.print_exc()
-            
-            # Coletar extrações
-            all_extractions[f'chapter_{chapter.number}'] = pipeline_data.get('extractions', {})
+        all_extractions = {}
+        for index, (chapter_data, extractions) in zip(pending_indexes, results):
+            chapter_summaries[index] = chapter_data
+            all_extractions[f'chapter_{chapters[index].number}'] = extractions
         
         # 3. Gerar evidências
         logger.info("  📊 Gerando evidências...")
@@ -297,17 +215,181 @@ class BookSummarizerRobust:
             'total_chapters': len(chapter_summaries),
             'evidence_files': evidence_files,
             # Manter chapter_summaries completo para uso na API
-            'chapter_summaries': chapter_summaries
+            'chapter_summaries': chapter_summaries,
+            # Makespan previsto x real do escalonamento (None se nada foi escalonado)
+            'schedule_report': (
+                self.chapter_scheduler.last_report.to_dict()
+                if pending_chapters and self.chapter_scheduler.last_report else None
+            )
         }
         
         return result
-    
-    async def _detect_chapters(self, text: str) -> List:
+
+    def _restore_chapter_from_checkpoint(
+        self,
+        chapter,
+        processed_chapters: List[str]
+    ) -> Optional[Dict]:
+        """
+        Restaura dados de um capítulo já processado a partir do checkpoint (F3).
+
+        Args:
+            chapter: Objeto Chapter
+            processed_chapters: Capítulos marcados como processados no último checkpoint
+
+        Returns:
+            chapter_data restaurado, ou None se o capítulo precisa ser (re)processado
+        """
+        if chapter.number not in processed_chapters:
+            return None
+
+        logger.info(f"  ⏭️ Capítulo {chapter.number} já processado, restaurando do checkpoint...")
+        checkpoint = self.checkpoint_manager.load_checkpoint(self.session_id, chapter.number)
+        if not checkpoint:
+            logger.warning(f"  ⚠️ Checkpoint do capítulo {chapter.number} não encontrado, reprocessando...")
+            # Se checkpoint não encontrado, remover da lista e reprocessar
+            processed_chapters.remove(chapter.number)
+            return None
+
+        logger.info(f"  ✅ Capítulo {chapter.number} restaurado do checkpoint")
+        return {
+            'chapter_number': checkpoint.chapter_number,
+            'chapter_title': checkpoint.chapter_summary['titulo'],
+            'summary_text': checkpoint.chapter_summary['resumo'],
+            'summary_object': checkpoint.chapter_summary,
+            'recall_set': checkpoint.coverage_report.get('recall_set', {}),
+            'audit_result': checkpoint.coverage_report.get('audit_result', {}),
+            'total_chunks': checkpoint.coverage_report.get('total_chunks', 0),
+            'processed_chunks': checkpoint.coverage_report.get('processed_chunks', 0)
+        }
+
+    async def _process_chapter(
+        self,
+        chapter,
+        text: str,
+        text_index: Optional[TextIndex] = None
+    ) -> Tuple[Dict, Dict]:
+        """
+        Processa um capítulo com pipeline robusto e salva seu checkpoint (F2).
+
+        Executado pelo ChapterScheduler, possivelmente em paralelo com outros capítulos.
+
+        Args:
+            chapter: Objeto Chapter
+            text: Texto completo do livro
+            text_index: Índice de palavras do texto completo (opcional)
+
+        Returns:
+            Tupla (chapter_data, extractions) do capítulo
+        """
+        logger.info(f"  📖 Processando Capítulo {chapter.number}: {chapter.title}")
+
+        summary, pipeline_data = await self._summarize_chapter_with_data(chapter, text, text_index)
+
+        # Coletar dados para evidências
+        # Garantir que recall_set tem estrutura correta
+        recall_set_data = pipeline_data.get('recall_set', {})
+        if not recall_set_data:
+            logger.warning(f"  ⚠️ Recall Set vazio no pipeline_data para capítulo {chapter.number}")
+            recall_set_data = {
+                'critical_items': [],
+                'supporting_items': []
+            }
+        elif not recall_set_data.get('critical_items'):
+            logger.warning(f"  ⚠️ Recall Set sem critical_items para capítulo {chapter.number} (recall_set_data keys: {list(recall_set_data.keys())})")
+
+        total_chunks = pipeline_data.get('total_chunks', 0)
+        processed_chunks = pipeline_data.get('processed_chunks', 0)
+
+        # Construir coverage_report parcial conforme F2
+        coverage_report_partial = {
+            'chapter_number': chapter.number,
+            'chapter_title': chapter.title,
+            'total_chunks': total_chunks,
+            'processed_chunks': processed_chunks,
+            'chunk_coverage_percentage': (processed_chunks / total_chunks) * 100.0 if total_chunks > 0 else 0.0,
+            'recall_set': recall_set_data,
+            'audit_result': pipeline_data.get('audit_result', {
+                'passed': True,
+                'regeneration_count': 0,
+                'addendum_count': 0,
+                'missing_markers': [],
+                'invalid_chunks': []
+            })
+        }
+
+        chapter_data = {
+            'chapter_number': summary.numero,
+            'chapter_title': chapter.title,
+            'summary_text': summary.resumo,
+            # Dados completos do ChapterSummary para persistência
+            'summary_object': {
+                'numero': summary.numero,
+                'titulo': summary.titulo,
+                'palavras': summary.palavras,
+                'palavras_resumo': summary.palavras_resumo,
+                'paginas': summary.paginas,
+                'resumo': summary.resumo,
+                'pontos_chave': summary.pontos_chave,
+                'citacoes': summary.citacoes,
+                'exemplos': summary.exemplos
+            },
+            'recall_set': recall_set_data,
+            'audit_result': pipeline_data.get('audit_result', {
+                'passed': True,
+                'regeneration_count': 0,
+                'missing_markers': [],
+                'invalid_chunks': []
+            }),
+            'total_chunks': total_chunks,
+            'processed_chunks': processed_chunks
+        }
+
+        self._save_chapter_checkpoint(chapter, chapter_data, coverage_report_partial, pipeline_data)
+        return chapter_data, pipeline_data.get('extractions', {})
+
+    def _save_chapter_checkpoint(
+        self,
+        chapter,
+        chapter_data: Dict,
+        coverage_report_partial: Dict,
+        pipeline_data: Dict
+    ) -> None:
+        """
+        Cria checkpoint após processamento completo do capítulo (ponto definido em F2).
+
+        Síncrono de propósito: a atualização de process_metadata e a escrita do
+        checkpoint não são intercaladas com outros capítulos em paralelo.
+        """
+        try:
+            # Atualizar metadados de processamento
+            self.process_metadata['capitulos_processados'] = list(set(self.process_metadata.get('capitulos_processados', []) + [chapter.number]))
+            self.process_metadata['chunks_processados_por_capitulo'][chapter.number] = pipeline_data.get('processed_chunks', 0)
+            self.process_metadata['total_chunks_por_capitulo'][chapter.number] = pipeline_data.get('total_chunks', 0)
+            self.process_metadata['timestamp_ultimo_checkpoint'] = datetime.now().isoformat()
+
+            # Salvar checkpoint atomicamente conforme F3
+            checkpoint_path = self.checkpoint_manager.save_checkpoint(
+                session_id=self.session_id,
+                chapter_number=chapter.number,
+                chapter_summary=chapter_data['summary_object'],
+                coverage_report=coverage_report_partial,
+                metadata=self.process_metadata
+            )
+            logger.info(f"  ✅ Checkpoint salvo: {checkpoint_path}")
+        except Exception as e:
+            logger.error(f"  ❌ Erro ao salvar checkpoint do capítulo {chapter.number}: {e}")
+            # Não falhar o processamento se checkpoint falhar, mas logar erro
+            import traceback
+            traceback.print_exc()
+
+    async def _detect_chapters(self, text: str, text_index: Optional[TextIndex] = None) -> List:
         """
         Detecta capítulos no texto.
         
         Args:
             text: Texto completo
+            text_index: Índice de palavras de `text` (opcional)
             
         Returns:
             Lista de objetos Chapter
@@ -317,7 +399,7 @@ class BookSummarizerRobust:
             return [Chapter(
                 number="1",
                 title="Full Text",
-                word_count=len(text.split()),
+                word_count=text_index.word_count if text_index is not None else len(text.split()),
                 start_pos=0,
                 end_pos=len(text),
                 page_markers=[]
@@ -325,12 +407,12 @@ class BookSummarizerRobust:
         
         # Tentar Markdown primeiro
         if self.markdown_parser.is_markdown(text):
-            chapters = self.markdown_parser.parse_chapters(text)
+            chapters = self.markdown_parser.parse_chapters(text, text_index)
             if chapters:
                 return chapters
         
         # Fallback para detector de capítulos
-        chapters = self.chapter_detector.detect_chapters(text)
+        chapters = self.chapter_detector.detect_chapters(text, text_index)
         
         # Se ainda não detectou, criar um único capítulo com todo o texto (fallback final)
         if not chapters:
@@ -338,7 +420,7 @@ class BookSummarizerRobust:
             chapters = [Chapter(
                 number="1",
                 title="Full Text",
-                word_count=len(text.split()),
+                word_count=text_index.word_count if text_index is not None else len(text.split()),
                 start_pos=0,
                 end_pos=len(text),
                 page_markers=[],
@@ -349,10 +431,13 @@ class BookSummarizerRobust:
         
         return chapters
     
-    async def _summarize_chapter_with_data(self, chapter, full_text) -> tuple:
+    async def _summarize_chapter_with_data(self, chapter, full_text, text_index: Optional[TextIndex] = None) -> tuple:
         """
         Processa capítulo e retorna summary + dados do pipeline.
         
+        Quando text_index é informado, os chunks saem do índice de palavras
+        do texto completo em vez de um novo split do capítulo.
+        
         Returns:
             Tupla (summary, pipeline_data) onde pipeline_data contém:
             - recall_set
@@ -365,7 +450,10 @@ class BookSummarizerRobust:
         chapter_text = full_text[chapter.start_pos:chapter.end_pos]
         
         # 1. Chunking
-        chunks = self.chapter_summarizer._chunk_chapter(chapter_text, chapter.number)
+        chunks = self.chapter_summarizer._chunk_chapter(
+            chapter_text, chapter.number,
+            text_index=text_index, start_char=chapter.start_pos
+        )
         total_chunks = len(chunks)
         
         # 2. Extração
@@ -0,0 +1,20 @@
+"""
+Fixtures compartilhadas pelos testes.
+
+O histórico de tempos por capítulo (ChapterCostModel) é global no processo e
+gravado em CHAPTER_TIMING_HISTORY_PATH; os testes usam um histórico próprio
+em diretório temporário para não alimentar o histórico de produção.
+"""
+import pytest
+
+from src import chapter_scheduler
+
+
+@pytest.fixture(autouse=True)
+def isolated_chapter_timing_history(tmp_path, monkeypatch):
+    """Aponta o histórico de tempos de capítulos para um arquivo temporário."""
+    history_path = tmp_path / "chapter_timings.json"
+    monkeypatch.setattr(
+        chapter_scheduler, "_chapter_cost_model", chapter_scheduler.ChapterCostModel(str(history_path))
+    )
+    return history_path
@@ -184,7 +184,7 @@ class TestAPIProcessE2E:
         tracker = get_progress_tracker()
         
         # Mock summarizer para processamento longo (simula timeout SSE)
-        async def long_processing(text):
+        async def long_processing(text, text_index=None):
             await asyncio.sleep(0.5)  # Simula processamento longo
             return {
                 'chapters': [{'number': '1', 'title': 'Test', 'summary': 'Test summary'}],
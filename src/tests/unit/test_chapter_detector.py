@@ -0,0 +1,40 @@
+"""
+Testes unitários para ChapterDetector.
+
+Garante offsets corretos dos capítulos na varredura linear e a mesma
+semântica de candidatos dos padrões individuais.
+"""
+from src.chapter_detector import ChapterDetector
+
+
+def _build_book(chapters: int = 3, lines_per_chapter: int = 30) -> str:
+    lines = []
+    for number in range(1, chapters + 1):
+        lines.append(f"CAP. {number} - Título do capítulo {number}")
+        lines.extend(f"linha de conteúdo {n} do capítulo" for n in range(lines_per_chapter))
+        lines.append(f"--- Página {number} ---")
+    return "\n".join(lines)
+
+
+class TestChapterDetector:
+    """Testes da detecção de capítulos."""
+
+    def test_start_positions_point_to_headings(self):
+        text = _build_book()
+
+        chapters = ChapterDetector().detect_chapters(text)
+
+        assert [c.number for c in chapters] == ["1", "2", "3"]
+        for chapter in chapters:
+            assert text[chapter.start_pos:].startswith(f"CAP. {chapter.number}")
+        assert chapters[0].end_pos == chapters[1].start_pos
+        assert chapters[-1].end_pos == len(text)
+        assert chapters[1].page_markers == [2]
+
+    def test_line_matching_several_patterns_yields_one_candidate_per_pattern(self):
+        lines = ["texto", "Chapter 1: The Beginning", "ixx"]
+
+        candidates = ChapterDetector()._find_candidates(lines)
+
+        assert [c['pattern'] for c in candidates] == ['en_caps', 'en_title']
+        assert all(c['start_pos'] == len("texto") + 1 for c in candidates)
@@ -0,0 +1,240 @@
+"""
+Testes unitários para ChapterScheduler.
+
+Garante processamento paralelo de capítulos com concorrência limitada,
+ordem preservada, cancelamento em caso de falha e despacho LPT com
+estimativa de custo calibrada pelo histórico (sem capítulos servidos pelo
+cache do LLM, gravado fora do event loop).
+"""
+import asyncio
+import sys
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.chapter_scheduler import (
+    ChapterCostModel, ChapterScheduler, get_chapter_cost_model, predict_makespan
+)
+
+
+def _recording_model(history) -> ChapterCostModel:
+    """Cost model que aceita as durações curtas dos workers de teste."""
+    return ChapterCostModel(str(history), min_sample_seconds=0, min_sample_seconds_per_word=0)
+
+
+class TestChapterScheduler:
+    """Testes do escalonador de capítulos."""
+
+    @pytest.mark.asyncio
+    async def test_results_keep_chapter_order(self):
+        """Capítulos que terminam fora de ordem devem voltar na ordem de entrada."""
+        # Arrange
+        scheduler = ChapterScheduler(max_concurrent=3)
+        delays = {"1": 0.03, "2": 0.01, "3": 0.0}
+
+        async def worker(chapter_number):
+            await asyncio.sleep(delays[chapter_number])
+            return f"resumo {chapter_number}"
+
+        # Act
+        results = await scheduler.run(["1", "2", "3"], worker)
+
+        # Assert
+        assert results == ["resumo 1", "resumo 2", "resumo 3"]
+
+    @pytest.mark.asyncio
+    async def test_respects_concurrency_limit(self):
+        """Nunca deve haver mais capítulos em andamento do que max_concurrent."""
+        # Arrange
+        scheduler = ChapterScheduler(max_concurrent=2)
+        in_flight = 0
+        peak = 0
+
+        async def worker(chapter_number):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return chapter_number
+
+        # Act
+        await scheduler.run([str(n) for n in range(6)], worker)
+
+        # Assert
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_failure_cancels_pending_chapters(self):
+        """Falha em um capítulo propaga o erro e cancela os demais."""
+        # Arrange
+        scheduler = ChapterScheduler(max_concurrent=1)
+        started = []
+
+        async def worker(chapter_number):
+            started.append(chapter_number)
+            if chapter_number == "1":
+                raise RuntimeError("falha no capítulo 1")
+            await asyncio.sleep(0.01)
+            return chapter_number
+
+        # Act & Assert
+        with pytest.raises(RuntimeError):
+            await scheduler.run(["1", "2", "3"], worker)
+        assert "3" not in started
+
+    @pytest.mark.asyncio
+    async def test_empty_chapter_list(self):
+        """Lista vazia não deve escalonar nada."""
+        scheduler = ChapterScheduler(max_concurrent=0)
+
+        assert await scheduler.run([], None) == []
+        assert scheduler.max_concurrent == 1
+
+    @pytest.mark.asyncio
+    async def test_lpt_dispatches_largest_chapters_first(self, tmp_path):
+        """Com cost_model, capítulos maiores são despachados primeiro e o relatório é gerado."""
+        # Arrange
+        history = tmp_path / "timings.json"
+        scheduler = ChapterScheduler(max_concurrent=2, cost_model=_recording_model(history))
+        sizes = {"prefacio": 300, "1": 15000, "2": 4000, "3": 12000}
+        started = []
+
+        async def worker(chapter_number):
+            started.append(chapter_number)
+            await asyncio.sleep(sizes[chapter_number] / 1_000_000)
+            return chapter_number
+
+        # Act
+        results = await scheduler.run(list(sizes), worker, size=sizes.get)
+
+        # Assert
+        assert results == list(sizes)
+        assert started == ["1", "3", "2", "prefacio"]
+        report = scheduler.last_report
+        assert [c["words"] for c in report.chapters] == [15000, 12000, 4000, 300]
+        assert report.predicted_makespan > 0 and report.actual_makespan > 0
+        assert len(_recording_model(history).samples) == 4
+
+    @pytest.mark.asyncio
+    async def test_without_size_keeps_input_order(self):
+        """Sem `size`, o despacho segue a ordem de entrada e não há relatório."""
+        scheduler = ChapterScheduler(max_concurrent=1, cost_model=ChapterCostModel(None))
+        started = []
+
+        async def worker(chapter_number):
+            started.append(chapter_number)
+            return chapter_number
+
+        await scheduler.run(["1", "2", "3"], worker)
+
+        assert started == ["1", "2", "3"]
+        assert scheduler.last_report is None
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_chapters_do_not_feed_history(self, tmp_path, monkeypatch):
+        """Capítulos com acertos no cache do LLM são sinalizados e ficam fora do histórico."""
+        # Arrange: cache importado como o summarizer o importa (src no sys.path)
+        monkeypatch.syspath_prepend("src")
+        import llm_cache
+        cache = llm_cache.LLMResponseCache(str(tmp_path / "llm_cache.sqlite3"))
+        cache.set("chave", "resposta")
+        history = tmp_path / "timings.json"
+        scheduler = ChapterScheduler(max_concurrent=2, cost_model=_recording_model(history))
+        sizes = {"1": 5000, "2": 3000, "3": 1000}
+
+        async def worker(chapter_number):
+            if chapter_number == "2":
+                # Acerto em uma task filha conta para o capítulo
+                await asyncio.create_task(asyncio.to_thread(cache.get, "chave"))
+            await asyncio.sleep(0.001)
+            return chapter_number
+
+        # Act
+        await scheduler.run(list(sizes), worker, size=sizes.get)
+
+        # Assert
+        hits = {c["words"]: c["cache_hits"] for c in scheduler.last_report.chapters}
+        assert hits == {5000: 0, 3000: 1, 1000: 0}
+        assert [words for words, _ in _recording_model(history).samples] == [5000, 1000]
+
+    @pytest.mark.asyncio
+    async def test_history_is_saved_off_the_event_loop(self, tmp_path):
+        """A gravação do histórico roda em thread, fora do event loop."""
+        model = _recording_model(tmp_path / "timings.json")
+        scheduler = ChapterScheduler(max_concurrent=2, cost_model=model)
+        save_threads = []
+        save = model.save
+
+        def recording_save():
+            save_threads.append(threading.current_thread())
+            save()
+
+        model.save = recording_save
+
+        async def worker(chapter_number):
+            return chapter_number
+
+        await scheduler.run(["1", "2"], worker, size=lambda chapter: 100)
+
+        assert len(save_threads) == 1
+        assert save_threads[0] is not threading.main_thread()
+        assert len(_recording_model(tmp_path / "timings.json").samples) == 2
+
+
+class TestChapterCostModel:
+    """Testes do estimador de custo por capítulo."""
+
+    def test_fit_from_history(self):
+        """Com histórico, o modelo linear reproduz as medições."""
+        model = ChapterCostModel(None)
+        for words in (1000, 2000, 4000, 8000):
+            model.observe(words, 2.0 + 0.001 * words)
+
+        overhead, per_word = model.coefficients()
+
+        assert overhead == pytest.approx(2.0)
+        assert per_word == pytest.approx(0.001)
+        assert model.estimate(10000) == pytest.approx(12.0)
+
+    def test_corrupt_history_is_ignored(self, tmp_path):
+        """Arquivo de histórico inválido não impede o uso (estimativa padrão)."""
+        history = tmp_path / "timings.json"
+        history.write_text("{corrompido")
+
+        model = ChapterCostModel(str(history))
+
+        assert model.samples == []
+        assert model.estimate(1000) > model.estimate(10)
+
+    def test_predict_makespan_lpt(self):
+        """Makespan previsto simula despacho para o primeiro worker livre."""
+        assert predict_makespan([10, 8, 3, 2], 2) == 12
+        assert predict_makespan([2, 3, 8, 10], 2) == 13
+        assert predict_makespan([5], 4) == 5
+
+    def test_implausible_samples_are_dropped(self, tmp_path):
+        """Durações rápidas demais (LLM simulado) não entram nem voltam do histórico."""
+        history = tmp_path / "timings.json"
+        history.write_text('{"samples": [[12000, 0.001], [3000, 12.0], [8, 0.001]]}')
+
+        model = ChapterCostModel(str(history))
+
+        assert model.samples == [(3000, 12.0)]
+        assert model.observe(15000, 0.002) is False
+        assert model.observe(15000, 40.0) is True
+        assert model.samples == [(3000, 12.0), (15000, 40.0)]
+
+    def test_tests_never_touch_the_production_history(self, isolated_chapter_timing_history):
+        """O modelo compartilhado grava no histórico temporário da fixture."""
+        assert get_chapter_cost_model().history_path == isolated_chapter_timing_history
+
+    def test_robust_summarizer_accepts_cost_model(self, tmp_path):
+        """BookSummarizerRobust usa o cost_model recebido em vez do compartilhado."""
+        model = ChapterCostModel(None)
+        with patch.dict(sys.modules, {'summarizer': MagicMock()}):
+            from src.summarizer_robust import BookSummarizerRobust
+            summarizer = BookSummarizerRobust(evidencias_dir=str(tmp_path), cost_model=model)
+
+        assert summarizer.chapter_scheduler.cost_model is model
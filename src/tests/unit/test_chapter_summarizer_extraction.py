@@ -0,0 +1,136 @@
+"""
+Testes unitários para a extração paralela de chunks do ChapterSummarizer.
+
+Garante fan-out limitado por capítulo, ordem de chunk_id preservada e
+isolamento de falhas por chunk.
+"""
+import asyncio
+import json
+import sys
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.chapter_summarizer import ChapterSummarizer
+
+
+def _make_summarizer(max_concurrent_chunks: int, extraction_batch_size: int = 1) -> ChapterSummarizer:
+    """Cria ChapterSummarizer com o módulo summarizer mockado."""
+    mock_module = MagicMock()
+    mock_module.AsyncOpenAIClient = MagicMock(return_value=AsyncMock())
+    with patch.dict(sys.modules, {'summarizer': mock_module}):
+        return ChapterSummarizer(
+            max_concurrent_chunks=max_concurrent_chunks,
+            extraction_batch_size=extraction_batch_size
+        )
+
+
+def _make_chunks(count: int):
+    """Cria chunks no formato de _chunk_chapter()."""
+    return [
+        {'chunk_id': f'ch1_chunk_{i}', 'text': f'Texto do chunk {i}\nlinha\nlinha'}
+        for i in range(count)
+    ]
+
+
+class TestExtractFromChunks:
+    """Testes da extração concorrente de chunks."""
+
+    @pytest.mark.asyncio
+    async def test_keeps_chunk_order_and_concurrency_limit(self):
+        """Extrações voltam na ordem de chunk_id sem exceder o limite."""
+        # Arrange
+        summarizer = _make_summarizer(max_concurrent_chunks=2)
+        in_flight = 0
+        peak = 0
+
+        async def complete(*args, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            chunk_label = kwargs['user_message'].split('Texto do chunk ')[1][0]
+            await asyncio.sleep(0.01 * (5 - int(chunk_label)))
+            in_flight -= 1
+            return json.dumps({'concepts': [f'conceito {chunk_label}']})
+
+        summarizer.client.complete = complete
+
+        # Act
+        extractions = await summarizer._extract_from_chunks(_make_chunks(5))
+
+        # Assert
+        assert [e['chunk_id'] for e in extractions] == [0, 1, 2, 3, 4]
+        assert [e['concepts'] for e in extractions] == [[f'conceito {i}'] for i in range(5)]
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_chunk_does_not_affect_others(self):
+        """Falha em um chunk gera extração vazia apenas para ele."""
+        # Arrange
+        summarizer = _make_summarizer(max_concurrent_chunks=4)
+
+        async def complete(*args, **kwargs):
+            if 'Texto do chunk 1' in kwargs['user_message']:
+                raise RuntimeError("timeout")
+            return json.dumps({'concepts': ['ok']})
+
+        summarizer.client.complete = complete
+
+        # Act
+        extractions = await summarizer._extract_from_chunks(_make_chunks(3))
+
+        # Assert
+        assert [e['concepts'] for e in extractions] == [['ok'], [], ['ok']]
+
+    @pytest.mark.asyncio
+    async def test_batched_extraction_matches_per_chunk_structure(self):
+        """Lotes de K chunks reduzem chamadas sem mudar o formato das extrações."""
+        # Arrange
+        batched = _make_summarizer(max_concurrent_chunks=4, extraction_batch_size=3)
+        calls = []
+
+        async def complete(*args, **kwargs):
+            message = kwargs['user_message']
+            if 'chunk_id=' not in message:  # Lote de um chunk usa o prompt individual
+                i = int(message.split('Texto do chunk ')[1][0])
+                calls.append([i])
+                return json.dumps({'concepts': [f'conceito {i}']})
+            ids = [int(part.split('\n')[0]) for part in message.split('chunk_id=')[1:]]
+            calls.append(ids)
+            return json.dumps([
+                {'chunk_id': i, 'concepts': [f'conceito {i}'], 'ideas': [], 'examples': []}
+                for i in ids
+            ])
+
+        batched.client.complete = complete
+        chunks = [{'chunk_id': f'cap_1_chunk_{i}', 'text': f'Texto do chunk {i}'} for i in range(7)]
+
+        # Act
+        extractions = await batched._extract_from_chunks(chunks)
+
+        # Assert
+        assert calls == [[0, 1, 2], [3, 4, 5], [6]]
+        assert extractions == [
+            {'chunk_id': i, 'concepts': [f'conceito {i}'], 'ideas': [], 'examples': [], 'is_heading': True}
+            for i in range(7)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_invalid_batch_falls_back_to_per_chunk_calls(self):
+        """Resposta de lote que não cobre todos os chunk_ids cai para chamadas individuais."""
+        # Arrange
+        summarizer = _make_summarizer(max_concurrent_chunks=4, extraction_batch_size=3)
+
+        async def complete(*args, **kwargs):
+            if 'chunk_id=' in kwargs['user_message']:
+                return json.dumps([{'chunk_id': 0, 'concepts': ['parcial']}])
+            chunk_label = kwargs['user_message'].split('Texto do chunk ')[1][0]
+            return json.dumps({'concepts': [f'individual {chunk_label}']})
+
+        summarizer.client.complete = complete
+
+        # Act
+        extractions = await summarizer._extract_from_chunks(_make_chunks(3))
+
+        # Assert
+        assert [e['concepts'] for e in extractions] == [[f'individual {i}'] for i in range(3)]
@@ -0,0 +1,146 @@
+"""
+Testes unitários para o cache de documentos convertidos.
+
+Garante chave por hash + conversor + modo, armazenamento comprimido,
+expulsão LRU por tamanho e que saídas do fallback de texto puro não são
+armazenadas sob a chave do conversor Markdown.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.storage.conversion_cache import ConversionCache
+
+
+class TestConversionCache:
+    """Testes do cache de conversões."""
+
+    def test_roundtrip_is_compressed(self, tmp_path):
+        cache = ConversionCache(cache_dir=str(tmp_path))
+        text = "# Capítulo 1\n" + "conteúdo repetido " * 1000
+        file_hash = cache.hash_bytes(b"%PDF-1.4 livro")
+
+        saved_path = cache.put(file_hash, "pymupdf4llm-1.0", True, text)
+
+        assert cache.get(file_hash, "pymupdf4llm-1.0", True) == text
+        assert os.path.getsize(saved_path) < len(text.encode("utf-8")) / 10
+
+    def test_key_includes_converter_and_mode(self, tmp_path):
+        cache = ConversionCache(cache_dir=str(tmp_path))
+        file_hash = cache.hash_bytes(b"%PDF-1.4 livro")
+        cache.put(file_hash, "pymupdf4llm-1.0", True, "markdown")
+
+        assert cache.get(file_hash, "pymupdf4llm-2.0", True) is None
+        assert cache.get(file_hash, "pymupdf4llm-1.0", False) is None
+
+    def test_hash_file_matches_hash_bytes(self, tmp_path):
+        pdf_path = tmp_path / "livro.pdf"
+        pdf_path.write_bytes(b"%PDF-1.4 conteudo")
+
+        assert ConversionCache.hash_file(str(pdf_path)) == ConversionCache.hash_bytes(b"%PDF-1.4 conteudo")
+
+    def test_lru_eviction_by_size(self, tmp_path):
+        cache = ConversionCache(cache_dir=str(tmp_path / "cache"), max_bytes=10**9)
+        payload = os.urandom(4000).hex()  # incompressível o bastante
+        cache.put("a" * 64, "conv", True, payload)
+        time.sleep(0.02)
+        cache.put("b" * 64, "conv", True, payload)
+        time.sleep(0.02)
+        cache.get("a" * 64, "conv", True)  # "a" passa a ser o mais recente
+        entry_size = max(p.stat().st_size for p in (tmp_path / "cache").glob("*.gz"))
+        cache.max_bytes = entry_size * 2
+
+        cache.put("c" * 64, "conv", True, payload)
+
+        assert cache.get("a" * 64, "conv", True) == payload
+        assert cache.get("b" * 64, "conv", True) is None
+        assert cache.get("c" * 64, "conv", True) == payload
+
+    def test_concurrent_puts_of_same_entry_use_distinct_temp_files(self, tmp_path):
+        cache = ConversionCache(cache_dir=str(tmp_path))
+        texts = [f"versão {i} " * 2000 for i in range(16)]
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            paths = list(pool.map(lambda t: cache.put("a" * 64, "conv", True, t), texts))
+
+        assert all(paths)
+        assert cache.get("a" * 64, "conv", True) in texts
+        assert not list(tmp_path.glob("*.tmp"))
+
+
+class TestFallbackConversionsAreNotCached:
+    """Testes da chave do cache quando o PDF→MD cai para texto puro."""
+
+    def test_read_file_reports_fallback_converter(self, tmp_path, monkeypatch):
+        from src import document_reader
+
+        pdf_path = tmp_path / "livro.pdf"
+        pdf_path.write_bytes(b"%PDF-1.4 conteudo")
+
+        def fail(*args, **kwargs):
+            raise Exception("falha transitória")
+
+        monkeypatch.setattr(document_reader, "PYMUPDF4LLM_AVAILABLE", True)
+        monkeypatch.setattr(document_reader, "read_pdf_to_markdown", fail)
+        monkeypatch.setattr(document_reader, "read_pdf_plain_text", lambda *a, **k: "texto puro")
+        monkeypatch.setattr(
+            document_reader, "get_converter_signature",
+            lambda prefer_markdown=True, parallel_workers=0: "md-1" if prefer_markdown else "plain-1"
+        )
+
+        assert document_reader.read_file_with_converter(str(pdf_path)) == ("texto puro", "plain-1")
+        assert document_reader.read_file(str(pdf_path)) == "texto puro"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("produced_by, cached", [("md-1", True), ("plain-1", False)])
+    async def test_only_markdown_output_is_cached(self, tmp_path, produced_by, cached):
+        from src.api import routes
+
+        cache = ConversionCache(cache_dir=str(tmp_path))
+        service = MagicMock()
+        service.convert = AsyncMock(return_value=("conteúdo", produced_by))
+
+        with patch.object(routes, "get_conversion_cache", return_value=cache), \
+             patch.object(routes, "get_conversion_service", return_value=service), \
+             patch.object(routes, "get_converter_signature", return_value="md-1"):
+            text, cache_hit = await routes._convert_pdf_cached("livro.pdf", b"%PDF-1.4 livro")
+
+        assert (text, cache_hit) == ("conteúdo", False)
+        stored = cache.get(cache.hash_bytes(b"%PDF-1.4 livro"), "md-1", True)
+        assert (stored == "conteúdo") is cached
+
+    @pytest.mark.asyncio
+    async def test_cache_io_runs_off_the_event_loop(self, tmp_path):
+        from src.api import routes
+
+        loop_thread = threading.current_thread()
+        calls = []
+
+        class RecordingCache(ConversionCache):
+            def hash_bytes(self, data):
+                calls.append(("hash", threading.current_thread()))
+                return super().hash_bytes(data)
+
+            def get(self, *args):
+                calls.append(("get", threading.current_thread()))
+                return super().get(*args)
+
+            def put(self, *args):
+                calls.append(("put", threading.current_thread()))
+                return super().put(*args)
+
+        cache = RecordingCache(cache_dir=str(tmp_path))
+        service = MagicMock()
+        service.convert = AsyncMock(return_value=("conteúdo", "md-1"))
+
+        with patch.object(routes, "get_conversion_cache", return_value=cache), \
+             patch.object(routes, "get_conversion_service", return_value=service), \
+             patch.object(routes, "get_converter_signature", return_value="md-1"):
+            await routes._convert_pdf_cached("livro.pdf", b"%PDF-1.4 livro")
+
+        assert [name for name, _ in calls] == ["hash", "get", "put"]
+        assert all(thread is not loop_thread for _, thread in calls)
@@ -0,0 +1,73 @@
+"""
+Testes unitários para o serviço de conversão de documentos.
+
+Garante execução fora do event loop (thread ou pool de processos), timeout
+por job e recuperação do pool após timeout.
+"""
+import asyncio
+import time
+
+import pytest
+
+from src.conversion_service import ConversionService
+from src.exceptions import ConversionTimeoutError
+
+
+def fake_reader(file_path: str, prefer_markdown: bool = True) -> str:
+    """Leitor de teste (nível de módulo para ser serializável pelo pool)."""
+    if file_path == "lento.pdf":
+        time.sleep(5)
+    return f"{file_path}:{'md' if prefer_markdown else 'txt'}"
+
+
+class TestConversionService:
+    """Testes do serviço de conversão."""
+
+    @pytest.mark.asyncio
+    async def test_without_pool_runs_in_thread(self):
+        service = ConversionService()
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        def slow_reader(file_path, prefer_markdown=True):
+            time.sleep(0.1)
+            return "ok"
+
+        ticker_task = asyncio.create_task(ticker())
+        result = await service.convert("livro.pdf", reader=slow_reader)
+        ticker_task.cancel()
+
+        assert result == "ok"
+        assert ticks > 3  # event loop continuou respondendo durante a conversão
+
+    @pytest.mark.asyncio
+    async def test_pool_converts_documents(self):
+        service = ConversionService(max_workers=2)
+        service.start()
+        try:
+            results = await asyncio.gather(
+                service.convert("a.pdf", reader=fake_reader),
+                service.convert("b.txt", prefer_markdown=False, reader=fake_reader)
+            )
+        finally:
+            service.shutdown()
+
+        assert results == ["a.pdf:md", "b.txt:txt"]
+
+    @pytest.mark.asyncio
+    async def test_timeout_recycles_pool(self):
+        service = ConversionService(max_workers=1, timeout=0.5)
+        service.start()
+        try:
+            with pytest.raises(ConversionTimeoutError):
+                await service.convert("lento.pdf", reader=fake_reader)
+
+            # Pool reciclado continua atendendo novos jobs
+            assert await service.convert("c.pdf", reader=fake_reader) == "c.pdf:md"
+        finally:
+            service.shutdown()
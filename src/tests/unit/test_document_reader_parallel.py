@@ -0,0 +1,54 @@
+"""
+Testes unitários para a conversão de PDF paralela por faixas de páginas.
+
+Garante divisão balanceada das páginas e saída costurada na ordem original,
+com marcadores `--- Página N ---` absolutos.
+"""
+import pytest
+
+from src import document_reader
+from src.document_reader import read_file, split_page_ranges
+
+pymupdf = pytest.importorskip("pymupdf")
+
+
+@pytest.fixture
+def sample_pdf(tmp_path):
+    """PDF com 20 páginas, cada uma com texto identificável."""
+    pdf_path = tmp_path / "livro.pdf"
+    doc = pymupdf.open()
+    for page_number in range(1, 21):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Conteudo da pagina {page_number}")
+    doc.save(str(pdf_path))
+    doc.close()
+    return str(pdf_path)
+
+
+class TestSplitPageRanges:
+    """Testes da divisão de páginas."""
+
+    def test_balanced_contiguous_ranges(self):
+        assert split_page_ranges(10, 3) == [(0, 4), (4, 7), (7, 10)]
+
+    def test_more_shards_than_pages(self):
+        assert split_page_ranges(2, 5) == [(0, 1), (1, 2)]
+
+
+class TestShardedConversion:
+    """Testes da conversão paralela."""
+
+    @pytest.mark.skipif(not document_reader.PDFPLUMBER_AVAILABLE, reason="pdfplumber não instalado")
+    def test_plain_text_matches_serial_output(self, sample_pdf):
+        serial = read_file(sample_pdf, prefer_markdown=False, parallel_workers=0)
+        sharded = read_file(sample_pdf, prefer_markdown=False, parallel_workers=2)
+
+        assert sharded == serial
+        assert "--- Página 20 ---" in sharded
+
+    @pytest.mark.skipif(not document_reader.PYMUPDF4LLM_AVAILABLE, reason="pymupdf4llm não instalado")
+    def test_markdown_keeps_page_order(self, sample_pdf):
+        sharded = read_file(sample_pdf, prefer_markdown=True, parallel_workers=2)
+
+        positions = [sharded.index(f"pagina {n} ") for n in (1, 10, 11, 20)]
+        assert positions == sorted(positions)
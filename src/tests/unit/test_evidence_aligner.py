@@ -0,0 +1,152 @@
+"""
+Testes unitários para o MinHashAligner.
+
+Garante que paráfrases (sentenças que não aparecem literalmente no texto)
+são alinhadas ao segmento certo com similaridade estimada, que o orçamento
+de latência é respeitado e que o TextTracker usa o alinhamento aproximado
+só quando a busca exata falha.
+"""
+import random
+import threading
+import time
+
+import pytest
+
+from src.evidence_aligner import MinHashAligner, content_tokens
+
+
+def _topic_text(topics: int = 3, words_per_topic: int = 500, seed: int = 5) -> str:
+    rng = random.Random(seed)
+    fillers = ["de", "a", "o", "que", "em"]
+    words = []
+    for topic in range(1, topics + 1):
+        vocabulary = [f"tema{topic}termo{j}" for j in range(40)]
+        words.extend(
+            rng.choice(vocabulary) if rng.random() < 0.6 else rng.choice(fillers)
+            for _ in range(words_per_topic)
+        )
+    return " ".join(words)
+
+
+def _paraphrase(topic: int, seed: int = 9) -> str:
+    rng = random.Random(seed)
+    terms = rng.sample([f"tema{topic}termo{j}" for j in range(40)], 10)
+    return "O autor mostra que " + " e ".join(terms) + " explicam o argumento"
+
+
+@pytest.fixture
+def tracker_class(monkeypatch):
+    monkeypatch.syspath_prepend("src")
+    from tracker import TextTracker
+    return TextTracker
+
+
+class TestMinHashAligner:
+    """Testes do índice MinHash/LSH."""
+
+    def test_content_tokens_drop_short_words_and_punctuation(self):
+        assert content_tokens("O Livro, de fato: ideias!") == ["livro", "fato", "ideias"]
+
+    def test_signature_estimates_jaccard(self, tracker_class):
+        aligner = MinHashAligner(tracker_class("x"), num_perm=128)
+        first = [f"termo{i}" for i in range(100)]
+        second = [f"termo{i}" for i in range(50, 150)]
+
+        agreement = sum(
+            a == b for a, b in zip(aligner.signature(first), aligner.signature(second))
+        ) / 128
+
+        assert aligner.signature(first) == aligner.signature(list(reversed(first)))
+        assert abs(agreement - 1 / 3) < 0.15
+
+    @pytest.mark.parametrize("topic", [1, 2, 3])
+    def test_paraphrase_is_aligned_to_its_segment(self, tracker_class, topic):
+        tracker = tracker_class(_topic_text())
+        aligner = MinHashAligner(tracker)
+
+        matches = aligner.align(_paraphrase(topic), top_k=2)
+
+        assert matches and matches[0].segment_id == topic
+        assert 0 < matches[0].similarity <= 1
+        assert len(matches) <= 2
+
+    def test_unrelated_sentence_has_no_match(self, tracker_class):
+        aligner = MinHashAligner(tracker_class(_topic_text()))
+
+        assert aligner.align("Receitas italianas com massas frescas e molhos caseiros") == []
+
+    def test_budget_leaves_remaining_sentences_unmatched(self, tracker_class):
+        aligner = MinHashAligner(tracker_class(_topic_text()))
+        sentences = [_paraphrase(1), _paraphrase(2)]
+
+        assert aligner.align_all(sentences, budget_ms=0) == [[], []]
+        assert all(aligner.align_all(sentences, budget_ms=None))
+
+
+class TestFuzzyReferenceMap:
+    """Testes do alinhamento aproximado em create_reference_map."""
+
+    def test_paraphrases_get_scored_references_in_order(self, tracker_class):
+        text = _topic_text()
+        tracker = tracker_class(text, alignment_budget_ms=None)
+        literal = " ".join(text.split()[510:520])
+        summary = f"{_paraphrase(3)}. {literal}. {_paraphrase(1)}."
+
+        reference_map = tracker.create_reference_map(summary)
+
+        keys = list(reference_map)
+        assert keys[1] == literal
+        assert reference_map[literal] == [tracker.get_segment_reference(2)]
+        assert reference_map[keys[0]][0].startswith(tracker.get_segment_reference(3) + " (similaridade ~")
+        assert reference_map[keys[2]][0].startswith(tracker.get_segment_reference(1))
+
+    def test_disabled_fuzzy_alignment_keeps_exact_only(self, tracker_class):
+        tracker = tracker_class(_topic_text(), fuzzy_alignment=False)
+
+        assert tracker.create_reference_map(f"{_paraphrase(2)}.") == {}
+        assert tracker._aligner is None
+
+
+class TestAlignmentIndexBudget:
+    """Testes do orçamento de latência incluindo a construção do índice."""
+
+    def test_budget_includes_index_construction(self, tracker_class):
+        tracker = tracker_class(_topic_text(topics=60), alignment_budget_ms=20)
+        summary = f"{_paraphrase(7)}."
+
+        start = time.perf_counter()
+        first = tracker.create_reference_map(summary)
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.15
+        assert first == {}
+        assert not tracker._aligner.is_built
+
+        # A construção continua de onde parou nas chamadas seguintes
+        for _ in range(500):
+            reference_map = tracker.create_reference_map(summary)
+            if reference_map:
+                break
+        assert tracker._aligner.is_built
+        assert list(reference_map.values())[0][0].startswith(tracker.get_segment_reference(7))
+
+    @pytest.mark.asyncio
+    async def test_prepare_alignment_async_builds_off_the_event_loop(self, tracker_class):
+        tracker = tracker_class(_topic_text(topics=60), alignment_budget_ms=20)
+        build_threads = []
+        prepare = tracker.prepare_alignment
+
+        def recording_prepare():
+            build_threads.append(threading.current_thread())
+            prepare()
+
+        tracker.prepare_alignment = recording_prepare
+
+        task = tracker.prepare_alignment_async()
+        assert tracker.prepare_alignment_async() is task
+        await task
+
+        assert build_threads and build_threads[0] is not threading.main_thread()
+        assert tracker._aligner.is_built
+        reference_map = tracker.create_reference_map(f"{_paraphrase(42)}.")
+        assert list(reference_map.values())[0][0].startswith(tracker.get_segment_reference(42))
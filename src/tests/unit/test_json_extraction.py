@@ -0,0 +1,79 @@
+"""
+Testes unitários para a extração tolerante de JSON.
+
+Garante parse direto, recuperação de respostas com cercas/prosa ou
+truncadas, contadores de falha e uso de JSON mode na extração de chunks.
+"""
+import json
+import sys
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.chapter_summarizer import ChapterSummarizer
+from src.json_extraction import (
+    JSON_OBJECT_FORMAT, PARSE_DIRECT, PARSE_FAILED, PARSE_RECOVERED,
+    JSONParseStats, extract_json
+)
+from src.process_metadata_collector import ProcessMetadataCollector
+
+
+class TestExtractJson:
+    """Testes do extrator tolerante."""
+
+    def test_direct_parse(self):
+        assert extract_json('{"concepts": ["A"]}') == ({'concepts': ['A']}, PARSE_DIRECT)
+
+    def test_fenced_and_prose_wrapped_json(self):
+        fenced = 'Segue a extração:\n```json\n{"concepts": ["A"], "ideas": []}\n```\nEspero ter ajudado.'
+        prose = '[nota] Resultado: {"concepts": ["B"]} fim'
+
+        assert extract_json(fenced) == ({'concepts': ['A'], 'ideas': []}, PARSE_RECOVERED)
+        assert extract_json(prose) == ({'concepts': ['B']}, PARSE_RECOVERED)
+
+    def test_truncated_output_keeps_complete_elements(self):
+        truncated_string = '{"concepts": ["A", "B"], "ideas": ["uma ide'
+        truncated_key = '{"concepts": ["A"], "ideas": ["uma ideia"], "exam'
+
+        assert extract_json(truncated_string) == (
+            {'concepts': ['A', 'B'], 'ideas': ['uma ide']}, PARSE_RECOVERED
+        )
+        assert extract_json(truncated_key) == (
+            {'concepts': ['A'], 'ideas': ['uma ideia']}, PARSE_RECOVERED
+        )
+
+    def test_failure_without_json(self):
+        assert extract_json("Não encontrei conceitos.") == (None, PARSE_FAILED)
+        assert extract_json("") == (None, PARSE_FAILED)
+
+    def test_stats_failure_rate(self):
+        stats = JSONParseStats()
+        for outcome in (PARSE_DIRECT, PARSE_RECOVERED, PARSE_FAILED, PARSE_DIRECT):
+            stats.record(outcome)
+
+        assert stats.to_dict() == {
+            'direct': 2, 'recovered': 1, 'failed': 1, 'total': 4, 'failure_rate': 0.25
+        }
+
+
+class TestExtractionJsonMode:
+    """Testes da extração de chunks com JSON mode e parse tolerante."""
+
+    @pytest.mark.asyncio
+    async def test_fenced_response_is_used_and_recorded(self):
+        mock_module = MagicMock()
+        mock_module.AsyncOpenAIClient = MagicMock(return_value=AsyncMock())
+        collector = ProcessMetadataCollector()
+        with patch.dict(sys.modules, {'summarizer': mock_module}):
+            summarizer = ChapterSummarizer(metadata_collector=collector, json_mode=True)
+        summarizer.client.complete = AsyncMock(
+            return_value='```json\n' + json.dumps({'concepts': ['Dopamina']}) + '\n```'
+        )
+
+        extractions = await summarizer._extract_from_chunks(
+            [{'chunk_id': 'cap_1_chunk_0', 'text': 'Texto\ncom\nlinhas'}]
+        )
+
+        assert extractions[0]['concepts'] == ['Dopamina']
+        assert summarizer.client.complete.call_args.kwargs['response_format'] == JSON_OBJECT_FORMAT
+        assert collector.to_dict()['json_parse']['recovered'] == 1
@@ -0,0 +1,56 @@
+"""
+Testes unitários para o cache persistente de respostas do LLM.
+
+Garante chave endereçada por conteúdo, TTL, expulsão LRU e bypass por
+temperatura.
+"""
+import time
+
+from src.llm_cache import LLMResponseCache, is_cacheable_temperature
+
+
+def _key(user_message: str = "prompt", salt=None) -> str:
+    return LLMResponseCache.make_key("gpt-4o-mini", "system", user_message, 0.3, 500, salt)
+
+
+class TestLLMResponseCache:
+    """Testes do cache SQLite."""
+
+    def test_roundtrip_persists_across_instances(self, tmp_path):
+        db_path = tmp_path / "llm_cache.sqlite3"
+        LLMResponseCache(db_path=str(db_path)).set(_key(), "resposta")
+
+        assert LLMResponseCache(db_path=str(db_path)).get(_key()) == "resposta"
+
+    def test_key_depends_on_salt_and_prompt(self):
+        assert _key() == _key()
+        assert _key() != _key("outro prompt")
+        assert _key(salt="attempt:1") != _key(salt="attempt:2")
+
+    def test_expired_entries_are_misses(self, tmp_path):
+        cache = LLMResponseCache(db_path=str(tmp_path / "c.sqlite3"), ttl_seconds=0.01)
+        cache.set(_key(), "resposta")
+        time.sleep(0.02)
+
+        assert cache.get(_key()) is None
+        assert len(cache) == 0
+
+    def test_lru_eviction_keeps_recently_used(self, tmp_path):
+        cache = LLMResponseCache(db_path=str(tmp_path / "c.sqlite3"), max_entries=2)
+        cache.set(_key("a"), "A")
+        time.sleep(0.01)
+        cache.set(_key("b"), "B")
+        time.sleep(0.01)
+        cache.get(_key("a"))
+        time.sleep(0.01)
+        cache.set(_key("c"), "C")
+
+        cache.evict()
+
+        assert cache.get(_key("a")) == "A"
+        assert cache.get(_key("b")) is None
+        assert cache.get(_key("c")) == "C"
+
+    def test_high_temperature_bypasses_cache(self):
+        assert is_cacheable_temperature(0.3)
+        assert not is_cacheable_temperature(0.9)
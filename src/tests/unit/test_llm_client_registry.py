@@ -0,0 +1,58 @@
+"""
+Testes unitários para o registro do cliente LLM compartilhado.
+
+Garante ciclo de vida (fechado por padrão, abertura e fechamento) e a
+injeção do cliente compartilhado no ChapterSummarizer.
+"""
+import sys
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.chapter_summarizer import ChapterSummarizer
+from src.llm_client_registry import LLMClientRegistry
+
+
+class TestLLMClientRegistry:
+    """Testes do ciclo de vida do registro."""
+
+    def test_closed_registry_has_no_client(self):
+        registry = LLMClientRegistry()
+
+        assert not registry.is_open
+        assert registry.client is None
+
+    def test_open_without_api_key_stays_closed(self, monkeypatch):
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+        registry = LLMClientRegistry()
+
+        assert registry.open() is False
+        assert registry.client is None
+
+    @pytest.mark.asyncio
+    async def test_open_and_close_shared_pool(self):
+        httpx = pytest.importorskip("httpx")
+        mock_module = MagicMock()
+        registry = LLMClientRegistry(max_connections=5, max_keepalive_connections=2)
+
+        with patch.dict(sys.modules, {'summarizer': mock_module}):
+            assert registry.open(api_key="sk-test") is True
+
+        assert registry.client is mock_module.AsyncOpenAIClient.return_value
+        assert isinstance(registry._http_client, httpx.AsyncClient)
+        await registry.close()
+        assert registry.client is None
+
+
+class TestClientInjection:
+    """Testes da injeção do cliente compartilhado."""
+
+    def test_chapter_summarizer_uses_injected_client(self):
+        shared_client = AsyncMock()
+        mock_module = MagicMock()
+
+        with patch.dict(sys.modules, {'summarizer': mock_module}):
+            summarizer = ChapterSummarizer(client=shared_client)
+
+        assert summarizer.client is shared_client
+        mock_module.AsyncOpenAIClient.assert_not_called()
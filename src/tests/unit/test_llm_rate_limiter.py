@@ -0,0 +1,169 @@
+"""
+Testes unitários para o limitador global de chamadas ao LLM.
+
+Garante limites de RPM/TPM, teto de requisições simultâneas (por processo,
+entre event loops), leitura de Retry-After e ajuste adaptativo dos limites.
+"""
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from src.llm_rate_limiter import (
+    LLMRateLimiter,
+    TokenBucket,
+    estimate_tokens,
+    parse_retry_after,
+)
+
+
+class FakeClock:
+    """Relógio controlado manualmente."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class RateLimitError(Exception):
+    """Simula openai.RateLimitError com headers de resposta."""
+
+    def __init__(self, headers):
+        super().__init__("429")
+        self.status_code = 429
+        self.response = SimpleNamespace(headers=headers)
+
+
+class TestTokenBucket:
+    """Testes do token bucket."""
+
+    def test_waits_after_capacity_is_consumed(self):
+        clock = FakeClock()
+        bucket = TokenBucket(capacity_per_minute=60, clock=clock)
+
+        bucket.consume(60)
+
+        assert bucket.time_until_available(1) == pytest.approx(1.0)
+        clock.now = 1.0
+        assert bucket.time_until_available(1) == 0.0
+
+
+class TestRetryAfter:
+    """Testes de parsing do header Retry-After."""
+
+    def test_seconds_and_milliseconds(self):
+        assert parse_retry_after(RateLimitError({"retry-after": "3"})) == 3.0
+        assert parse_retry_after(RateLimitError({"retry-after-ms": "250"})) == 0.25
+
+    def test_missing_header(self):
+        assert parse_retry_after(RuntimeError("sem resposta")) is None
+
+
+class TestLLMRateLimiter:
+    """Testes do limitador global."""
+
+    def test_estimate_tokens_includes_output_budget(self):
+        assert estimate_tokens("a" * 40, "b" * 360, 500) == 600
+
+    def test_tpm_budget_blocks_large_requests(self):
+        clock = FakeClock()
+        limiter = LLMRateLimiter(max_rpm=1000, max_tpm=1200, clock=clock)
+        limiter.tokens.consume(1000)
+
+        assert limiter.time_until_ready(600) == pytest.approx(20.0)
+
+    def test_rate_limit_applies_cooldown_and_decreases_limits(self):
+        clock = FakeClock()
+        limiter = LLMRateLimiter(max_rpm=100, max_tpm=10000, clock=clock)
+
+        cooldown = limiter.record_failure(RateLimitError({"retry-after": "5"}))
+
+        assert cooldown == 5.0
+        assert limiter.time_until_ready(1) == pytest.approx(5.0)
+        assert limiter.current_rpm == 50
+        assert limiter.current_tpm == 5000
+
+    def test_non_rate_limit_errors_are_ignored(self):
+        limiter = LLMRateLimiter(max_rpm=100)
+
+        assert limiter.record_failure(RuntimeError("timeout")) is None
+        assert limiter.current_rpm == 100
+
+    def test_successes_restore_limits_gradually(self):
+        limiter = LLMRateLimiter(max_rpm=100, max_tpm=10000, clock=FakeClock())
+        limiter.record_failure(RateLimitError({"retry-after": "0"}))
+
+        for _ in range(LLMRateLimiter.SUCCESSES_BEFORE_INCREASE):
+            limiter.record_success()
+
+        assert limiter.current_rpm == pytest.approx(55)
+
+    @pytest.mark.asyncio
+    async def test_caps_requests_in_flight(self):
+        limiter = LLMRateLimiter(max_rpm=1000, max_tpm=100000, max_in_flight=2)
+        in_flight = 0
+        peak = 0
+
+        async def call():
+            nonlocal in_flight, peak
+            async with limiter.slot(10):
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.01)
+                in_flight -= 1
+
+        await asyncio.gather(*[call() for _ in range(6)])
+
+        assert peak == 2
+
+    def test_in_flight_cap_is_shared_across_event_loops(self):
+        limiter = LLMRateLimiter(max_rpm=1000, max_tpm=100000, max_in_flight=2)
+        counter = threading.Lock()
+        in_flight = 0
+        peak = 0
+
+        async def call():
+            nonlocal in_flight, peak
+            async with limiter.slot(10):
+                with counter:
+                    in_flight += 1
+                    peak = max(peak, in_flight)
+                await asyncio.sleep(0.02)
+                with counter:
+                    in_flight -= 1
+
+        async def run_loop():
+            await asyncio.gather(*[call() for _ in range(3)])
+
+        threads = [threading.Thread(target=asyncio.run, args=(run_loop(),)) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert peak == 2
+        assert in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_leak_slot(self):
+        limiter = LLMRateLimiter(max_rpm=1000, max_tpm=100000, max_in_flight=1)
+        release = asyncio.Event()
+
+        async def holder():
+            async with limiter.slot(10):
+                await release.wait()
+
+        holding = asyncio.create_task(holder())
+        await asyncio.sleep(0)
+        waiting = asyncio.create_task(holder())
+        await asyncio.sleep(0)
+        waiting.cancel()
+        release.set()
+        await asyncio.gather(holding, waiting, return_exceptions=True)
+
+        async with limiter.slot(10):
+            pass
+        assert waiting.cancelled()
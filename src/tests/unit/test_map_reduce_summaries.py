@@ -0,0 +1,161 @@
+"""
+Testes unitários para o pipeline map-once / reduce-per-spec do BookSummarizer.
+
+Garante que cada chunk é resumido uma única vez (SummarySpecs.MAP), que cada
+spec executa apenas a sua etapa de reduce sobre os mesmos resumos de chunks e
+que resumos que não cabem no meta-prompt são dobrados em árvore.
+"""
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.token_budget import TokenBudget
+
+
+@pytest.fixture
+def summarizer_module(monkeypatch):
+    monkeypatch.syspath_prepend("src")
+    # Testes de integração deixam um módulo 'summarizer' falso em sys.modules
+    with patch.dict(sys.modules):
+        sys.modules.pop('summarizer', None)
+        import summarizer
+    return summarizer
+
+
+def _book_summarizer(module, complete, **kwargs):
+    client = MagicMock()
+    client.complete = complete
+    return module.BookSummarizer(
+        llm_client=client, chunk_word_target=100, chunk_overlap_words=0, use_chapters=False,
+        **kwargs
+    )
+
+
+class TestMapOnceReducePerSpec:
+    """Testes de _collect_all_summaries_async."""
+
+    @pytest.mark.asyncio
+    async def test_chunks_are_mapped_once_for_all_specs(self, summarizer_module):
+        prompts = []
+
+        async def complete(*args, **kwargs):
+            prompts.append(kwargs['user_message'])
+            return "resumo denso"
+
+        summarizer = _book_summarizer(summarizer_module, complete)
+        text = " ".join(f"palavra{i}." for i in range(3000))
+        chunks = summarizer.chunk_processor.chunk_text(text)
+
+        results = await summarizer._collect_all_summaries_async(text, None, None)
+
+        specs = summarizer_module.SummarySpecs
+        map_prompts = [p for p in prompts if specs.MAP.instruction in p]
+        reduce_prompts = [p for p in prompts if "resumos parciais" in p]
+        assert set(results) == set(specs.CONFIGS)
+        assert len(chunks) > 1
+        assert len(map_prompts) == len(chunks)
+        assert len(reduce_prompts) == len(specs.CONFIGS)
+        assert len(prompts) == len(map_prompts) + len(reduce_prompts)
+
+    @pytest.mark.asyncio
+    async def test_single_chunk_is_summarized_directly_per_spec(self, summarizer_module):
+        prompts = []
+
+        async def complete(*args, **kwargs):
+            prompts.append(kwargs['user_message'])
+            return "resumo"
+
+        summarizer = _book_summarizer(summarizer_module, complete)
+
+        await summarizer._collect_all_summaries_async("Texto curto de teste.", None, None)
+
+        specs = summarizer_module.SummarySpecs
+        assert len(prompts) == len(specs.CONFIGS)
+        assert all(specs.MAP.instruction not in p and "resumos parciais" not in p for p in prompts)
+
+
+class TestTreeReduce:
+    """Testes de _reduce_chunk_summaries_async."""
+
+    @pytest.mark.asyncio
+    async def test_oversized_summaries_are_folded_before_meta(self, summarizer_module):
+        prompts = []
+
+        async def complete(*args, **kwargs):
+            prompts.append(kwargs['user_message'])
+            return "síntese " * 20
+
+        summarizer = _book_summarizer(
+            summarizer_module, complete,
+            token_budget=TokenBudget(context_tokens=3000), reduce_fan_in=4
+        )
+        specs = summarizer_module.SummarySpecs
+        chunk_summaries = ["resumo denso " * 40 for _ in range(30)]
+
+        meta, timings = await summarizer._reduce_chunk_summaries_async(
+            chunk_summaries, specs.CONFIGS["longo"], ""
+        )
+
+        partial_reductions = [p for p in prompts if specs.MAP.instruction in p]
+        assert meta == "síntese " * 20
+        assert timings["depth"] >= 1
+        assert timings["levels"][0] == {
+            "level": 1, "inputs": 30, "groups": 8, "seconds": timings["levels"][0]["seconds"]
+        }
+        assert len(partial_reductions) == sum(level["groups"] for level in timings["levels"])
+        assert specs.CONFIGS["longo"].instruction in prompts[-1]
+
+    @pytest.mark.asyncio
+    async def test_reduce_timings_are_reported(self, summarizer_module):
+        async def complete(*args, **kwargs):
+            return "resumo denso"
+
+        summarizer = _book_summarizer(summarizer_module, complete)
+        text = " ".join(f"palavra{i}." for i in range(3000))
+
+        result = await summarizer.generate_all_summaries_async(
+            text, include_tracking=False, validate_quality=False
+        )
+
+        reduce_timings = result["timings"]["reduce"]
+        assert set(reduce_timings) == set(summarizer_module.SummarySpecs.CONFIGS)
+        assert all(t == {"depth": 0, "levels": []} for t in reduce_timings.values())
+
+
+class TestRegenerationBypassesCache:
+    """Testes das regenerações após reprovação no Quality Gate."""
+
+    @pytest.mark.asyncio
+    async def test_failed_validation_gets_new_llm_responses(self, summarizer_module):
+        cache = {}
+        calls = []
+
+        async def complete(*args, **kwargs):
+            calls.append(kwargs)
+            key = (kwargs['user_message'], kwargs.get('cache_salt'))
+            if kwargs.get('use_cache', True) and key in cache:
+                return cache[key]
+            response = f"resposta {len(calls)}"
+            if kwargs.get('use_cache', True):
+                cache[key] = response
+            return response
+
+        summarizer = _book_summarizer(summarizer_module, complete)
+        validator = MagicMock()
+        failed = {key: (False, ["Conteúdo: ruim"]) for key in summarizer_module.SummarySpecs.CONFIGS}
+        passed = {key: (True, []) for key in summarizer_module.SummarySpecs.CONFIGS}
+        validator.validate_all_summaries.side_effect = [failed, passed]
+        summarizer.quality_gate.validator_for = MagicMock(return_value=validator)
+        text = " ".join(f"palavra{i}." for i in range(3000))
+
+        first = await summarizer._collect_all_summaries_async(text, None, None)
+        result = await summarizer.generate_all_summaries_async(text, include_tracking=False)
+
+        assert validator.validate_all_summaries.call_count == 2
+        first_attempt = validator.validate_all_summaries.call_args_list[0].args[0]
+        assert first_attempt == {key: sr.content for key, sr in first.items()}
+        assert all(result[key] != first_attempt[key] for key in first_attempt)
+        retry_calls = calls[2 * len(calls) // 3:]
+        assert retry_calls and all(call['use_cache'] is False for call in retry_calls)
+        assert all(call['cache_salt'] == "attempt:2" for call in retry_calls)
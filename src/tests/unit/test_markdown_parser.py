@@ -0,0 +1,48 @@
+"""
+Testes unitários para MarkdownParser.
+
+Garante a varredura única de headers (todos os níveis com offsets) e o
+texto de capítulo obtido por fatia de offsets.
+"""
+from src.markdown_parser import MarkdownParser
+
+BOOK = "\n".join([
+    "# Livro",
+    "## Capítulo **Um**",
+    "texto do primeiro capítulo",
+    "--- Página 1 ---",
+    "### Seção",
+    "## Capítulo Dois",
+    "texto do segundo",
+    "## CONTENTS",
+    "## Capítulo Três",
+    "fim do livro",
+])
+
+
+class TestMarkdownParser:
+    """Testes do parser Markdown."""
+
+    def test_scan_collects_all_levels_with_offsets(self):
+        headers = MarkdownParser()._scan_headers(BOOK.split("\n"))
+
+        assert [h['title'] for h in headers[1]] == ["Livro"]
+        assert [h['title'] for h in headers[2]] == ["Capítulo Um", "Capítulo Dois", "Capítulo Três"]
+        assert [h['title'] for h in headers[3]] == ["Seção"]
+        for level_headers in headers.values():
+            for header in level_headers:
+                assert BOOK[header['start_pos']:].startswith("#")
+
+    def test_chapter_offsets_match_line_join(self):
+        parser = MarkdownParser()
+        lines = BOOK.split("\n")
+
+        chapters = parser.parse_chapters(BOOK)
+
+        assert [c.title for c in chapters] == ["Capítulo Um", "Capítulo Dois", "Capítulo Três"]
+        assert chapters[0].page_markers == [1]
+        assert chapters[-1].end_pos == len(BOOK) + 1
+        for current, following in zip(chapters, chapters[1:] + [None]):
+            end_line = following.start_line if following else len(lines)
+            expected = "\n".join(lines[current.start_line:end_line])
+            assert parser.chapter_text(BOOK, current.start_pos, current.end_pos) == expected
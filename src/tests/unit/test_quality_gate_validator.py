@@ -0,0 +1,81 @@
+"""
+Testes unitários para o SummaryValidator do QualityGate.
+
+Garante que o vocabulário do texto original é calculado uma vez por documento,
+que as medidas de cada resumo ficam em cache e que os resultados são os mesmos
+dos critérios de validação do QualityGate.
+"""
+from unittest.mock import patch
+
+from src import quality_gate
+from src.quality_gate import QualityGate
+
+ORIGINAL = (
+    "A aprendizagem profunda transformou a visão computacional. "
+    "Redes neurais convolucionais reconhecem padrões complexos em imagens. "
+) * 50
+SUMMARY = (
+    "Este resumo explica como a aprendizagem profunda mudou a visão computacional moderna. "
+    "As redes neurais convolucionais reconhecem padrões em grandes conjuntos de imagens."
+)
+BULLETS = "\n".join(f"- Redes neurais aprendem padrões complexos, item {i}." for i in range(6))
+
+
+class TestSummaryValidator:
+    """Testes do validador por documento."""
+
+    def test_validator_is_reused_for_the_same_text(self):
+        gate = QualityGate()
+
+        validator = gate.validator_for(ORIGINAL)
+
+        assert gate.validator_for(ORIGINAL) is validator
+        # Chave é o hash do texto, não a identidade do objeto str
+        assert gate.validator_for("".join(list(ORIGINAL))) is validator
+        assert gate.validator_for(ORIGINAL + " ") is not validator
+        assert "aprendizagem" in validator.source_vocabulary
+        assert isinstance(validator.source_vocabulary, frozenset)
+
+    def test_source_vocabulary_is_built_once_across_specs_and_retries(self):
+        gate = QualityGate()
+        summaries = {"curto": SUMMARY, "medio": SUMMARY, "longo": SUMMARY, "bullets": BULLETS}
+
+        with patch.object(quality_gate, "extract_keywords", wraps=quality_gate.extract_keywords) as spy:
+            for _ in range(3):
+                gate.validate_all_summaries(summaries, ORIGINAL)
+
+        texts = [call.args[0] for call in spy.call_args_list]
+        assert texts.count(ORIGINAL) == 1
+        # Uma vez por texto de resumo distinto
+        assert sorted(texts[1:]) == sorted([SUMMARY, BULLETS])
+
+    def test_gate_criteria_delegate_to_validator(self):
+        gate = QualityGate()
+        validator = gate.validator_for(ORIGINAL)
+        unrelated = "Texto qualquer sobre culinária italiana e receitas. Outra frase sobre massas frescas."
+
+        assert gate.validate_length(SUMMARY, "curto") == (
+            False, "Resumo tem apenas 23 palavras, mínimo esperado: 50"
+        )
+        assert gate.validate_length(BULLETS, "bullets") == (True, None)
+        assert gate.validate_structure("Sem pontuação", "curto") == (
+            False, "Resumo não contém sentenças completas suficientes"
+        )
+        assert gate.validate_structure("Texto corrido. Outra frase longa.", "bullets") == (
+            False, "Resumo de bullets não contém bullets formatados"
+        )
+        with patch.object(quality_gate.SummaryValidator, "validate_length", return_value=(True, None)) as spy:
+            assert gate.validate_length("x", "curto") == (True, None)
+        spy.assert_called_once_with("x", "curto")
+
+        assert validator.validate_content_quality(SUMMARY) == (True, None)
+        assert validator.validate_content_quality(unrelated)[0] is False
+        assert validator.validate_content_quality("curto") == (False, "Resumo muito curto ou vazio")
+
+    def test_validate_all_summaries_reports_each_type(self):
+        results = QualityGate().validate_all_summaries({"curto": SUMMARY, "bullets": BULLETS}, ORIGINAL)
+
+        assert set(results) == {"curto", "bullets"}
+        assert results["bullets"] == (True, [])
+        is_valid, errors = results["curto"]
+        assert not is_valid and errors[0].startswith("Comprimento:")
@@ -0,0 +1,154 @@
+"""
+Testes unitários para a RepairPolicy e o reparo em _audit_and_regenerate.
+
+Garante que resumos com poucos itens faltando são reparados por inserção de
+frases (sem regenerar o resumo) e que as decisões ficam registradas no
+ProcessMetadataCollector.
+"""
+import sys
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.chapter_detector import Chapter
+from src.chapter_summarizer import MARKERS_MAX_OUTPUT_TOKENS, ChapterSummarizer
+from src.process_metadata_collector import ProcessMetadataCollector
+from src.recall_auditor import AuditResult
+from src.recall_set import CriticalityReason, RecallSet, RecallSetItem
+from src.repair_policy import REPAIR_ADDENDUM, REPAIR_INSERT, REPAIR_REGENERATE, RepairPolicy
+
+MARKER_1 = "[[RS:cap2:09d6f1|chunks:1,2]]"
+MARKER_2 = "[[RS:cap2:d78f2f|chunks:3]]"
+MARKER_3 = "[[RS:cap2:a1b2c3|chunks:4]]"
+PARTIAL_SUMMARY = f"RESUMO:\nResumo com {MARKER_1} e {MARKER_3}.\n\nPONTOS-CHAVE:\n• Ponto 1"
+
+
+def _audit(missing=0, invented=0, invalid=0) -> AuditResult:
+    return AuditResult(
+        passed=False,
+        missing_markers=[f"RS:cap2:{i:06x}" for i in range(missing)],
+        invalid_chunks=["RS:cap2:ffffff:9"] * invalid,
+        invented_markers=["RS:cap2:eeeeee"] * invented,
+        errors=[]
+    )
+
+
+def _summarizer_module() -> MagicMock:
+    module = MagicMock()
+    module.AsyncOpenAIClient = MagicMock(return_value=AsyncMock())
+    module.SummarySpecs.BASE_SYSTEM_MESSAGE = "Sistema."
+    return module
+
+
+def _chapter() -> Chapter:
+    return Chapter(
+        number="2", title="Capítulo", start_pos=0, end_pos=40, start_line=0,
+        page_markers=[], word_count=8, pattern_matched="##", confidence=1.0
+    )
+
+
+def _recall_set() -> RecallSet:
+    return RecallSet(
+        chapter_number="2",
+        critical_items=[
+            RecallSetItem("RS:cap2:09d6f1", "Primeiro item", "critical",
+                          CriticalityReason.MULTI_CHUNK, [1, 2], 2),
+            RecallSetItem("RS:cap2:d78f2f", "Segundo item", "critical",
+                          CriticalityReason.MULTI_CHUNK, [3], 1),
+            RecallSetItem("RS:cap2:a1b2c3", "Terceiro item", "critical",
+                          CriticalityReason.MULTI_CHUNK, [4], 1),
+        ],
+        supporting_items=[]
+    )
+
+
+class TestRepairPolicy:
+    """Testes das decisões da política."""
+
+    def test_decisions_by_audit_result(self):
+        policy = RepairPolicy(max_missing_for_insert=2, max_missing_ratio_for_addendum=0.5)
+
+        assert policy.decide(_audit(missing=1), 12).action == REPAIR_INSERT
+        assert policy.decide(_audit(missing=2), 12).action == REPAIR_INSERT
+        assert policy.decide(_audit(missing=5), 12).action == REPAIR_ADDENDUM
+        assert policy.decide(_audit(missing=7), 12).action == REPAIR_REGENERATE
+        assert policy.decide(_audit(missing=1, invented=1), 12).action == REPAIR_REGENERATE
+        assert policy.decide(_audit(missing=1, invalid=1), 12).action == REPAIR_REGENERATE
+        assert policy.decide(_audit(), 12).action == REPAIR_REGENERATE
+
+
+class TestRepairInAuditLoop:
+    """Testes do reparo dentro de _audit_and_regenerate."""
+
+    @pytest.mark.asyncio
+    async def test_insertion_repairs_without_regenerating(self):
+        calls = []
+
+        async def complete(*args, **kwargs):
+            calls.append(kwargs['max_output_tokens'])
+            if "FRASES" in kwargs['user_message']:
+                return f"- O segundo item aparece no capítulo. {MARKER_2}"
+            return PARTIAL_SUMMARY
+
+        collector = ProcessMetadataCollector()
+        with patch.dict(sys.modules, {'summarizer': _summarizer_module()}):
+            summarizer = ChapterSummarizer(metadata_collector=collector)
+            summarizer.client.complete = complete
+
+            summary, regenerations, addendums = await summarizer._audit_and_regenerate(
+                _chapter(), _recall_set(), "Texto completo do capítulo de teste."
+            )
+
+        assert calls == [MARKERS_MAX_OUTPUT_TOKENS, 80]
+        assert (regenerations, addendums) == (1, 0)
+        body, key_points = summary.split("PONTOS-CHAVE:")
+        assert MARKER_2 in body and "Ponto 1" in key_points
+        decisions = collector.get_chapter_data("2").repair_decisions
+        assert [(d.action, d.result) for d in decisions] == [(REPAIR_INSERT, "passed")]
+        assert decisions[0].missing_markers == ["RS:cap2:d78f2f"]
+
+    @pytest.mark.asyncio
+    async def test_failed_insertion_goes_to_addendum(self):
+        prompts = []
+
+        async def complete(*args, **kwargs):
+            prompts.append(kwargs['user_message'])
+            if "bullets" in kwargs['user_message']:
+                return f"- Segundo item. {MARKER_2}"
+            if "FRASES" in kwargs['user_message']:
+                return "Frase sem marcador."
+            return PARTIAL_SUMMARY
+
+        collector = ProcessMetadataCollector()
+        with patch.dict(sys.modules, {'summarizer': _summarizer_module()}):
+            summarizer = ChapterSummarizer(metadata_collector=collector)
+            summarizer.client.complete = complete
+
+            summary, regenerations, addendums = await summarizer._audit_and_regenerate(
+                _chapter(), _recall_set(), "Texto completo do capítulo de teste."
+            )
+
+        assert len(prompts) == 3
+        assert (regenerations, addendums) == (1, 1)
+        assert "## Cobertura (itens críticos)" in summary
+        decisions = collector.get_chapter_data("2").repair_decisions
+        assert [(d.action, d.result) for d in decisions] == [(REPAIR_INSERT, "failed")]
+
+    @pytest.mark.asyncio
+    async def test_disabled_policy_regenerates(self):
+        calls = []
+
+        async def complete(*args, **kwargs):
+            calls.append(kwargs['user_message'])
+            return f"Resumo com {MARKER_1}, {MARKER_2} e {MARKER_3}." if len(calls) == 2 else PARTIAL_SUMMARY
+
+        with patch.dict(sys.modules, {'summarizer': _summarizer_module()}):
+            summarizer = ChapterSummarizer(repair_policy_enabled=False)
+            summarizer.client.complete = complete
+
+            _, regenerations, addendums = await summarizer._audit_and_regenerate(
+                _chapter(), _recall_set(), "Texto completo do capítulo de teste."
+            )
+
+        assert (regenerations, addendums) == (1, 0)
+        assert all("FRASES" not in prompt for prompt in calls)
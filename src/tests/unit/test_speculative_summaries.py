@@ -0,0 +1,107 @@
+"""
+Testes unitários para os candidatos especulativos de _audit_and_regenerate.
+
+Garante que candidatos são gerados em paralelo com temperaturas variadas,
+que o primeiro aprovado na auditoria é mantido e os demais cancelados e
+aguardados antes do retorno.
+"""
+import asyncio
+import sys
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.chapter_detector import Chapter
+from src.chapter_summarizer import ChapterSummarizer
+from src.exceptions import CoverageError
+from src.recall_set import CriticalityReason, RecallSet, RecallSetItem
+
+PASSING_SUMMARY = "Resumo com [[RS:cap2:09d6f1|chunks:1,2]] e [[RS:cap2:d78f2f|chunks:3]]."
+FAILING_SUMMARY = "Resumo sem marcadores."
+
+
+def _summarizer_module() -> MagicMock:
+    module = MagicMock()
+    module.AsyncOpenAIClient = MagicMock(return_value=AsyncMock())
+    module.SummarySpecs.BASE_SYSTEM_MESSAGE = "Sistema."
+    return module
+
+
+def _chapter() -> Chapter:
+    return Chapter(
+        number="2", title="Capítulo", start_pos=0, end_pos=40, start_line=0,
+        page_markers=[], word_count=8, pattern_matched="##", confidence=1.0
+    )
+
+
+def _recall_set() -> RecallSet:
+    return RecallSet(
+        chapter_number="2",
+        critical_items=[
+            RecallSetItem("RS:cap2:09d6f1", "Primeiro item", "critical",
+                          CriticalityReason.MULTI_CHUNK, [1, 2], 2),
+            RecallSetItem("RS:cap2:d78f2f", "Segundo item", "critical",
+                          CriticalityReason.MULTI_CHUNK, [3], 1),
+        ],
+        supporting_items=[]
+    )
+
+
+class TestSpeculativeSummaries:
+    """Testes do modo especulativo."""
+
+    @pytest.mark.asyncio
+    async def test_first_passing_candidate_wins_and_rest_are_cancelled(self):
+        cancelled = []
+        temperatures = []
+
+        async def complete(*args, **kwargs):
+            temperature = kwargs['temperature']
+            temperatures.append(temperature)
+            try:
+                if temperature == 0.5:
+                    await asyncio.sleep(0.01)
+                    return PASSING_SUMMARY
+                await asyncio.sleep(0.05 if temperature == 0.3 else 5)
+                return FAILING_SUMMARY
+            except asyncio.CancelledError:
+                cancelled.append(temperature)
+                raise
+
+        with patch.dict(sys.modules, {'summarizer': _summarizer_module()}):
+            summarizer = ChapterSummarizer(speculative_candidates=3)
+            summarizer.client.complete = complete
+            start = time.perf_counter()
+
+            summary, regenerations, addendums = await summarizer._audit_and_regenerate(
+                _chapter(), _recall_set(), "Texto completo do capítulo de teste.", max_attempts=5
+            )
+            # Perdedores já foram cancelados e aguardados quando o vencedor retorna
+            assert sorted(cancelled) == [0.3, 0.7]
+            assert all(task.done() for task in asyncio.all_tasks() if task is not asyncio.current_task())
+
+        assert summary == PASSING_SUMMARY
+        assert (regenerations, addendums) == (0, 0)
+        assert sorted(temperatures) == [0.3, 0.5, 0.7]
+        assert sorted(cancelled) == [0.3, 0.7]
+        assert time.perf_counter() - start < 1
+
+    @pytest.mark.asyncio
+    async def test_rounds_stop_at_max_attempts(self):
+        calls = []
+
+        async def complete(*args, **kwargs):
+            calls.append(kwargs['temperature'])
+            return FAILING_SUMMARY
+
+        with patch.dict(sys.modules, {'summarizer': _summarizer_module()}):
+            summarizer = ChapterSummarizer(speculative_candidates=2, repair_policy_enabled=False)
+            summarizer.client.complete = complete
+
+            with pytest.raises(CoverageError):
+                await summarizer._audit_and_regenerate(
+                    _chapter(), _recall_set(), "Texto.", max_attempts=5, max_addendums=0
+                )
+
+        assert calls == [0.3, 0.5, 0.7, 0.9, 1.0]
@@ -0,0 +1,235 @@
+"""
+Testes unitários para a geração de resumos em streaming.
+
+Garante que o IncrementalRecallAuditor acompanha marcadores que chegam em
+pedaços, que gerações com marcadores inventados/malformados são abortadas
+cedo e que o texto parcial é repassado ao stream_callback.
+"""
+import asyncio
+import sys
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.chapter_detector import Chapter
+from src.chapter_summarizer import ChapterSummarizer
+from src.exceptions import CoverageError
+from src.recall_auditor import IncrementalRecallAuditor, RecallAuditor
+from src.recall_set import CriticalityReason, RecallSet, RecallSetItem
+
+RECALL_SET = {
+    'critical_items': [
+        {'item_id': 'RS:cap2:09d6f1', 'source_chunks': [1, 2]},
+        {'item_id': 'RS:cap2:d78f2f', 'source_chunks': [3]},
+    ]
+}
+SUMMARY = "Início. Primeiro [[RS:cap2:09d6f1|chunks:1,2]] e segundo [[RS:cap2:d78f2f|chunks:3]] fim."
+
+
+def _pieces(text: str, size: int):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def _summarizer_module() -> MagicMock:
+    module = MagicMock()
+    module.AsyncOpenAIClient = MagicMock(return_value=AsyncMock())
+    module.SummarySpecs.BASE_SYSTEM_MESSAGE = "Sistema."
+    return module
+
+
+def _chapter() -> Chapter:
+    return Chapter(
+        number="2", title="Capítulo", start_pos=0, end_pos=40, start_line=0,
+        page_markers=[], word_count=8, pattern_matched="##", confidence=1.0
+    )
+
+
+def _recall_set() -> RecallSet:
+    return RecallSet(
+        chapter_number="2",
+        critical_items=[
+            RecallSetItem("RS:cap2:09d6f1", "Primeiro item", "critical",
+                          CriticalityReason.MULTI_CHUNK, [1, 2], 2),
+            RecallSetItem("RS:cap2:d78f2f", "Segundo item", "critical",
+                          CriticalityReason.MULTI_CHUNK, [3], 1),
+        ],
+        supporting_items=[]
+    )
+
+
+class TestIncrementalRecallAuditor:
+    """Testes da auditoria incremental."""
+
+    @pytest.mark.parametrize("size", [1, 3, 7, 200])
+    def test_markers_split_across_pieces_match_full_audit(self, size):
+        auditor = IncrementalRecallAuditor(RECALL_SET, "2")
+        seen_missing = []
+        for piece in _pieces(SUMMARY, size):
+            auditor.feed(piece)
+            seen_missing.append(len(auditor.missing_markers))
+
+        assert auditor.text == SUMMARY
+        assert auditor.found_item_ids == {'RS:cap2:09d6f1', 'RS:cap2:d78f2f'}
+        assert not auditor.should_abort
+        assert seen_missing[-1] == 0 and seen_missing == sorted(seen_missing, reverse=True)
+        assert auditor.audit() == RecallAuditor().audit_summary(SUMMARY, RECALL_SET, "2")
+
+    @pytest.mark.parametrize("bad_marker", [
+        "[[RS:cap2:abcdef|chunks:1]]",   # inventado
+        "[[RS:cap2:d78f2f|chunks:9]]",   # chunk fora de source_chunks
+        "[[RS:cap2:xyz|chunks:1]]",      # malformado
+    ])
+    def test_doomed_markers_abort(self, bad_marker):
+        auditor = IncrementalRecallAuditor(RECALL_SET, "2")
+        for piece in _pieces(f"Texto {bad_marker} resto", 4):
+            auditor.feed(piece)
+
+        assert auditor.should_abort
+        # A auditoria final dá o mesmo veredito que a incremental
+        assert not auditor.audit().passed
+
+    def test_final_audit_rejects_malformed_markers(self):
+        text = SUMMARY + " Extra [[RS:cap2:xyz|chunks:1]] e truncado [[RS:cap2:09d"
+
+        result = RecallAuditor().audit_summary(text, RECALL_SET, "2")
+
+        assert not result.passed and not result.missing_markers
+        assert result.malformed_markers == ["[[RS:cap2:xyz|chunks:1]]", "[[RS:cap2:09d"]
+
+    def test_plain_brackets_are_ignored(self):
+        auditor = IncrementalRecallAuditor(RECALL_SET, "2")
+        auditor.feed("Lista [[a]] e [[ sem fechar " + "x" * 300)
+
+        assert not auditor.should_abort
+
+
+class TestStreamingSummary:
+    """Testes de _generate_summary_with_markers em streaming."""
+
+    @pytest.mark.asyncio
+    async def test_partial_text_is_forwarded(self):
+        partials = []
+
+        async def stream_complete(**kwargs):
+            for piece in _pieces(SUMMARY, 5):
+                yield piece
+
+        with patch.dict(sys.modules, {'summarizer': _summarizer_module()}):
+            summarizer = ChapterSummarizer(
+                stream_summaries=True,
+                stream_callback=lambda chapter, attempt, text: partials.append((chapter, attempt, text))
+            )
+            summarizer.client.stream_complete = stream_complete
+
+            summary, aborted = await summarizer._generate_summary_with_markers(
+                _chapter(), _recall_set(), "Texto completo do capítulo de teste.", attempt_number=2
+            )
+
+        assert summary == SUMMARY.strip() and not aborted
+        assert "".join(text for _, _, text in partials) == SUMMARY
+        assert {(chapter, attempt) for chapter, attempt, _ in partials} == {("2", 2)}
+
+    @pytest.mark.asyncio
+    async def test_invented_marker_aborts_generation(self):
+        consumed = []
+        closed = []
+        text = "Resumo [[RS:cap2:abcdef|chunks:1]] " + "palavra " * 200
+
+        async def stream_complete(**kwargs):
+            try:
+                for piece in _pieces(text, 10):
+                    consumed.append(piece)
+                    yield piece
+            finally:
+                closed.append(True)
+
+        with patch.dict(sys.modules, {'summarizer': _summarizer_module()}):
+            summarizer = ChapterSummarizer(stream_summaries=True)
+            summarizer.client.stream_complete = stream_complete
+
+            summary, aborted = await summarizer._generate_summary_with_markers(
+                _chapter(), _recall_set(), "Texto completo do capítulo de teste."
+            )
+
+        assert closed == [True]
+        assert len(consumed) < 5
+        assert "abcdef" in summary and aborted
+
+    @pytest.mark.asyncio
+    async def test_aborted_last_attempt_is_never_repaired(self):
+        # Só um item faltando no texto parcial: reparo/addendum o fariam passar
+        text = "Início [[RS:cap2:09d6f1|chunks:1,2]] e depois [[RS:cap2:d78f2f|chunks:3 " + "x" * 300
+
+        async def stream_complete(**kwargs):
+            for piece in _pieces(text, 10):
+                yield piece
+
+        with patch.dict(sys.modules, {'summarizer': _summarizer_module()}):
+            summarizer = ChapterSummarizer(stream_summaries=True)
+            summarizer.client.stream_complete = stream_complete
+            summarizer.client.complete = AsyncMock(
+                return_value="- Segundo item [[RS:cap2:d78f2f|chunks:3]]"
+            )
+
+            with pytest.raises(CoverageError):
+                await summarizer._audit_and_regenerate(
+                    _chapter(), _recall_set(), "Texto completo do capítulo de teste.",
+                    max_attempts=2, max_addendums=2
+                )
+
+        assert summarizer.repair_policy is not None
+        summarizer.client.complete.assert_not_called()
+
+
+class TestStreamComplete:
+    """Testes de AsyncOpenAIClient.stream_complete."""
+
+    @pytest.mark.asyncio
+    async def test_yields_deltas_and_closes_stream(self, monkeypatch):
+        monkeypatch.syspath_prepend("src")
+        # Testes de integração deixam um módulo 'summarizer' falso em sys.modules
+        with patch.dict(sys.modules):
+            sys.modules.pop('summarizer', None)
+            import summarizer
+            from llm_rate_limiter import LLMRateLimiter
+        AsyncOpenAIClient = summarizer.AsyncOpenAIClient
+        limiter = LLMRateLimiter(max_in_flight=1)
+        monkeypatch.setattr(summarizer, "get_rate_limiter", lambda: limiter)
+
+        class FakeStream:
+            def __init__(self, pieces):
+                self.pieces = pieces
+                self.closed = False
+
+            def __aiter__(self):
+                return self._events()
+
+            async def _events(self):
+                for piece in self.pieces:
+                    yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))])
+                yield SimpleNamespace(choices=[])
+
+            async def close(self):
+                self.closed = True
+
+        stream = FakeStream(["Olá", None, " mundo"])
+        openai_client = MagicMock()
+        openai_client.chat.completions.create = AsyncMock(return_value=stream)
+        client = AsyncOpenAIClient(api_key="test", client=openai_client)
+
+        async def probe_slot():
+            async with limiter.slot(1):
+                pass
+
+        pieces = []
+        async for piece in client.stream_complete(
+            "Sistema.", "Usuário.", max_output_tokens=50, use_cache=False
+        ):
+            pieces.append(piece)
+            # A vaga in-flight não fica presa enquanto o consumidor lê o stream
+            await asyncio.wait_for(probe_slot(), timeout=1)
+
+        assert pieces == ["Olá", " mundo"]
+        assert stream.closed
+        assert openai_client.chat.completions.create.call_args.kwargs['stream'] is True
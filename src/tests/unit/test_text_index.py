@@ -0,0 +1,126 @@
+"""
+Testes unitários para TextIndex.
+
+Garante equivalência com `str.split()` nas contagens por faixa de caracteres,
+nos chunks (ChunkProcessor e _chunk_chapter, como fatias do texto original)
+e nos offsets do TextTracker.
+"""
+import json
+import random
+import sys
+from unittest.mock import MagicMock, patch
+
+from src.text_index import ChunkView, TextIndex
+
+TEXT = "  Capítulo 1\n\nO  livro\tcomeça aqui.\n--- Página 1 ---\nfim  "
+
+
+def _random_text(words: int, seed: int = 7) -> str:
+    rng = random.Random(seed)
+    separators = [" ", "  ", "\n", "\t", " \n\n"]
+    return "".join(f"w{i}{rng.choice(separators)}" for i in range(words))
+
+
+class TestTextIndex:
+    """Testes do índice de palavras."""
+
+    def test_count_words_matches_split_for_any_range(self):
+        index = TextIndex(TEXT)
+
+        assert index.word_count == len(TEXT.split())
+        for start in range(len(TEXT) + 1):
+            for end in range(start, len(TEXT) + 2):
+                assert index.count_words(start, end) == len(TEXT[start:end].split())
+
+    def test_words_and_join_match_split(self):
+        index = TextIndex(TEXT)
+        words = TEXT.split()
+
+        assert index.words() == words
+        assert index.join_words(1, 4) == " ".join(words[1:4])
+        for n in range(len(words) + 1):
+            assert index.joined_length(n) == len(" ".join(words[:n]))
+
+    def test_clean_range_detects_cut_words(self):
+        index = TextIndex("abc def")
+
+        assert index.is_clean_range(0, 7)
+        assert index.is_clean_range(3, 7)
+        assert not index.is_clean_range(1, 7)
+        assert not index.is_clean_range(0, 5)
+
+    def test_chunk_view_materializes_slice_on_access(self):
+        source = "um dois\ntrês quatro"
+        chunk = ChunkView(source, 3, 12, chunk_id="cap_1_chunk_0", words=2)
+
+        assert chunk['text'] == "dois\ntrês"
+        assert chunk.get('text') == "dois\ntrês"
+        assert 'text' in chunk
+        assert chunk.get('chunk_id') == "cap_1_chunk_0"
+
+    def test_chunk_view_behaves_as_a_plain_dict(self):
+        source = "um dois\ntrês quatro"
+        chunk = ChunkView(source, 3, 12, base_char=3, chunk_id="cap_1_chunk_0", words=2)
+        expected = {
+            'text': "dois\ntrês", 'start_char': 0, 'end_char': 9,
+            'chunk_id': "cap_1_chunk_0", 'words': 2
+        }
+
+        assert dict(chunk) == expected
+        assert {**chunk} == expected
+        assert dict(chunk.items()) == expected
+        assert chunk == expected
+        assert json.loads(json.dumps(dict(chunk))) == expected
+
+    def test_chapter_chunks_match_split_chunking(self):
+        text = _random_text(2600)
+        start_char = text.index("w300")
+        end_char = text.index("w2450")
+        with patch.dict(sys.modules, {'summarizer': MagicMock()}):
+            from src.chapter_summarizer import ChapterSummarizer
+            summarizer = ChapterSummarizer()
+
+        chapter_text = text[start_char:end_char]
+        words = chapter_text.split()
+        standalone = summarizer._chunk_chapter(chapter_text, "2")
+        indexed = summarizer._chunk_chapter(
+            chapter_text, "2", text_index=TextIndex(text), start_char=start_char
+        )
+
+        assert len(standalone) == 3
+        for chunks in (standalone, indexed):
+            assert [c['chunk_id'] for c in chunks] == [f"cap_2_chunk_{i}" for i in range(3)]
+            for chunk in chunks:
+                assert chunk['text'].split() == words[chunk['start_word']:chunk['end_word']]
+                assert chunk['words'] == chunk['end_word'] - chunk['start_word']
+                # Offsets de caracteres relativos ao capítulo, como os de palavras
+                assert chapter_text[chunk['start_char']:chunk['end_char']] == chunk['text']
+        assert [c['text'] for c in indexed] == [c['text'] for c in standalone]
+        assert [dict(c) for c in indexed] == [dict(c) for c in standalone]
+        assert "\n" in indexed[0]['text']
+
+    def test_chunk_processor_matches_split_chunking(self, monkeypatch):
+        monkeypatch.syspath_prepend("src")
+        from summarizer import ChunkProcessor
+
+        processor = ChunkProcessor(word_target=100, overlap_words=20)
+        for words in (50, 100, 101, 180, 181, 1000):
+            text = _random_text(words)
+            indexed = processor.chunk_text(text, TextIndex(text))
+            assert [chunk.split() for chunk in indexed] == [
+                chunk.split() for chunk in processor.chunk_text(text)
+            ]
+
+    def test_tracker_segments_unchanged(self, monkeypatch):
+        monkeypatch.syspath_prepend("src")
+        from tracker import TextTracker
+
+        text = _random_text(1234)
+        words = text.split()
+        tracker = TextTracker(text)
+
+        assert tracker.words == words
+        for segment in tracker.segments:
+            assert segment['start_char'] == len(" ".join(words[:segment['start_word']]))
+            assert segment['end_char'] == len(" ".join(words[:segment['end_word']]))
+            assert segment['text'] == " ".join(words[segment['start_word']:segment['end_word']])
@@ -0,0 +1,89 @@
+"""
+Testes unitários para o orçamento de tokens.
+
+Garante janela por modelo, recorte do maior trecho que cabe, conversão de
+tokens em palavras por chunk e prompts de extração sem truncamento por
+caracteres.
+"""
+import sys
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.chapter_summarizer import DEFAULT_CHUNK_WORDS, ChapterSummarizer
+from src.token_budget import SAFETY_MARGIN_TOKENS, TokenBudget, context_tokens_for_model
+
+
+def _make_summarizer(**kwargs) -> ChapterSummarizer:
+    mock_module = MagicMock()
+    mock_module.AsyncOpenAIClient = MagicMock(return_value=AsyncMock())
+    with patch.dict(sys.modules, {'summarizer': mock_module}):
+        return ChapterSummarizer(**kwargs)
+
+
+class TestTokenBudget:
+    """Testes do planejador de orçamento."""
+
+    def test_context_window_by_model_prefix(self):
+        assert context_tokens_for_model("gpt-4o-mini") == 128_000
+        assert context_tokens_for_model("gpt-4.1-mini") == 1_047_576
+        assert context_tokens_for_model("gpt-4") == 8_192
+
+    def test_prompt_budget_subtracts_output_and_overhead(self):
+        budget = TokenBudget("gpt-4", max_prompt_text_tokens=0)
+
+        overhead = "instruções " * 100
+
+        available = budget.prompt_budget(1000, overhead)
+
+        assert available == 8_192 - 1000 - budget.count(overhead) - SAFETY_MARGIN_TOKENS
+        assert TokenBudget("gpt-4o", max_prompt_text_tokens=3000).prompt_budget(500) == 3000
+
+    def test_fit_text_returns_whole_text_or_marks_truncation(self):
+        budget = TokenBudget("gpt-4o")
+        text = "palavra " * 400
+
+        assert budget.fit_text(text, 10_000) == (text, False)
+        excerpt, truncated = budget.fit_text(text, 50)
+        assert truncated
+        assert budget.count(excerpt) <= 50
+        assert text.startswith(excerpt)
+        assert not excerpt.endswith("palavr")
+
+    def test_words_for_tokens_uses_measured_ratio(self):
+        budget = TokenBudget("gpt-4o")
+        text = "a " * 1000
+
+        assert budget.words_for_tokens(1000, text) == int(1000 / budget.tokens_per_word(text))
+
+
+class TestChapterChunkPlanning:
+    """Testes do uso do orçamento no ChapterSummarizer."""
+
+    def test_default_plan_keeps_word_targets(self):
+        summarizer = _make_summarizer()
+
+        assert summarizer._plan_chunk_words("texto " * 5000) == (DEFAULT_CHUNK_WORDS, 100)
+
+    def test_token_budget_sizes_chunks(self):
+        chapter_text = " ".join(f"palavra{i}" for i in range(6000))
+        summarizer = _make_summarizer(chunk_token_budget=8000)
+
+        words, overlap = summarizer._plan_chunk_words(chapter_text)
+        chunks = summarizer._chunk_chapter(chapter_text, "1")
+
+        assert words > DEFAULT_CHUNK_WORDS
+        assert overlap == words // 10
+        assert len(chunks) < len(_make_summarizer()._chunk_chapter(chapter_text, "1"))
+
+    @pytest.mark.asyncio
+    async def test_extraction_prompt_is_not_cut_at_2000_chars(self):
+        summarizer = _make_summarizer()
+        summarizer.client.complete = AsyncMock(return_value='{"concepts": []}')
+        chunk_text = "\n".join(f"linha {i} do capítulo com texto" for i in range(300))
+
+        await summarizer._extract_from_chunks([{'chunk_id': 'cap_1_chunk_0', 'text': chunk_text}])
+
+        prompt = summarizer.client.complete.call_args.kwargs['user_message']
+        assert len(chunk_text) > 2000
+        assert chunk_text in prompt
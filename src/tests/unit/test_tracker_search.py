@@ -0,0 +1,65 @@
+"""
+Testes unitários para a busca indexada do TextTracker.
+
+Garante que o buffer minúsculo + índice invertido encontram exatamente os
+mesmos segmentos que a busca por substring em cada segmento.
+"""
+import random
+
+import pytest
+
+VOCABULARY = ["Livro", "capítulo", "ideia", "AUTOR", "exemplo", "Índice", "ação", "de", "a", "o"]
+
+
+def _text(words: int, seed: int = 11) -> str:
+    rng = random.Random(seed)
+    separators = [" ", "  ", "\n", "\t"]
+    return "".join(f"{rng.choice(VOCABULARY)}{rng.choice(separators)}" for _ in range(words))
+
+
+def _naive_ids(tracker, search_text: str):
+    search_lower = search_text.lower()
+    return [s['id'] for s in tracker.segments if search_lower in s['text'].lower()]
+
+
+@pytest.fixture
+def tracker_class(monkeypatch):
+    monkeypatch.syspath_prepend("src")
+    from tracker import TextTracker
+    return TextTracker
+
+
+class TestTrackerSearch:
+    """Testes de find_segments_for_texts e find_segment_by_text."""
+
+    def test_matches_substring_search_on_every_segment(self, tracker_class):
+        text = _text(1800)
+        tracker = tracker_class(text)
+        joined = " ".join(text.split())
+        rng = random.Random(3)
+        queries = ["", "ausente", "Livro\ncapítulo", "de  a", "ÇÃO", "ação de"]
+        for _ in range(200):
+            start = rng.randrange(len(joined))
+            queries.append(joined[start:start + rng.randrange(1, 60)])
+
+        found = tracker.find_segments_for_texts(queries)
+
+        assert len(tracker.segments) == 4
+        assert found == [_naive_ids(tracker, query) for query in queries]
+
+    def test_find_segment_by_text_keeps_result_format(self, tracker_class):
+        tracker = tracker_class(" ".join(f"palavra{i}" for i in range(1200)))
+
+        found = tracker.find_segment_by_text("PALAVRA700 palavra701 palavra702", context_words=10)
+
+        assert [s['segment_id'] for s in found] == [2]
+        assert found[0]['word_range'] == "500-1000"
+        assert found[0]['context'].split()[0] == "palavra490"
+
+    def test_reference_map_uses_indexed_search(self, tracker_class):
+        tracker = tracker_class(" ".join(f"palavra{i}" for i in range(1200)))
+        summary = "palavra1100 palavra1101 palavra1102. Outro trecho inexistente aqui."
+
+        assert tracker.create_reference_map(summary) == {
+            "palavra1100 palavra1101 palavra1102": [tracker.get_segment_reference(3)]
+        }
@@ -0,0 +1,113 @@
+"""
+Testes unitários para TreeReducer e o resumo executivo em ChapterSummarizer.
+
+Garante agrupamento por fan-in/orçamento de tokens, redução em níveis até
+caber no orçamento, e que os dois resumos executivos rodam em paralelo.
+"""
+import asyncio
+import sys
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.chapter_summarizer import ChapterSummarizer, ChapterSummary
+from src.token_budget import TokenBudget
+from src.tree_reducer import TreeReducer
+
+
+def _count_words(text: str) -> int:
+    return len(text.split())
+
+
+class TestTreeReducer:
+    """Testes da redução em árvore."""
+
+    def test_groups_respect_fan_in_and_budget(self):
+        reducer = TreeReducer(_count_words, max_group_tokens=10, fan_in=3, separator=" ")
+        items = ["a b", "c d", "e f", "g h", "i j k l m n o p q", "r"]
+
+        groups = reducer.group(items, [_count_words(item) for item in items])
+
+        assert groups == [["a b", "c d", "e f"], ["g h"], ["i j k l m n o p q", "r"]]
+
+    @pytest.mark.asyncio
+    async def test_fold_reduces_in_levels_until_it_fits(self):
+        calls = []
+
+        async def reduce_group(group, level):
+            calls.append((level, len(group)))
+            return f"r{level}"
+
+        reducer = TreeReducer(_count_words, max_group_tokens=8, fan_in=4, separator=" ")
+        items = [f"item {i}" for i in range(40)]
+
+        folded = await reducer.fold(items, reduce_group)
+
+        assert reducer.depth == 2
+        assert [level for level, _ in calls] == [1] * 10 + [2] * 3
+        assert _count_words(" ".join(folded)) <= 8
+        assert reducer.timings()["levels"][0]["groups"] == 10
+
+    @pytest.mark.asyncio
+    async def test_fold_is_noop_when_items_fit(self):
+        reduce_group = AsyncMock()
+        reducer = TreeReducer(_count_words, max_group_tokens=100)
+
+        assert await reducer.fold(["a", "b"], reduce_group) == ["a", "b"]
+        assert reducer.depth == 0
+        reduce_group.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_fold_stops_when_no_group_can_be_formed(self):
+        reducer = TreeReducer(_count_words, max_group_tokens=3, separator=" ")
+        items = ["a b c", "d e f"]
+
+        assert await reducer.fold(items, AsyncMock()) == items
+
+
+def _summarizer_module() -> MagicMock:
+    module = MagicMock()
+    module.AsyncOpenAIClient = MagicMock(return_value=AsyncMock())
+    module.SummarySpecs.BASE_SYSTEM_MESSAGE = "Sistema."
+    return module
+
+
+def _chapter_summary(number: int) -> ChapterSummary:
+    return ChapterSummary(
+        numero=str(number), titulo=f"Capítulo {number}", palavras=1000, palavras_resumo=60,
+        paginas=[], resumo="palavra " * 60, pontos_chave=[], citacoes=[], exemplos=[]
+    )
+
+
+class TestExecutiveSummaries:
+    """Testes do resumo executivo de summarize_all_chapters."""
+
+    @pytest.mark.asyncio
+    async def test_executives_run_concurrently_over_folded_summaries(self):
+        in_flight = 0
+        peak_executives = 0
+        partial_reductions = 0
+
+        async def complete(*args, **kwargs):
+            nonlocal in_flight, peak_executives, partial_reductions
+            if "resumo intermediário" in kwargs['user_message']:
+                partial_reductions += 1
+                return "síntese parcial"
+            in_flight += 1
+            peak_executives = max(peak_executives, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return f"executivo {kwargs['max_output_tokens']}"
+
+        chapter_summaries = [_chapter_summary(n) for n in range(1, 41)]
+        with patch.dict(sys.modules, {'summarizer': _summarizer_module()}):
+            summarizer = ChapterSummarizer(token_budget=TokenBudget(context_tokens=3000))
+            summarizer.client.complete = complete
+            summarizer.summarize_chapter = AsyncMock(side_effect=chapter_summaries)
+            chapters = [MagicMock(pattern_matched="##", confidence=1.0) for _ in chapter_summaries]
+
+            structured = await summarizer.summarize_all_chapters(chapters, "texto")
+
+        assert structured.resumo_executivo == {'curto': "executivo 600", 'medio': "executivo 1500"}
+        assert peak_executives == 2
+        assert partial_reductions > 0
@@ -0,0 +1,215 @@
+"""
+Índice de palavras do texto-fonte, construído uma única vez por documento.
+
+O mesmo livro era tokenizado com `.split()` por vários componentes (chunker,
+tracker, detectores de capítulos, contagens de palavras na API). O TextIndex
+guarda os offsets de início/fim de cada palavra em arrays compactos
+(`array('I')`), de modo que contagens de palavras, faixas de chunks e
+segmentos saem do índice por busca binária e fatiamento, sem re-tokenizar.
+
+Palavras seguem a mesma definição de `str.split()`: sequências máximas de
+caracteres que não são espaço em branco.
+"""
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping
+from typing import Any, Iterator, List, Optional, Tuple
+
+WORD_PATTERN = re.compile(r'\S+')
+
+
+class TextIndex:
+    """
+    Offsets de palavras de um texto.
+
+    Atributos:
+        text: Texto indexado
+        starts: Offset de início de cada palavra
+        ends: Offset de fim (exclusivo) de cada palavra
+    """
+
+    def __init__(self, text: str):
+        """
+        Indexa o texto em uma única passada.
+
+        Args:
+            text: Texto completo do documento
+        """
+        self.text = text
+        self.starts = array('I')
+        self.ends = array('I')
+        for match in WORD_PATTERN.finditer(text):
+            start, end = match.span()
+            self.starts.append(start)
+            self.ends.append(end)
+        self._joined_prefix: Optional[array] = None
+
+    @property
+    def word_count(self) -> int:
+        """Total de palavras do texto."""
+        return len(self.starts)
+
+    def count_words(self, start_char: int = 0, end_char: Optional[int] = None) -> int:
+        """
+        Conta palavras de text[start_char:end_char].
+
+        Equivalente a `len(text[start_char:end_char].split())`, inclusive
+        quando os limites cortam uma palavra.
+
+        Args:
+            start_char: Offset inicial
+            end_char: Offset final (exclusivo); None = fim do texto
+
+        Returns:
+            Número de palavras no trecho
+        """
+        first, last = self.word_range(start_char, end_char)
+        return max(0, last - first)
+
+    def word_range(self, start_char: int = 0, end_char: Optional[int] = None) -> Tuple[int, int]:
+        """
+        Faixa de palavras [first, last) que intersectam text[start_char:end_char].
+
+        Args:
+            start_char: Offset inicial
+            end_char: Offset final (exclusivo); None = fim do texto
+
+        Returns:
+            Tupla (primeira palavra, palavra após a última)
+        """
+        end_char = len(self.text) if end_char is None else min(end_char, len(self.text))
+        first = bisect_right(self.ends, start_char)
+        if end_char <= start_char:
+            return first, first
+        last = bisect_left(self.starts, end_char)
+        return first, max(first, last)
+
+    def is_clean_range(self, start_char: int, end_char: Optional[int] = None) -> bool:
+        """Indica se os limites do trecho não cortam nenhuma palavra."""
+        end_char = len(self.text) if end_char is None else min(end_char, len(self.text))
+        first, last = self.word_range(start_char, end_char)
+        if first == last:
+            return True
+        return self.starts[first] >= start_char and self.ends[last - 1] <= end_char
+
+    def char_span(self, first_word: int, last_word: int) -> Tuple[int, int]:
+        """
+        Offsets de caracteres cobertos pelas palavras [first_word, last_word).
+
+        Args:
+            first_word: Índice da primeira palavra
+            last_word: Índice após a última palavra (> first_word)
+
+        Returns:
+            Tupla (offset inicial, offset final)
+        """
+        return self.starts[first_word], self.ends[last_word - 1]
+
+    def words(self, first_word: int = 0, last_word: Optional[int] = None) -> List[str]:
+        """Palavras [first_word, last_word) como lista (equivale a text.split()[first:last])."""
+        last_word = self.word_count if last_word is None else min(last_word, self.word_count)
+        text, starts, ends = self.text, self.starts, self.ends
+        return [text[starts[i]:ends[i]] for i in range(first_word, last_word)]
+
+    def join_words(self, first_word: int = 0, last_word: Optional[int] = None) -> str:
+        """Palavras [first_word, last_word) unidas por um espaço (equivale a ' '.join(...))."""
+        return ' '.join(self.words(first_word, last_word))
+
+    def joined_length(self, word_count: int) -> int:
+        """
+        Tamanho de ' '.join(words[:word_count]) sem montar a string.
+
+        O prefixo de tamanhos é construído sob demanda, uma única vez.
+
+        Args:
+            word_count: Número de palavras do prefixo (0..word_count total)
+
+        Returns:
+            Número de caracteres do prefixo normalizado
+        """
+        if self._joined_prefix is None:
+            prefix = array('Q', [0])
+            total = 0
+            for start, end in zip(self.starts, self.ends):
+                total += end - start + 1
+                prefix.append(total)
+            self._joined_prefix = prefix
+        return max(0, self._joined_prefix[word_count] - 1)
+
+    def word_chunks(
+        self,
+        word_target: int,
+        step: int,
+        first_word: int = 0,
+        last_word: Optional[int] = None
+    ) -> List[Tuple[int, int]]:
+        """
+        Faixas de palavras de chunks com sobreposição.
+
+        Começa em first_word e avança `step` palavras por chunk; cada chunk
+        tem até word_target palavras e para no fim da faixa.
+
+        Args:
+            word_target: Palavras por chunk
+            step: Avanço entre inícios de chunks (word_target - overlap)
+            first_word: Primeira palavra da faixa
+            last_word: Palavra após a última da faixa (None = fim do texto)
+
+        Returns:
+            Lista de faixas (início, fim) em índices de palavra absolutos
+        """
+        last_word = self.word_count if last_word is None else last_word
+        ranges = []
+        start = first_word
+        while start < last_word:
+            ranges.append((start, min(start + word_target, last_word)))
+            start += step
+        return ranges
+
+
+class ChunkView(Mapping):
+    """
+    Chunk representado por offsets no texto-fonte.
+
+    Compatível com os dicts de chunk usados no pipeline: `chunk['text']` é
+    materializado sob demanda como fatia do texto-fonte (preservando espaços
+    e quebras de linha) e não fica armazenado no chunk, de modo que a lista
+    de chunks não duplica o texto do livro. 'text' é uma chave como as
+    demais: `dict(chunk)`, `{**chunk}` e `.items()` a incluem (para
+    serializar em JSON, use `dict(chunk)`).
+
+    Os campos start_char/end_char são relativos a `base_char` (p.ex. o início
+    do capítulo), assim como start_word/end_word.
+    """
+
+    __slots__ = ('source', '_span', '_fields')
+
+    def __init__(self, source: str, start: int, end: int, base_char: int = 0, **fields: Any):
+        """
+        Args:
+            source: Texto-fonte (compartilhado, não copiado)
+            start: Offset inicial do chunk em `source`
+            end: Offset final (exclusivo) do chunk em `source`
+            base_char: Offset em `source` que corresponde a start_char 0
+            **fields: Demais campos do chunk (chunk_id, words, ...)
+        """
+        self.source = source
+        self._span = (start, end)
+        self._fields = dict(start_char=start - base_char, end_char=end - base_char, **fields)
+
+    def __getitem__(self, key: str) -> Any:
+        if key == 'text':
+            start, end = self._span
+            return self.source[start:end]
+        return self._fields[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield 'text'
+        yield from self._fields
+
+    def __len__(self) -> int:
+        return len(self._fields) + 1
+
+    def __repr__(self) -> str:
+        return f"ChunkView({dict(self)!r})"
@@ -0,0 +1,213 @@
+"""
+Orçamento de tokens por modelo para chunking e trechos de prompt.
+
+Os tamanhos de chunk eram fixos em palavras e os prompts eram cortados por
+caracteres (`chunk_text[:2000]`, `chapter_text[:5000]`), desperdiçando a
+janela de contexto ou truncando o texto sem aviso. Este módulo mede tokens
+localmente (tiktoken, se instalado; senão heurística de caracteres) e:
+- calcula quanto cabe no prompt de cada modelo (contexto - saída - margem)
+- recorta o maior trecho de texto que cabe em um orçamento
+- converte um orçamento de tokens por chunk em palavras por chunk
+"""
+import logging
+import os
+from typing import Dict, Optional, Tuple
+
+try:
+    import tiktoken
+except ImportError:  # Dependência opcional: usa heurística de caracteres
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+CHARS_PER_TOKEN = 4
+FALLBACK_ENCODING = "o200k_base"
+
+# Janela de contexto (tokens) por modelo; prefixo mais longo vence
+MODEL_CONTEXT_TOKENS: Dict[str, int] = {
+    "gpt-4.1": 1_047_576,
+    "gpt-4o": 128_000,
+    "gpt-4-turbo": 128_000,
+    "gpt-4": 8_192,
+    "gpt-3.5-turbo": 16_385,
+    "o1": 200_000,
+    "o3": 200_000,
+    "o4-mini": 200_000,
+}
+DEFAULT_CONTEXT_TOKENS = int(os.getenv("LLM_CONTEXT_TOKENS", "128000"))
+
+# Teto de tokens de texto-fonte por prompt (0 = limitado só pela janela do modelo)
+DEFAULT_MAX_PROMPT_TEXT_TOKENS = int(os.getenv("LLM_MAX_PROMPT_TEXT_TOKENS", "0"))
+
+# Tokens por chunk do pipeline de capítulos (0 = tamanho fixo em palavras)
+DEFAULT_CHUNK_TOKEN_BUDGET = int(os.getenv("CHUNK_TOKEN_BUDGET", "0"))
+
+# Folga para a formatação de mensagens da API e erros de estimativa
+SAFETY_MARGIN_TOKENS = 256
+SAMPLE_WORDS = 2000
+
+
+def context_tokens_for_model(model: Optional[str]) -> int:
+    """
+    Janela de contexto de um modelo.
+
+    Args:
+        model: Nome do modelo (ex.: "gpt-4o-mini")
+
+    Returns:
+        Tokens de contexto (DEFAULT_CONTEXT_TOKENS se desconhecido)
+    """
+    if not isinstance(model, str):
+        return DEFAULT_CONTEXT_TOKENS
+    for prefix in sorted(MODEL_CONTEXT_TOKENS, key=len, reverse=True):
+        if model.startswith(prefix):
+            return MODEL_CONTEXT_TOKENS[prefix]
+    return DEFAULT_CONTEXT_TOKENS
+
+
+class TokenBudget:
+    """
+    Contagem local de tokens e planejamento de orçamento para um modelo.
+    """
+
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        context_tokens: Optional[int] = None,
+        max_prompt_text_tokens: int = DEFAULT_MAX_PROMPT_TEXT_TOKENS
+    ):
+        """
+        Inicializa o orçamento.
+
+        Args:
+            model: Nome do modelo (define a janela e o tokenizer)
+            context_tokens: Janela de contexto explícita (sobrepõe a do modelo)
+            max_prompt_text_tokens: Teto de tokens de texto-fonte por prompt (0 = sem teto)
+        """
+        self.model = model if isinstance(model, str) else None
+        self.context_tokens = context_tokens or context_tokens_for_model(self.model)
+        self.max_prompt_text_tokens = max_prompt_text_tokens
+        self._encoding = self._load_encoding(self.model)
+
+    @staticmethod
+    def _load_encoding(model: Optional[str]):
+        """Carrega o encoding do tiktoken para o modelo (None sem tiktoken)."""
+        if tiktoken is None:
+            return None
+        try:
+            return tiktoken.encoding_for_model(model) if model else tiktoken.get_encoding(FALLBACK_ENCODING)
+        except KeyError:
+            return tiktoken.get_encoding(FALLBACK_ENCODING)
+        except Exception as e:
+            logger.warning(f"tiktoken indisponível ({e}); usando estimativa por caracteres")
+            return None
+
+    @property
+    def is_exact(self) -> bool:
+        """Indica se a contagem usa tokenizer real (tiktoken)."""
+        return self._encoding is not None
+
+    def count(self, text: str) -> int:
+        """
+        Conta tokens de um texto.
+
+        Args:
+            text: Texto a medir
+
+        Returns:
+            Tokens (exatos com tiktoken, estimados por caracteres sem ele)
+        """
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return -(-len(text) // CHARS_PER_TOKEN)
+
+    def prompt_budget(self, max_output_tokens: int, prompt_overhead: str = "") -> int:
+        """
+        Tokens disponíveis para texto-fonte em um prompt.
+
+        Args:
+            max_output_tokens: Tokens reservados para a resposta
+            prompt_overhead: Restante do prompt (instruções, listas, mensagem de sistema)
+
+        Returns:
+            Tokens que ainda cabem na janela (respeitando max_prompt_text_tokens)
+        """
+        available = (
+            self.context_tokens - max_output_tokens
+            - self.count(prompt_overhead) - SAFETY_MARGIN_TOKENS
+        )
+        if self.max_prompt_text_tokens > 0:
+            available = min(available, self.max_prompt_text_tokens)
+        return max(0, available)
+
+    def fit_text(self, text: str, max_tokens: int) -> Tuple[str, bool]:
+        """
+        Maior prefixo de `text` que cabe em max_tokens.
+
+        Args:
+            text: Texto completo
+            max_tokens: Orçamento de tokens
+
+        Returns:
+            Tupla (trecho, truncado?)
+        """
+        if self.count(text) <= max_tokens:
+            return text, False
+        if self._encoding is not None:
+            tokens = self._encoding.encode(text, disallowed_special=())
+            excerpt = self._encoding.decode(tokens[:max_tokens])
+        else:
+            excerpt = text[:max_tokens * CHARS_PER_TOKEN]
+        # Não terminar no meio de uma palavra
+        cut = excerpt.rfind(' ')
+        if cut > len(excerpt) // 2:
+            excerpt = excerpt[:cut]
+        return excerpt, True
+
+    def tokens_per_word(self, sample_text: str) -> float:
+        """
+        Razão tokens/palavra medida em uma amostra do texto.
+
+        Args:
+            sample_text: Texto representativo (só as primeiras SAMPLE_WORDS palavras são usadas)
+
+        Returns:
+            Tokens por palavra (mínimo 1.0)
+        """
+        words = sample_text.split(maxsplit=SAMPLE_WORDS)[:SAMPLE_WORDS]
+        if not words:
+            return 1.0
+        return max(1.0, self.count(' '.join(words)) / len(words))
+
+    def words_for_tokens(self, token_budget: int, sample_text: str) -> int:
+        """
+        Converte um orçamento de tokens por chunk em palavras por chunk.
+
+        Args:
+            token_budget: Tokens desejados por chunk
+            sample_text: Texto usado para medir a razão tokens/palavra
+
+        Returns:
+            Palavras por chunk (mínimo 1)
+        """
+        return max(1, int(token_budget / self.tokens_per_word(sample_text)))
+
+
+# Instâncias por modelo (tokenizers são caros de carregar)
+_budgets: Dict[Optional[str], TokenBudget] = {}
+
+
+def get_token_budget(model: Optional[str] = None) -> TokenBudget:
+    """
+    Retorna o TokenBudget compartilhado de um modelo.
+
+    Args:
+        model: Nome do modelo (None = padrão)
+
+    Returns:
+        Instância de TokenBudget
+    """
+    key = model if isinstance(model, str) else None
+    if key not in _budgets:
+        _budgets[key] = TokenBudget(key)
+    return _budgets[key]
@@ -4,27 +4,63 @@ CoverageSummarizer - Módulo de Rastreabilidade
 INCR-3: Sistema de referências a trechos do texto
 """
 
-from typing import List, Dict, Tuple
+from array import array
+from bisect import bisect_right
+from typing import List, Dict, Tuple, Optional
+import asyncio
 import re
+import threading
+import time
+
+from text_index import TextIndex
+from evidence_aligner import REFERENCE_ALIGNMENT_BUDGET_MS, REFERENCE_FUZZY_ALIGNMENT, MinHashAligner
+
+# Separa os segmentos no buffer de busca; nunca aparece no texto de um segmento
+# (palavras unidas por um espaço), então nenhuma busca casa entre dois segmentos
+SEGMENT_SEPARATOR = '\n'
 
 
 class TextTracker:
     """Classe responsável por rastrear e indexar trechos do texto original."""
     
-    def __init__(self, text: str):
+    def __init__(
+        self,
+        text: str,
+        text_index: Optional[TextIndex] = None,
+        fuzzy_alignment: bool = REFERENCE_FUZZY_ALIGNMENT,
+        alignment_budget_ms: Optional[int] = REFERENCE_ALIGNMENT_BUDGET_MS
+    ):
         """
         Inicializa o tracker com o texto original.
         
         Args:
             text: Texto completo a ser rastreado
+            text_index: Índice de palavras de `text` já construído (opcional)
+            fuzzy_alignment: Se True, sentenças sem ocorrência literal recebem
+                referências aproximadas (MinHash/LSH)
+            alignment_budget_ms: Tempo máximo do alinhamento aproximado por mapa
+                de referências (None = sem limite)
         """
         self.original_text = text
         self.text_length = len(text)
-        self.words = text.split()
+        self.text_index = text_index if text_index is not None else TextIndex(text)
+        self.words = self.text_index.words()
         self.total_words = len(self.words)
         
         # Dividir texto em segmentos para referência
         self.segments = self._create_segments()
+        
+        # Índice de busca (buffer minúsculo + índice invertido), construído sob demanda
+        self._lower_buffer: Optional[str] = None
+        self._segment_starts = array('Q')
+        self._segment_ends = array('Q')
+        self._postings: Dict[str, List[int]] = {}
+        
+        self.fuzzy_alignment = fuzzy_alignment
+        self.alignment_budget_ms = alignment_budget_ms
+        self._aligner: Optional[MinHashAligner] = None
+        self._aligner_lock = threading.Lock()
+        self._alignment_task: Optional[asyncio.Task] = None
     
     def _create_segments(self, segment_size: int = 500) -> List[Dict]:
         """
@@ -45,9 +81,9 @@ class TextTracker:
             start_word = i
             end_word = min(i + segment_size, len(words))
             
-            # Calcular posição aproximada no texto
-            start_char = len(' '.join(words[:i]))
-            end_char = len(' '.join(words[:end_word]))
+            # Calcular posição aproximada no texto (prefixo normalizado, sem re-join)
+            start_char = self.text_index.joined_length(i)
+            end_char = self.text_index.joined_length(end_word)
             
             segments.append({
                 'id': len(segments) + 1,
@@ -61,6 +97,92 @@ class TextTracker:
         
         return segments
     
+    def _build_search_index(self) -> None:
+        """
+        Constrói o índice de busca dos segmentos em uma única passada.
+        
+        - Buffer com o texto minúsculo de todos os segmentos (um lower() por livro,
+          não por consulta) e offsets de início/fim de cada segmento no buffer
+        - Índice invertido: palavra minúscula -> índices dos segmentos que a contêm
+        """
+        starts, ends = array('Q'), array('Q')
+        postings: Dict[str, List[int]] = {}
+        lowered = []
+        position = 0
+        for index, segment in enumerate(self.segments):
+            text = segment['text'].lower()
+            lowered.append(text)
+            starts.append(position)
+            ends.append(position + len(text))
+            position += len(text) + len(SEGMENT_SEPARATOR)
+            for word in set(text.split(' ')):
+                postings.setdefault(word, []).append(index)
+        
+        self._lower_buffer = SEGMENT_SEPARATOR.join(lowered)
+        self._segment_starts, self._segment_ends = starts, ends
+        self._postings = postings
+    
+    def _matching_segment_indices(self, search_lower: str) -> List[int]:
+        """
+        Índices dos segmentos cujo texto minúsculo contém `search_lower`.
+        
+        Palavras internas da busca (todas menos a primeira e a última, que podem
+        ser pedaços de palavras) são palavras inteiras do segmento: os candidatos
+        vêm da menor lista do índice invertido e só eles são verificados. Buscas
+        sem palavra interna varrem o buffer uma vez.
+        
+        Args:
+            search_lower: Texto pesquisado, já em minúsculas
+        
+        Returns:
+            Índices (base 0) dos segmentos, em ordem
+        """
+        if self._lower_buffer is None:
+            self._build_search_index()
+        if not search_lower:
+            return list(range(len(self.segments)))
+        if SEGMENT_SEPARATOR in search_lower:
+            return []
+        
+        buffer, starts, ends = self._lower_buffer, self._segment_starts, self._segment_ends
+        interior = search_lower.split(' ')[1:-1]
+        if interior:
+            postings = [self._postings.get(word) for word in interior]
+            if any(posting is None for posting in postings):
+                return []
+            return [
+                index for index in min(postings, key=len)
+                if buffer.find(search_lower, starts[index], ends[index]) != -1
+            ]
+        
+        found = []
+        position = buffer.find(search_lower)
+        while position != -1:
+            index = bisect_right(starts, position) - 1
+            found.append(index)
+            if index + 1 >= len(starts):
+                break
+            position = buffer.find(search_lower, starts[index + 1])
+        return found
+    
+    def find_segments_for_texts(self, search_texts: List[str]) -> List[List[int]]:
+        """
+        IDs dos segmentos que contêm cada texto pesquisado, em lote.
+        
+        O índice de busca é construído uma vez e reaproveitado por todas as
+        consultas; cada consulta verifica só os segmentos candidatos.
+        
+        Args:
+            search_texts: Textos a pesquisar (ex.: sentenças de um resumo)
+        
+        Returns:
+            Para cada texto, IDs dos segmentos encontrados (em ordem)
+        """
+        return [
+            [index + 1 for index in self._matching_segment_indices(text.lower())]
+            for text in search_texts
+        ]
+    
     def find_segment_by_text(self, search_text: str, context_words: int = 50) -> List[Dict]:
         """
         Encontra segmentos que contêm o texto pesquisado.
@@ -72,22 +194,21 @@ class TextTracker:
         Returns:
             Lista de segmentos encontrados com contexto
         """
-        search_lower = search_text.lower()
         found_segments = []
         
-        for segment in self.segments:
-            if search_lower in segment['text'].lower():
-                # Adicionar contexto
-                start_idx = max(0, segment['start_word'] - context_words)
-                end_idx = min(self.total_words, segment['end_word'] + context_words)
-                context_text = ' '.join(self.words[start_idx:end_idx])
-                
-                found_segments.append({
-                    'segment_id': segment['id'],
-                    'word_range': segment['word_range'],
-                    'context': context_text,
-                    'exact_match': segment['text']
-                })
+        for segment_id in self.find_segments_for_texts([search_text])[0]:
+            segment = self.segments[segment_id - 1]
+            # Adicionar contexto
+            start_idx = max(0, segment['start_word'] - context_words)
+            end_idx = min(self.total_words, segment['end_word'] + context_words)
+            context_text = ' '.join(self.words[start_idx:end_idx])
+            
+            found_segments.append({
+                'segment_id': segment['id'],
+                'word_range': segment['word_range'],
+                'context': context_text,
+                'exact_match': segment['text']
+            })
         
         return found_segments
     
@@ -128,10 +249,63 @@ class TextTracker:
         
         return sentences[:max_phrases]
     
+    def _build_aligner(self, deadline: Optional[float] = None) -> Optional[MinHashAligner]:
+        """
+        Constrói (ou continua construindo) o índice MinHash/LSH dos segmentos.
+        
+        Args:
+            deadline: Prazo (time.perf_counter) da construção; None = completa
+        
+        Returns:
+            O aligner se o índice está completo; None se o prazo acabou antes
+            ou se outra thread está construindo o índice neste momento
+        """
+        if not self._aligner_lock.acquire(blocking=deadline is None):
+            return None
+        try:
+            if self._aligner is None:
+                self._aligner = MinHashAligner(self, build=False)
+            return self._aligner if self._aligner.build_index(deadline) else None
+        finally:
+            self._aligner_lock.release()
+    
+    def prepare_alignment(self) -> None:
+        """Constrói o índice do alinhamento aproximado por completo (bloqueante)."""
+        if self.fuzzy_alignment and self.segments:
+            self._build_aligner()
+    
+    def prepare_alignment_async(self) -> "asyncio.Task":
+        """
+        Constrói o índice do alinhamento aproximado em uma thread, fora do event loop.
+        
+        A task é criada na primeira chamada e reaproveitada nas seguintes:
+        chamar cedo (ao criar o tracker) sobrepõe a construção às chamadas ao
+        LLM; aguardar antes de create_reference_map garante o índice pronto.
+        
+        Returns:
+            Task da construção
+        """
+        task = self._alignment_task
+        # Tracker reaproveitado em outro event loop (ex.: chamadas síncronas via asyncio.run)
+        stale = task is not None and not task.done() and task.get_loop() is not asyncio.get_running_loop()
+        if task is None or stale:
+            task = asyncio.create_task(asyncio.to_thread(self.prepare_alignment))
+            self._alignment_task = task
+        return task
+    
     def create_reference_map(self, summary_text: str) -> Dict[str, List[str]]:
         """
         Cria mapa de referências entre resumo e texto original.
         
+        Sentenças encontradas literalmente no texto usam a busca exata; as
+        demais (paráfrases) recebem, se fuzzy_alignment, os segmentos mais
+        similares segundo o MinHashAligner, com a similaridade estimada.
+        
+        O orçamento alignment_budget_ms cobre também a construção do índice:
+        se ele ainda não está pronto (ver prepare_alignment_async), a construção
+        avança até o prazo e continua na próxima chamada; até completar, as
+        paráfrases ficam sem referência.
+        
         Args:
             summary_text: Texto do resumo
         
@@ -142,14 +316,40 @@ class TextTracker:
         summary_sentences = re.split(r'[.!?]+', summary_text)
         summary_sentences = [s.strip() for s in summary_sentences if len(s.strip()) > 10]
         
-        reference_map = {}
+        sentences = summary_sentences[:20]  # Limitar para performance
         
-        for sentence in summary_sentences[:20]:  # Limitar para performance
-            # Buscar no texto original
-            segments = self.find_segment_by_text(sentence, context_words=30)
-            if segments:
-                references = [self.get_segment_reference(s['segment_id']) for s in segments[:3]]
-                reference_map[sentence[:100]] = references
+        # Buscar todas as sentenças no texto original de uma vez (índice compartilhado)
+        references: Dict[int, List[str]] = {}
+        unmatched = []
+        for position, segment_ids in enumerate(self.find_segments_for_texts(sentences)):
+            if segment_ids:
+                references[position] = [self.get_segment_reference(segment_id) for segment_id in segment_ids[:3]]
+            else:
+                unmatched.append(position)
+        
+        # Paráfrases: alinhamento aproximado, limitado pelo orçamento de latência
+        if self.fuzzy_alignment and unmatched and self.segments:
+            deadline = (
+                None if self.alignment_budget_ms is None
+                else time.perf_counter() + self.alignment_budget_ms / 1000
+            )
+            aligner = self._build_aligner(deadline)
+            alignments = [] if aligner is None else aligner.align_all(
+                [sentences[position] for position in unmatched],
+                top_k=3, budget_ms=self.alignment_budget_ms, deadline=deadline
+            )
+            for position, matches in zip(unmatched, alignments):
+                if matches:
+                    references[position] = [
+                        f"{self.get_segment_reference(match.segment_id)} (similaridade ~{match.similarity:.2f})"
+                        for match in matches
+                    ]
+        
+        # Mapa na ordem das sentenças do resumo
+        reference_map = {}
+        for position, sentence in enumerate(sentences):
+            if position in references:
+                reference_map[sentence[:100]] = references[position]
         
         return reference_map
 
@@ -0,0 +1,155 @@
+"""
+Redução hierárquica (em árvore) de textos que não cabem em um único prompt.
+
+Resumos executivos e meta-resumos juntavam todos os resumos parciais em uma
+única string e a enviavam em um só prompt: em livros longos isso estoura a
+janela do modelo (ou é truncado) e vira um gargalo serial no fim. O
+TreeReducer dobra a lista em níveis: agrupa itens consecutivos (até
+`fan_in` itens e `max_group_tokens` tokens por grupo), reduz os grupos em
+paralelo e repete até que a concatenação caiba no orçamento do prompt final.
+A latência total cresce com a profundidade da árvore (log_fan_in), não com o
+número de itens.
+"""
+import asyncio
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass
+from typing import Awaitable, Callable, Dict, List, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Máximo de itens reduzidos por chamada em cada nível da árvore
+DEFAULT_TREE_FAN_IN = int(os.getenv("TREE_REDUCE_FAN_IN", "8"))
+
+ReduceGroup = Callable[[List[str], int], Awaitable[str]]
+
+
+@dataclass
+class ReduceLevel:
+    """Estatísticas de um nível da árvore de redução."""
+    level: int
+    inputs: int
+    groups: int
+    seconds: float
+
+
+class TreeReducer:
+    """
+    Dobra uma lista de textos em níveis de reduções parciais paralelas.
+    """
+
+    def __init__(
+        self,
+        count_tokens: Callable[[str], int],
+        max_group_tokens: int,
+        fan_in: int = DEFAULT_TREE_FAN_IN,
+        separator: str = "\n\n"
+    ):
+        """
+        Inicializa o redutor.
+
+        Args:
+            count_tokens: Contador de tokens (ex.: TokenBudget.count)
+            max_group_tokens: Orçamento de tokens de texto por prompt (grupos e prompt final)
+            fan_in: Máximo de itens por grupo (mínimo 2)
+            separator: Separador usado ao juntar os itens
+        """
+        self.count_tokens = count_tokens
+        self.max_group_tokens = max(1, max_group_tokens)
+        self.fan_in = max(2, fan_in)
+        self.separator = separator
+        self.levels: List[ReduceLevel] = []
+
+    @property
+    def depth(self) -> int:
+        """Níveis de redução executados no último fold."""
+        return len(self.levels)
+
+    def _joined_tokens(self, counts: Sequence[int]) -> int:
+        """Tokens da junção de itens com as contagens dadas."""
+        if not counts:
+            return 0
+        return sum(counts) + self.count_tokens(self.separator) * (len(counts) - 1)
+
+    def group(self, items: Sequence[str], counts: Sequence[int]) -> List[List[str]]:
+        """
+        Agrupa itens consecutivos respeitando fan_in e max_group_tokens.
+
+        Args:
+            items: Textos na ordem original
+            counts: Tokens de cada item
+
+        Returns:
+            Grupos (um item maior que o orçamento fica sozinho no seu grupo)
+        """
+        groups: List[List[str]] = []
+        current: List[str] = []
+        current_counts: List[int] = []
+        for item, count in zip(items, counts):
+            if current and (
+                len(current) >= self.fan_in
+                or self._joined_tokens(current_counts + [count]) > self.max_group_tokens
+            ):
+                groups.append(current)
+                current, current_counts = [], []
+            current.append(item)
+            current_counts.append(count)
+        if current:
+            groups.append(current)
+        return groups
+
+    async def fold(self, items: Sequence[str], reduce_group: ReduceGroup) -> List[str]:
+        """
+        Reduz os itens em níveis até que a junção caiba em max_group_tokens.
+
+        Args:
+            items: Textos a dobrar, na ordem original
+            reduce_group: Corrotina (grupo, nível) -> texto reduzido do grupo
+
+        Returns:
+            Itens finais (a própria lista se já cabia; pode exceder o orçamento
+            se nenhum agrupamento for possível)
+        """
+        self.levels = []
+        items = list(items)
+        counts = [self.count_tokens(item) for item in items]
+        while len(items) > 1 and self._joined_tokens(counts) > self.max_group_tokens:
+            groups = self.group(items, counts)
+            if len(groups) == len(items):
+                logger.warning(
+                    f"Redução em árvore parou com {len(items)} itens: nenhum par cabe em "
+                    f"{self.max_group_tokens} tokens"
+                )
+                break
+
+            level = len(self.levels) + 1
+            start = time.perf_counter()
+            items = list(await asyncio.gather(*[
+                reduce_group(group, level) if len(group) > 1 else _passthrough(group[0])
+                for group in groups
+            ]))
+            counts = [self.count_tokens(item) for item in items]
+            self.levels.append(ReduceLevel(
+                level=level,
+                inputs=sum(len(group) for group in groups),
+                groups=len(groups),
+                seconds=time.perf_counter() - start
+            ))
+            logger.info(
+                f"Redução em árvore, nível {level}: {self.levels[-1].inputs} → {len(items)} itens "
+                f"em {self.levels[-1].seconds:.2f}s"
+            )
+        return items
+
+    def timings(self) -> Dict:
+        """Profundidade e latência por nível do último fold (para relatórios de tempo)."""
+        return {
+            "depth": self.depth,
+            "levels": [asdict(level) for level in self.levels],
+        }
+
+
+async def _passthrough(item: str) -> str:
+    """Grupo de um item só: segue para o próximo nível sem chamada ao LLM."""
+    return item